@@ -1,20 +1,35 @@
 import datetime
-from typing import List, Optional, Dict, Any
+import itertools
+from collections import Counter
+from typing import List, Optional, Dict, Any, Set
 import json
+import numpy as np
 from .memory_record import MemoryRecord
 
+
+def _to_epoch_us(timestamp: datetime.datetime) -> int:
+    """Convert a datetime to integer epoch microseconds"""
+    return int(timestamp.timestamp() * 1_000_000)
+
+
 class ReflectionRecord:
     """
     A reflection is a higher-level insight derived from multiple memories.
     It represents patterns, learnings, or important realizations.
     """
     
+    # Monotonic counter shared by all reflections; orders references without
+    # reading the wall clock on every mark_referenced call
+    _global_tick = itertools.count(1)
+    
     def __init__(self,
                  reflection_text: str,
                  source_memories: List[MemoryRecord],
                  timestamp: Optional[datetime.datetime] = None,
                  importance: float = 8.0,
-                 reflection_type: str = "daily_reflection"):
+                 reflection_type: str = "daily_reflection",
+                 timestamp_us: Optional[int] = None,
+                 reflection_id: Optional[str] = None):
         """
         Initialize a reflection record.
         
@@ -24,24 +39,47 @@ class ReflectionRecord:
             timestamp (datetime): When this reflection was created
             importance (float): Importance score (reflections are typically important)
             reflection_type (str): Type of reflection ('daily', 'weekly', 'insight', 'goal')
+            timestamp_us (int): Creation time as epoch microseconds; the datetime is
+                only materialized when ``timestamp`` is accessed
+            reflection_id (str): Existing ID to reuse (e.g. when deserializing)
         """
         self.reflection_text = reflection_text
         self.source_memories = source_memories
-        self.timestamp = timestamp or datetime.datetime.now()
+        if timestamp is None and timestamp_us is None:
+            timestamp = datetime.datetime.now()
+        self._timestamp = timestamp
+        self._ts_epoch = timestamp_us if timestamp_us is not None else _to_epoch_us(timestamp)
         self.importance = max(1.0, min(10.0, importance))
         self.reflection_type = reflection_type
         
         # Unique ID for this reflection
-        self.id = f"reflection_{self.timestamp.isoformat()}_{hash(reflection_text) % 10000}"
+        self.id = reflection_id or f"reflection_{self.timestamp.isoformat()}_{hash(reflection_text) % 10000}"
         
         # Track how often this reflection is referenced
         self.reference_count = 0
-        self.last_referenced = None
+        self.last_referenced_tick: Optional[int] = None
+        
+        # Casefolded word set, built on first keyword search
+        self._words: Optional[frozenset] = None
+    
+    @property
+    def timestamp(self) -> datetime.datetime:
+        """Creation time, materialized from epoch microseconds on first access"""
+        if self._timestamp is None:
+            self._timestamp = datetime.datetime.fromtimestamp(self._ts_epoch / 1_000_000)
+        return self._timestamp
+    
+    @property
+    def words(self) -> frozenset:
+        """Casefolded words of the reflection text (cached)"""
+        if self._words is None:
+            self._words = frozenset(self.reflection_text.casefold().split())
+        return self._words
     
     def mark_referenced(self):
         """Mark this reflection as referenced (for tracking relevance)"""
         self.reference_count += 1
-        self.last_referenced = datetime.datetime.now()
+        self.last_referenced_tick = next(ReflectionRecord._global_tick)
     
     def to_dict(self) -> dict:
         """Convert reflection to dictionary for serialization"""
@@ -49,13 +87,42 @@ class ReflectionRecord:
             'id': self.id,
             'reflection_text': self.reflection_text,
             'source_memory_ids': [mem.id for mem in self.source_memories],
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp_us': self._ts_epoch,
             'importance': self.importance,
             'reflection_type': self.reflection_type,
             'reference_count': self.reference_count,
-            'last_referenced': self.last_referenced.isoformat() if self.last_referenced else None
+            'last_referenced_tick': self.last_referenced_tick
         }
     
+    @classmethod
+    def from_dict(cls, data: dict, source_memories: Optional[List[MemoryRecord]] = None) -> 'ReflectionRecord':
+        """Create reflection record from dictionary (accepts legacy ISO timestamps)"""
+        if 'timestamp_us' in data:
+            timestamp, timestamp_us = None, data['timestamp_us']
+        else:
+            timestamp, timestamp_us = datetime.datetime.fromisoformat(data['timestamp']), None
+        
+        reflection = cls(
+            reflection_text=data['reflection_text'],
+            source_memories=source_memories or [],
+            timestamp=timestamp,
+            importance=data['importance'],
+            reflection_type=data['reflection_type'],
+            timestamp_us=timestamp_us,
+            reflection_id=data['id']
+        )
+        reflection.reference_count = data.get('reference_count', 0)
+        if data.get('last_referenced_tick') is not None:
+            reflection.last_referenced_tick = data['last_referenced_tick']
+            cls._resume_ticks_after(reflection.last_referenced_tick)
+        return reflection
+    
+    @staticmethod
+    def _resume_ticks_after(tick: int) -> None:
+        """Ensure references made after loading order after a persisted tick"""
+        if next(ReflectionRecord._global_tick) <= tick:
+            ReflectionRecord._global_tick = itertools.count(tick + 1)
+    
     def __str__(self) -> str:
         return f"ReflectionRecord({self.timestamp.strftime('%Y-%m-%d')}, {self.reflection_type}): {self.reflection_text[:100]}..."
 
@@ -86,6 +153,10 @@ class ReflectionMemory:
         self.core_principles: List[str] = []
         self.long_term_goals: List[str] = []
         
+        # Companion sets for O(1) membership checks (lists keep the order)
+        self._core_principles_set: Set[str] = set()
+        self._long_term_goals_set: Set[str] = set()
+        
     def add_reflection(self, reflection: ReflectionRecord) -> None:
         """
         Add a new reflection to the store.
@@ -94,8 +165,31 @@ class ReflectionMemory:
             reflection (ReflectionRecord): The reflection to add
         """
         self.reflections.append(reflection)
+        self._categorize(reflection)
         
-        # Categorize by type
+        # Remove oldest reflections if we exceed the limit
+        if len(self.reflections) > self.max_reflections:
+            self._remove_oldest_reflection()
+    
+    def bulk_add(self, reflections: List[ReflectionRecord]) -> None:
+        """
+        Add many reflections at once, trimming to max_reflections in a single
+        sort instead of evicting one at a time.
+        
+        Args:
+            reflections (List[ReflectionRecord]): The reflections to add
+        """
+        self.reflections.extend(reflections)
+        
+        if len(self.reflections) > self.max_reflections:
+            # Keep the newest reflections (stable sort preserves insertion order on ties)
+            self.reflections.sort(key=lambda r: r._ts_epoch)
+            del self.reflections[:len(self.reflections) - self.max_reflections]
+        
+        self._rebuild_category_lists()
+    
+    def _categorize(self, reflection: ReflectionRecord) -> None:
+        """Append a reflection to the categorized list for its type"""
         if reflection.reflection_type == "daily_reflection":
             self.daily_reflections.append(reflection)
         elif reflection.reflection_type == "weekly_reflection":
@@ -104,17 +198,22 @@ class ReflectionMemory:
             self.insights.append(reflection)
         elif reflection.reflection_type == "goal":
             self.goal_reflections.append(reflection)
-        
-        # Remove oldest reflections if we exceed the limit
-        if len(self.reflections) > self.max_reflections:
-            self._remove_oldest_reflection()
+    
+    def _rebuild_category_lists(self) -> None:
+        """Rebuild the categorized lists from self.reflections"""
+        self.daily_reflections = []
+        self.weekly_reflections = []
+        self.insights = []
+        self.goal_reflections = []
+        for reflection in self.reflections:
+            self._categorize(reflection)
     
     def _remove_oldest_reflection(self) -> None:
         """Remove the oldest reflection"""
         if not self.reflections:
             return
             
-        oldest_reflection = min(self.reflections, key=lambda r: r.timestamp)
+        oldest_reflection = min(self.reflections, key=lambda r: r._ts_epoch)
         self.reflections.remove(oldest_reflection)
         
         # Remove from categorized lists
@@ -126,11 +225,19 @@ class ReflectionMemory:
     
     def get_recent_reflections(self, days: int = 7) -> List[ReflectionRecord]:
         """Get reflections from the last N days"""
-        cutoff_time = datetime.datetime.now() - datetime.timedelta(days=days)
-        return [r for r in self.reflections if r.timestamp >= cutoff_time]
+        cutoff_us = _to_epoch_us(datetime.datetime.now() - datetime.timedelta(days=days))
+        return [r for r in self.reflections if r._ts_epoch >= cutoff_us]
     
     def get_reflections_by_type(self, reflection_type: str) -> List[ReflectionRecord]:
         """Get all reflections of a specific type"""
+        category = {
+            "daily_reflection": self.daily_reflections,
+            "weekly_reflection": self.weekly_reflections,
+            "insight": self.insights,
+            "goal": self.goal_reflections,
+        }.get(reflection_type)
+        if category is not None:
+            return list(category)
         return [r for r in self.reflections if r.reflection_type == reflection_type]
     
     def get_most_important_reflections(self, k: int = 10) -> List[ReflectionRecord]:
@@ -140,21 +247,25 @@ class ReflectionMemory:
     
     def add_core_principle(self, principle: str) -> None:
         """Add a core principle or value"""
-        if principle not in self.core_principles:
+        if principle not in self._core_principles_set:
+            self._core_principles_set.add(principle)
             self.core_principles.append(principle)
     
     def add_long_term_goal(self, goal: str) -> None:
         """Add a long-term goal"""
-        if goal not in self.long_term_goals:
+        if goal not in self._long_term_goals_set:
+            self._long_term_goals_set.add(goal)
             self.long_term_goals.append(goal)
     
     def update_core_principles(self, principles: List[str]) -> None:
         """Update the list of core principles"""
         self.core_principles = principles
+        self._core_principles_set = set(principles)
     
     def update_long_term_goals(self, goals: List[str]) -> None:
         """Update the list of long-term goals"""
         self.long_term_goals = goals
+        self._long_term_goals_set = set(goals)
     
     def get_reflection_summary(self, days: int = 30) -> str:
         """
@@ -213,24 +324,45 @@ class ReflectionMemory:
             List[ReflectionRecord]: Relevant reflections
         """
         # Simple keyword matching (could be enhanced with embeddings)
-        context_words = context.lower().split()
-        scored_reflections = []
+        context_counts = Counter(context.casefold().split())
+        if not context_counts or k <= 0:
+            return []
         
-        for reflection in self.reflections:
-            reflection_words = reflection.reflection_text.lower().split()
-            # Count matching words
-            matches = sum(1 for word in context_words if word in reflection_words)
+        # Count matching context words per reflection
+        matched_idx = []
+        match_counts = []
+        for i, reflection in enumerate(self.reflections):
+            reflection_words = reflection.words
+            matches = sum(count for word, count in context_counts.items() if word in reflection_words)
             if matches > 0:
-                # Score based on matches and importance
-                score = matches * reflection.importance
-                scored_reflections.append((score, reflection))
+                matched_idx.append(i)
+                match_counts.append(matches)
         
-        # Sort by score and return top k
-        scored_reflections.sort(key=lambda x: x[0], reverse=True)
-        return [reflection for _, reflection in scored_reflections[:k]]
+        if not matched_idx:
+            return []
+        
+        # Score based on matches and importance
+        idx = np.asarray(matched_idx, dtype=np.int64)
+        importance = np.fromiter((self.reflections[i].importance for i in matched_idx),
+                                 dtype=np.float64, count=len(matched_idx))
+        scores = np.asarray(match_counts, dtype=np.float64) * importance
+        
+        # Select the top k without a full sort, then order them by score
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((idx[top], -scores[top]))]
+        return [self.reflections[i] for i in idx[top]]
     
-    def save_to_file(self, filepath: str) -> None:
-        """Save reflections to a JSON file"""
+    def save_to_file(self, filepath: str, pretty: bool = False) -> None:
+        """
+        Save reflections to a JSON file.
+        
+        Args:
+            filepath (str): Path to the JSON file
+            pretty (bool): Indent the output for human reading (compact by default)
+        """
         data = {
             'reflections': [reflection.to_dict() for reflection in self.reflections],
             'core_principles': self.core_principles,
@@ -240,7 +372,10 @@ class ReflectionMemory:
         }
         
         with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+            if pretty:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(',', ':'))
     
     def load_from_file(self, filepath: str, memory_store=None) -> None:
         """
@@ -253,13 +388,13 @@ class ReflectionMemory:
         with open(filepath, 'r') as f:
             data = json.load(f)
         
+        if 'max_reflections' in data:
+            self.max_reflections = data['max_reflections']
+        
         self.reflections = []
-        self.daily_reflections = []
-        self.weekly_reflections = []
-        self.insights = []
-        self.goal_reflections = []
         
         # Reconstruct reflections
+        loaded_reflections = []
         for reflection_data in data['reflections']:
             # Reconstruct source memories if memory_store is provided
             source_memories = []
@@ -271,26 +406,13 @@ class ReflectionMemory:
                             source_memories.append(memory)
                             break
             
-            reflection = ReflectionRecord(
-                reflection_text=reflection_data['reflection_text'],
-                source_memories=source_memories,
-                timestamp=datetime.datetime.fromisoformat(reflection_data['timestamp']),
-                importance=reflection_data['importance'],
-                reflection_type=reflection_data['reflection_type']
-            )
-            reflection.id = reflection_data['id']
-            reflection.reference_count = reflection_data.get('reference_count', 0)
-            if reflection_data.get('last_referenced'):
-                reflection.last_referenced = datetime.datetime.fromisoformat(reflection_data['last_referenced'])
-            
-            self.add_reflection(reflection)
+            loaded_reflections.append(ReflectionRecord.from_dict(reflection_data, source_memories))
         
-        # Load core principles and goals
-        self.core_principles = data.get('core_principles', [])
-        self.long_term_goals = data.get('long_term_goals', [])
+        self.bulk_add(loaded_reflections)
         
-        if 'max_reflections' in data:
-            self.max_reflections = data['max_reflections']
+        # Load core principles and goals
+        self.update_core_principles(data.get('core_principles', []))
+        self.update_long_term_goals(data.get('long_term_goals', []))
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about the reflection memory"""
@@ -306,8 +428,8 @@ class ReflectionMemory:
             type_counts[reflection.reflection_type] = type_counts.get(reflection.reflection_type, 0) + 1
         
         # Time range
-        oldest = min(self.reflections, key=lambda r: r.timestamp)
-        newest = max(self.reflections, key=lambda r: r.timestamp)
+        oldest = min(self.reflections, key=lambda r: r._ts_epoch)
+        newest = max(self.reflections, key=lambda r: r._ts_epoch)
         
         return {
             "total_reflections": total_reflections,
@@ -317,7 +439,7 @@ class ReflectionMemory:
             "long_term_goals_count": len(self.long_term_goals),
             "oldest_reflection": oldest.timestamp.isoformat(),
             "newest_reflection": newest.timestamp.isoformat(),
-            "time_span_days": (newest.timestamp - oldest.timestamp).days
+            "time_span_days": (newest._ts_epoch - oldest._ts_epoch) // 86_400_000_000
         }
     
     def __len__(self) -> int:
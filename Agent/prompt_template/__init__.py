@@ -1,4 +1,4 @@
-from .gpt_structure import safe_generate_response, GPTRequest
+from .gpt_structure import safe_generate_response, GPTRequest, clear_prompt_cache
 from .run_gpt_prompt import (
     run_gpt_prompt_reflection,
     run_gpt_prompt_daily_planning,
@@ -6,13 +6,31 @@ from .run_gpt_prompt import (
     run_gpt_prompt_importance_scoring,
     run_gpt_prompt_goal_setting,
     run_gpt_prompt_action_planning,
-    run_gpt_prompt_memory_synthesis
+    run_gpt_prompt_memory_synthesis,
+    run_gpt_prompt_reflection_async,
+    run_gpt_prompt_daily_planning_async,
+    run_gpt_prompt_weekly_planning_async,
+    run_gpt_prompt_importance_scoring_async,
+    run_gpt_prompt_goal_setting_async,
+    run_gpt_prompt_action_planning_async,
+    run_gpt_prompt_memory_synthesis_async,
+    run_gpt_prompt_importance_scoring_batch,
+    run_gpt_prompt_importance_scoring_batch_async,
+    run_many
 )
+from .batching import AutoBatcher
 
 __all__ = [
-    'safe_generate_response', 'GPTRequest',
+    'safe_generate_response', 'GPTRequest', 'clear_prompt_cache',
     'run_gpt_prompt_reflection', 'run_gpt_prompt_daily_planning',
     'run_gpt_prompt_weekly_planning', 'run_gpt_prompt_importance_scoring',
     'run_gpt_prompt_goal_setting', 'run_gpt_prompt_action_planning',
-    'run_gpt_prompt_memory_synthesis'
+    'run_gpt_prompt_memory_synthesis',
+    'run_gpt_prompt_reflection_async', 'run_gpt_prompt_daily_planning_async',
+    'run_gpt_prompt_weekly_planning_async', 'run_gpt_prompt_importance_scoring_async',
+    'run_gpt_prompt_goal_setting_async', 'run_gpt_prompt_action_planning_async',
+    'run_gpt_prompt_memory_synthesis_async',
+    'run_gpt_prompt_importance_scoring_batch',
+    'run_gpt_prompt_importance_scoring_batch_async',
+    'run_many', 'AutoBatcher'
 ] 
\ No newline at end of file
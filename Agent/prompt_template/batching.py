@@ -0,0 +1,93 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class AutoBatcher:
+    """
+    Collects individually submitted items into batches for a batch-capable
+    coroutine. A batch is flushed when it reaches max_batch items or when
+    max_wait_ms has elapsed since the first item was queued. With a bin_key,
+    items are queued per bin and each bin flushes independently.
+    """
+
+    def __init__(self,
+                 process_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch: int = 32,
+                 max_wait_ms: float = 10,
+                 bin_key: Optional[Callable[[Any], Hashable]] = None):
+        """
+        Initialize the batcher.
+
+        Args:
+            process_batch (Callable): Coroutine function mapping a list of items
+                to a list of results in the same order
+            max_batch (int): Maximum number of items per batch
+            max_wait_ms (float): Maximum time an item waits for its batch to fill
+            bin_key (Callable): Maps an item to its bin (e.g. a max_tokens bucket);
+                None puts every item in a single bin
+        """
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.bin_key = bin_key
+
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        # strong references to in-flight batches so they are not garbage-collected mid-run
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue an item and wait for its result.
+
+        Args:
+            item: Item to process
+
+        Returns:
+            The result produced for this item by process_batch
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = self.bin_key(item) if self.bin_key is not None else None
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future))
+
+        if len(pending) >= self.max_batch:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait_ms / 1000, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: Hashable = None) -> None:
+        """Dispatch all pending items of a bin as one batch"""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Process a batch and resolve the waiting futures"""
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+        # process_batch returned fewer results than items
+        if len(results) < len(batch):
+            error = RuntimeError(f"process_batch returned {len(results)} results for {len(batch)} items")
+            for _, future in batch[len(results):]:
+                if not future.done():
+                    future.set_exception(error)
@@ -1,12 +1,29 @@
+import asyncio
 import time
 import json
 import logging
 import os
-from typing import Dict, Any, Optional, List
+import functools
+import re
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple
 import random
-from groq import Groq
+import threading
+import weakref
 from pathlib import Path
+import msgspec
 from dotenv import load_dotenv
+from .response_cache import PromptResponseCache
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 # Load .env from the World_Sim directory (relative to this file)
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -17,10 +34,60 @@ load_dotenv(dotenv_path=ENV_PATH)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Canned responses used when USE_API=0
+_MOCK_REFLECTION = "Today was a productive day. I focused on my goals and made meaningful progress. I learned that consistent effort leads to better outcomes, and I should continue prioritizing my most important tasks."
+_MOCK_DAILY_PLAN = '''{"wake_up_hour": 7, "sleep_hour": 23, "schedule": [{"hour": 7, "activity": "Morning routine and breakfast", "priority": 8}, {"hour": 9, "activity": "Focus on main work tasks", "priority": 9}, {"hour": 13, "activity": "Lunch break", "priority": 6}, {"hour": 14, "activity": "Afternoon productivity", "priority": 8}, {"hour": 18, "activity": "Personal time and exercise", "priority": 7}, {"hour": 20, "activity": "Dinner and relaxation", "priority": 6}], "main_goals_today": ["Complete important work tasks", "Maintain healthy habits", "Make progress on personal goals"], "reflection_notes": "Today's plan balances productivity with self-care"}'''
+_MOCK_WEEKLY_PLAN = '''{"weekly_theme": "Focused productivity and personal growth", "daily_plans": {"monday": {"theme": "Strong start", "main_goals": ["Set weekly priorities", "Complete high-impact tasks"], "focus_areas": ["planning", "productivity"]}, "tuesday": {"theme": "Deep work", "main_goals": ["Focus on complex projects", "Minimize distractions"], "focus_areas": ["concentration", "quality work"]}, "wednesday": {"theme": "Midweek momentum", "main_goals": ["Review progress", "Adjust plans if needed"], "focus_areas": ["adaptation", "progress check"]}}, "weekly_goals": ["Advance major projects", "Maintain work-life balance", "Build positive habits"], "challenges_to_address": ["Time management", "Staying motivated midweek"]}'''
+_MOCK_IMPORTANCE = "6 - This is a moderately important memory that contributes to understanding daily patterns and personal growth."
+_MOCK_GOALS = '''{"long_term_goals": ["Advance in career and develop expertise", "Maintain strong relationships with family and friends", "Stay healthy and maintain work-life balance", "Continue learning and personal growth", "Make positive contributions to community"], "core_principles": ["Treat others with respect and kindness", "Stay true to my values and beliefs", "Strive for excellence while accepting imperfection", "Value learning and growth over comfort"], "short_term_objectives": ["Complete current work projects successfully", "Establish consistent healthy routines", "Strengthen key relationships"], "areas_for_growth": ["Time management skills", "Emotional intelligence", "Technical expertise"], "goal_changes": "Refined goals to be more specific and actionable based on recent reflections"}'''
+_MOCK_ACTION = "Focus on completing the most important task on my daily plan while staying mindful of my energy levels and taking breaks when needed."
+_MOCK_SYNTHESIS = "These experiences show a pattern of growth through consistent effort. I'm learning to balance ambition with patience, and I'm becoming more aware of what truly matters to me."
+_MOCK_DEFAULT = "I understand and will take appropriate action based on my current situation and goals."
+
+# Mock dispatch table: each rule is a tuple of keyword groups that must all
+# match (any keyword within a group suffices), checked in order.
+_MOCK_RULES = [
+    ((("reflection", "reflect"),), _MOCK_REFLECTION),
+    ((("daily plan", "schedule"),), _MOCK_DAILY_PLAN),
+    ((("weekly plan",),), _MOCK_WEEKLY_PLAN),
+    ((("importance", "score"),), _MOCK_IMPORTANCE),
+    ((("goal",), ("update", "setting")), _MOCK_GOALS),
+    ((("action",), ("plan",)), _MOCK_ACTION),
+    ((("synthesis", "insight"),), _MOCK_SYNTHESIS),
+]
+# Response cache for low-temperature (near-deterministic) requests. Set
+# PROMPT_CACHE_PATH to persist it in SQLite across runs.
+PROMPT_CACHE_MAX_TEMPERATURE = 0.7
+_prompt_cache = PromptResponseCache(max_entries=4096, db_path=os.getenv('PROMPT_CACHE_PATH'))
+
+# Maximum number of concurrent in-flight async requests per event loop
+MAX_CONCURRENT_REQUESTS = 8
+_request_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+# Mock keyword -> (rule index, group index) of every rule group it satisfies,
+# including the groups of keywords it contains (e.g. "weekly plan" also counts as "plan")
+_MOCK_KEYWORD_GROUPS: Dict[str, set] = {}
+for _rule, (_groups, _) in enumerate(_MOCK_RULES):
+    for _group, _keywords in enumerate(_groups):
+        for _keyword in _keywords:
+            _MOCK_KEYWORD_GROUPS.setdefault(_keyword, set()).add((_rule, _group))
+for _keyword, _hits in _MOCK_KEYWORD_GROUPS.items():
+    for _inner, _inner_hits in list(_MOCK_KEYWORD_GROUPS.items()):
+        if _inner != _keyword and _inner in _keyword:
+            _hits |= _inner_hits
+del _rule, _groups, _group, _keywords, _keyword, _hits, _inner, _inner_hits
+
+# One pass over a message finds every keyword occurrence; the zero-width lookahead
+# lets matches overlap, and the longest keyword wins at each position
+_MOCK_KEYWORDS_RE = re.compile("(?=(" + "|".join(
+    re.escape(keyword) for keyword in sorted(_MOCK_KEYWORD_GROUPS, key=len, reverse=True)
+) + "))")
+
 class GPTRequest:
     """
     Handles safe GPT requests with rate limiting, retry logic, and error handling.
-    Uses Groq API based on the requirements.txt file.
+    Uses Groq API based on the requirements.txt file, or a local Hugging Face
+    model when LOCAL_MODEL_PATH is set.
     """
     
     def __init__(self, api_key: Optional[str] = None, model: str = "llama3-8b-8192"):
@@ -34,14 +101,28 @@ class GPTRequest:
         # Check USE_API environment variable first (after loading .env)
         self.use_api = os.getenv('USE_API', '1') != '0'
         
-        # Only create client if API calls are enabled
-        if self.use_api:
-            self.client = Groq(api_key=api_key) if api_key else Groq()
-        else:
+        # Optional local Hugging Face model, loaded on first request
+        self.local_model_path = os.getenv('LOCAL_MODEL_PATH')
+        self._local_model = None
+        self._tokenizer = None
+        self._prefix_ids: Dict[str, Any] = {}  # Tokenized static system prompts
+        self._local_lock = threading.Lock()
+        
+        # Only create client if API calls are enabled; groq is imported lazily
+        # so mock-response deployments never pay its import cost
+        self.api_key = api_key
+        self.async_client = None  # Created on first async request
+        if not self.use_api:
             self.client = None
             logger.info("USE_API is set to 0 - using mock responses instead of API calls")
+        elif self.local_model_path:
+            self.client = None
+            logger.info(f"LOCAL_MODEL_PATH is set - using local model {self.local_model_path}")
+        else:
+            from groq import Groq
+            self.client = Groq(api_key=api_key) if api_key else Groq()
         
-        self.model = model
+        self.model = self.local_model_path or model
         self.request_count = 0
         self.last_request_time = 0
         self.min_request_interval = 0.1  # Minimum seconds between requests
@@ -67,6 +148,15 @@ class GPTRequest:
         if not self.use_api:
             return self._generate_mock_response(messages)
         
+        if self.local_model_path:
+            return self._generate_local(*self._split_messages(messages), max_tokens=max_tokens, temperature=temperature)
+        
+        cache_key = self._cache_key(messages, max_tokens, temperature)
+        if cache_key is not None:
+            cached = _prompt_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         for attempt in range(max_retries):
             try:
                 # Rate limiting
@@ -88,7 +178,10 @@ class GPTRequest:
                 
                 # Extract and return the response
                 if response.choices and response.choices[0].message:
-                    return response.choices[0].message.content.strip()
+                    content = response.choices[0].message.content.strip()
+                    if cache_key is not None:
+                        _prompt_cache.set(cache_key, content)
+                    return content
                 
             except Exception as e:
                 logger.warning(f"GPT request failed (attempt {attempt + 1}/{max_retries}): {e}")
@@ -101,46 +194,187 @@ class GPTRequest:
         logger.error(f"GPT request failed after {max_retries} attempts")
         return None
     
+    async def safe_generate_response_async(self,
+                                           messages: List[Dict[str, str]],
+                                           max_tokens: int = 1000,
+                                           temperature: float = 0.7,
+                                           max_retries: int = 3) -> Optional[str]:
+        """
+        Async version of safe_generate_response. Concurrency is capped by a
+        per-event-loop semaphore of MAX_CONCURRENT_REQUESTS in-flight calls.
+        
+        Args:
+            messages (List[Dict]): List of messages in ChatML format
+            max_tokens (int): Maximum tokens to generate
+            temperature (float): Temperature for generation
+            max_retries (int): Maximum number of retries
+            
+        Returns:
+            Optional[str]: Generated response or None if failed
+        """
+        # Check if API calls are disabled
+        if not self.use_api:
+            return self._generate_mock_response(messages)
+        
+        if self.local_model_path:
+            return await asyncio.to_thread(self._generate_local, *self._split_messages(messages),
+                                           max_tokens=max_tokens, temperature=temperature)
+        
+        if self.async_client is None:
+            from groq import AsyncGroq
+            self.async_client = AsyncGroq(api_key=self.api_key) if self.api_key else AsyncGroq()
+        
+        cache_key = self._cache_key(messages, max_tokens, temperature)
+        if cache_key is not None:
+            cached = _prompt_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        async with _get_request_semaphore():
+            for attempt in range(max_retries):
+                try:
+                    response = await self.async_client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    )
+                    
+                    self.last_request_time = time.time()
+                    self.request_count += 1
+                    
+                    # Extract and return the response
+                    if response.choices and response.choices[0].message:
+                        content = response.choices[0].message.content.strip()
+                        if cache_key is not None:
+                            _prompt_cache.set(cache_key, content)
+                        return content
+                    
+                except Exception as e:
+                    logger.warning(f"Async GPT request failed (attempt {attempt + 1}/{max_retries}): {e}")
+                    
+                    # Exponential backoff
+                    if attempt < max_retries - 1:
+                        wait_time = (2 ** attempt) + random.uniform(0, 1)
+                        await asyncio.sleep(wait_time)
+        
+        logger.error(f"Async GPT request failed after {max_retries} attempts")
+        return None
+    
+    def _cache_key(self,
+                   messages: List[Dict[str, Any]],
+                   max_tokens: int,
+                   temperature: float) -> Optional[str]:
+        """Cache key for a request, or None if it is too random to cache"""
+        if temperature >= PROMPT_CACHE_MAX_TEMPERATURE:
+            return None
+        return PromptResponseCache.make_key(self.model, max_tokens, temperature, messages)
+    
+    def _generate_local(self,
+                        system_prompt: str,
+                        user_prompt: str,
+                        system_context: Optional[str] = None,
+                        max_tokens: int = 1000,
+                        temperature: float = 0.7,
+                        **kwargs) -> Optional[str]:
+        """
+        Generate with the local model. The static system prompt is tokenized
+        once and its input ids reused, so each call only tokenizes the
+        system context and user prompt.
+        """
+        cache_key = self._cache_key(self._build_messages(system_prompt, user_prompt, system_context), max_tokens, temperature)
+        if cache_key is not None:
+            cached = _prompt_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            import torch
+            
+            with self._local_lock:
+                if self._local_model is None:
+                    from transformers import AutoModelForCausalLM, AutoTokenizer
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.local_model_path)
+                    self._local_model = AutoModelForCausalLM.from_pretrained(self.local_model_path)
+                
+                prefix_ids = self._prefix_ids.get(system_prompt)
+                if prefix_ids is None:
+                    prefix_ids = self._tokenizer.encode(system_prompt, return_tensors='pt')
+                    self._prefix_ids[system_prompt] = prefix_ids
+                
+                variable_part = f"\n\n{system_context}\n\n{user_prompt}" if system_context else f"\n\n{user_prompt}"
+                variable_ids = self._tokenizer.encode(variable_part, add_special_tokens=False, return_tensors='pt')
+                input_ids = torch.cat([prefix_ids, variable_ids], dim=1)
+                
+                with torch.no_grad():
+                    output = self._local_model.generate(
+                        input_ids,
+                        attention_mask=torch.ones_like(input_ids),
+                        max_new_tokens=max_tokens,
+                        do_sample=temperature > 0,
+                        temperature=temperature if temperature > 0 else None,
+                        pad_token_id=self._tokenizer.eos_token_id
+                    )
+                content = self._tokenizer.decode(output[0, input_ids.shape[1]:], skip_special_tokens=True).strip()
+        except Exception as e:
+            logger.error(f"Local model generation failed: {e}")
+            return None
+        
+        self.request_count += 1
+        if cache_key is not None:
+            _prompt_cache.set(cache_key, content)
+        return content
+    
+    @staticmethod
+    def _split_messages(messages: List[Dict[str, str]]) -> Tuple[str, str]:
+        """System and last user message content, for the local model"""
+        system_prompt = next((m["content"] for m in messages if m["role"] == "system"), "")
+        user_prompt = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        return system_prompt, user_prompt
+    
     def _generate_mock_response(self, messages: List[Dict[str, str]]) -> str:
         """Generate a mock response when USE_API=0"""
         # Get the last user message to understand the request type
         user_message = ""
-        system_message = ""
-        
-        for msg in messages:
+        for msg in reversed(messages):
             if msg["role"] == "user":
                 user_message = msg["content"].lower()
-            elif msg["role"] == "system":
-                system_message = msg["content"].lower()
-        
-        # Generate appropriate mock responses based on content
-        if "reflection" in user_message or "reflect" in user_message:
-            return "Today was a productive day. I focused on my goals and made meaningful progress. I learned that consistent effort leads to better outcomes, and I should continue prioritizing my most important tasks."
-        
-        elif "daily plan" in user_message or "schedule" in user_message:
-            return '''{"wake_up_hour": 7, "sleep_hour": 23, "schedule": [{"hour": 7, "activity": "Morning routine and breakfast", "priority": 8}, {"hour": 9, "activity": "Focus on main work tasks", "priority": 9}, {"hour": 13, "activity": "Lunch break", "priority": 6}, {"hour": 14, "activity": "Afternoon productivity", "priority": 8}, {"hour": 18, "activity": "Personal time and exercise", "priority": 7}, {"hour": 20, "activity": "Dinner and relaxation", "priority": 6}], "main_goals_today": ["Complete important work tasks", "Maintain healthy habits", "Make progress on personal goals"], "reflection_notes": "Today's plan balances productivity with self-care"}'''
-        
-        elif "weekly plan" in user_message:
-            return '''{"weekly_theme": "Focused productivity and personal growth", "daily_plans": {"monday": {"theme": "Strong start", "main_goals": ["Set weekly priorities", "Complete high-impact tasks"], "focus_areas": ["planning", "productivity"]}, "tuesday": {"theme": "Deep work", "main_goals": ["Focus on complex projects", "Minimize distractions"], "focus_areas": ["concentration", "quality work"]}, "wednesday": {"theme": "Midweek momentum", "main_goals": ["Review progress", "Adjust plans if needed"], "focus_areas": ["adaptation", "progress check"]}}, "weekly_goals": ["Advance major projects", "Maintain work-life balance", "Build positive habits"], "challenges_to_address": ["Time management", "Staying motivated midweek"]}'''
+                break
         
-        elif "importance" in user_message or "score" in user_message:
-            return "6 - This is a moderately important memory that contributes to understanding daily patterns and personal growth."
+        # Collect the rule groups satisfied by the keywords in the message
+        satisfied = set()
+        for keyword in {m.group(1) for m in _MOCK_KEYWORDS_RE.finditer(user_message)}:
+            satisfied.update(_MOCK_KEYWORD_GROUPS[keyword])
+        if not satisfied:
+            return _MOCK_DEFAULT
         
-        elif "goal" in user_message and ("update" in user_message or "setting" in user_message):
-            return '''{"long_term_goals": ["Advance in career and develop expertise", "Maintain strong relationships with family and friends", "Stay healthy and maintain work-life balance", "Continue learning and personal growth", "Make positive contributions to community"], "core_principles": ["Treat others with respect and kindness", "Stay true to my values and beliefs", "Strive for excellence while accepting imperfection", "Value learning and growth over comfort"], "short_term_objectives": ["Complete current work projects successfully", "Establish consistent healthy routines", "Strengthen key relationships"], "areas_for_growth": ["Time management skills", "Emotional intelligence", "Technical expertise"], "goal_changes": "Refined goals to be more specific and actionable based on recent reflections"}'''
+        # First rule (in order) with every keyword group satisfied
+        for rule, (groups, response) in enumerate(_MOCK_RULES):
+            if all((rule, group) in satisfied for group in range(len(groups))):
+                return response
         
-        elif "action" in user_message and "plan" in user_message:
-            return "Focus on completing the most important task on my daily plan while staying mindful of my energy levels and taking breaks when needed."
-        
-        elif "synthesis" in user_message or "insight" in user_message:
-            return "These experiences show a pattern of growth through consistent effort. I'm learning to balance ambition with patience, and I'm becoming more aware of what truly matters to me."
+        return _MOCK_DEFAULT
+    
+    def _build_messages(self,
+                        system_prompt: str,
+                        user_prompt: str,
+                        system_context: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Build ChatML messages with the static system prompt first so repeated
+        calls share a cacheable prefix; system_context (e.g. the agent's name)
+        is appended after it.
+        """
+        system_content = system_prompt if system_context is None else f"{system_prompt}\n\n{system_context}"
         
-        else:
-            return "I understand and will take appropriate action based on my current situation and goals."
+        return [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": user_prompt}
+        ]
     
     def generate_with_system_prompt(self,
                                   system_prompt: str,
                                   user_prompt: str,
+                                  system_context: Optional[str] = None,
                                   **kwargs) -> Optional[str]:
         """
         Generate response with system and user prompts.
@@ -148,28 +382,55 @@ class GPTRequest:
         Args:
             system_prompt (str): System prompt to set context
             user_prompt (str): User prompt with the actual request
+            system_context (str): Variable system text appended after the static system prompt
             **kwargs: Additional arguments for safe_generate_response
             
         Returns:
             Optional[str]: Generated response
         """
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
+        if self.use_api and self.local_model_path:
+            return self._generate_local(system_prompt, user_prompt, system_context, **kwargs)
+        
+        messages = self._build_messages(system_prompt, user_prompt, system_context)
         
         return self.safe_generate_response(messages, **kwargs)
+    
+    async def generate_with_system_prompt_async(self,
+                                                system_prompt: str,
+                                                user_prompt: str,
+                                                system_context: Optional[str] = None,
+                                                **kwargs) -> Optional[str]:
+        """Async version of generate_with_system_prompt"""
+        if self.use_api and self.local_model_path:
+            return await asyncio.to_thread(self._generate_local, system_prompt, user_prompt, system_context, **kwargs)
+        
+        messages = self._build_messages(system_prompt, user_prompt, system_context)
+        
+        return await self.safe_generate_response_async(messages, **kwargs)
 
 
-# Global instance for easy access
-_gpt_client = None
+def _get_request_semaphore() -> asyncio.Semaphore:
+    """Get the request semaphore for the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _request_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        _request_semaphores[loop] = semaphore
+    return semaphore
 
 def get_gpt_client(api_key: Optional[str] = None) -> GPTRequest:
-    """Get or create a global GPT client instance"""
-    global _gpt_client
-    if _gpt_client is None:
-        _gpt_client = GPTRequest(api_key=api_key)
-    return _gpt_client
+    """Get or create a shared GPT client instance (one per API key)"""
+    # lru_cache keys on how arguments are passed, so normalize first:
+    # get_gpt_client(), get_gpt_client(None) and get_gpt_client(api_key=None) share one client
+    return _get_gpt_client(api_key or None)
+
+@functools.lru_cache(maxsize=8)
+def _get_gpt_client(api_key: Optional[str]) -> GPTRequest:
+    return GPTRequest(api_key=api_key)
+
+def clear_prompt_cache() -> None:
+    """Clear the shared LLM response cache (in memory and on disk)"""
+    _prompt_cache.clear()
 
 def safe_generate_response(messages: List[Dict[str, str]], **kwargs) -> Optional[str]:
     """
@@ -200,12 +461,29 @@ def generate_with_system_prompt(system_prompt: str, user_prompt: str, **kwargs)
     client = get_gpt_client()
     return client.generate_with_system_prompt(system_prompt, user_prompt, **kwargs)
 
-def parse_json_response(response: str) -> Optional[Dict[str, Any]]:
+async def generate_with_system_prompt_async(system_prompt: str, user_prompt: str, **kwargs) -> Optional[str]:
+    """
+    Async convenience function for generation with system prompt.
+    
+    Args:
+        system_prompt (str): System prompt
+        user_prompt (str): User prompt
+        **kwargs: Additional arguments
+        
+    Returns:
+        Optional[str]: Generated response
+    """
+    client = get_gpt_client()
+    return await client.generate_with_system_prompt_async(system_prompt, user_prompt, **kwargs)
+
+def parse_json_response(response: str, target: Optional[type] = None) -> Optional[Dict[str, Any]]:
     """
     Parse a JSON response from the LLM.
     
     Args:
         response (str): Raw response from LLM
+        target (type): Optional TypedDict schema; the JSON is decoded and
+            validated against it in one pass
         
     Returns:
         Optional[Dict]: Parsed JSON or None if invalid
@@ -213,24 +491,76 @@ def parse_json_response(response: str) -> Optional[Dict[str, Any]]:
     if not response:
         return None
     
-    # Try to extract JSON from the response
+    # Sometimes the response includes extra text, try to find JSON
+    start = response.find('{')
+    end = response.rfind('}') + 1
+    json_str = response[start:end] if start != -1 and end > start else response
+    
+    if target is not None:
+        try:
+            return msgspec.json.decode(json_str, type=target)
+        except msgspec.ValidationError as e:
+            logger.warning(f"JSON response does not match {target.__name__}: {e}")
+            return None
+        except msgspec.DecodeError as e:
+            logger.warning(f"Failed to parse JSON response: {e}")
+            logger.warning(f"Response was: {response}")
+            return None
+    
     try:
-        # Sometimes the response includes extra text, try to find JSON
-        start = response.find('{')
-        end = response.rfind('}') + 1
-        
-        if start != -1 and end > start:
-            json_str = response[start:end]
-            return json.loads(json_str)
-        else:
-            # Try parsing the entire response
-            return json.loads(response)
-            
+        return _json_loads(json_str)
     except json.JSONDecodeError as e:
         logger.warning(f"Failed to parse JSON response: {e}")
         logger.warning(f"Response was: {response}")
         return None
 
+class _ChunkReader:
+    """File-like view over an iterable of text chunks, skipping any text before the first '{'"""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self._started = False
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            if not self._started:
+                start = chunk.find('{')
+                if start == -1:
+                    continue
+                chunk = chunk[start:]
+                self._started = True
+            self._buffer += chunk.encode('utf-8')
+
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+def parse_json_response_stream(chunks_iter: Iterable[str], prefix: str = 'schedule.item') -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse a streamed JSON response from the LLM, yielding
+    items as soon as they are complete.
+    
+    Args:
+        chunks_iter (Iterable[str]): Text chunks as they arrive from the LLM
+        prefix (str): ijson prefix of the items to yield
+        
+    Yields:
+        Dict: Each parsed item (schedule entries by default)
+    """
+    import ijson
+
+    try:
+        yield from ijson.items(_ChunkReader(chunks_iter), prefix, use_float=True)
+    except ijson.JSONError as e:
+        # LLMs often append text after the JSON object; items already yielded stand
+        logger.debug(f"Stopped parsing streamed JSON response: {e}")
+
 def parse_list_response(response: str, delimiter: str = '\n') -> List[str]:
     """
     Parse a list response from the LLM.
@@ -256,6 +586,48 @@ def parse_list_response(response: str, delimiter: str = '\n') -> List[str]:
     
     return items
 
+_IMPORTANCE_SCORE_RE = re.compile(r'\b([1-9]|10)\b')
+
+# Responses at least this long are scanned with hyperscan (SIMD, runtime CPU
+# dispatch); shorter ones are faster with re since the scan callback dominates
+_HYPERSCAN_MIN_LENGTH = 256
+
+def _build_importance_score_db():
+    """Compile the importance score pattern for hyperscan, or None if unavailable"""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(expressions=[rb'\b(?:[1-9]|10)\b'], ids=[0], flags=[hyperscan.HS_FLAG_SOM_LEFTMOST])
+        return db
+    except hyperscan.error as e:
+        logger.warning(f"hyperscan unavailable ({e}) - using re for importance scores")
+        return None
+
+_importance_score_db = _build_importance_score_db()
+_importance_score_lock = threading.Lock()  # hyperscan scratch space is not thread-safe
+
+def _find_importance_number(response: str) -> Optional[str]:
+    """Return the first standalone 1-10 in the response"""
+    # hyperscan's \b is ASCII-only, so non-ASCII text goes through re for identical results
+    if _importance_score_db is not None and len(response) >= _HYPERSCAN_MIN_LENGTH and response.isascii():
+        data = response.encode('ascii')
+        matches = []
+        
+        def on_match(match_id, start, end, flags, context):
+            matches.append(data[start:end])
+            return True  # Stop at the first match
+        
+        with _importance_score_lock:
+            try:
+                _importance_score_db.scan(data, match_event_handler=on_match)
+            except hyperscan.ScanTerminated:
+                pass
+        return matches[0].decode('ascii') if matches else None
+    
+    match = _IMPORTANCE_SCORE_RE.search(response)
+    return match.group(1) if match else None
+
 def extract_importance_score(response: str) -> float:
     """
     Extract an importance score (1-10) from the LLM response.
@@ -270,12 +642,11 @@ def extract_importance_score(response: str) -> float:
         return 5.0
     
     # Look for numbers in the response
-    import re
-    numbers = re.findall(r'\b([1-9]|10)\b', response)
+    number = _find_importance_number(response)
     
-    if numbers:
+    if number:
         try:
-            score = float(numbers[0])
+            score = float(number)
             return max(1.0, min(10.0, score))
         except ValueError:
             pass
@@ -0,0 +1,164 @@
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _NamespaceIndex:
+    """
+    Inner-product index over normalized embeddings plus their responses.
+    Embeddings live in a capacity-doubling buffer (first `size` rows used);
+    when max_entries is reached the oldest half of the entries is dropped.
+    """
+
+    def __init__(self, dim: int, max_entries: int):
+        self.max_entries = max(2, max_entries)
+        self.responses: List[str] = []
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self.size = 0
+        try:
+            import faiss
+            self._faiss_index = faiss.IndexFlatIP(dim)
+        except ImportError:
+            self._faiss_index = None
+
+    def search(self, embedding: np.ndarray) -> Optional[tuple]:
+        """Return (similarity, response) of the nearest entry"""
+        if not self.size:
+            return None
+        if self._faiss_index is not None:
+            scores, ids = self._faiss_index.search(embedding[None, :], 1)
+            best, score = int(ids[0, 0]), float(scores[0, 0])
+        else:
+            scores = self._vectors[:self.size] @ embedding
+            best = int(np.argmax(scores))
+            score = float(scores[best])
+        return score, self.responses[best]
+
+    def add(self, embedding: np.ndarray, response: str) -> None:
+        """Append an entry, evicting the oldest half of the entries when full"""
+        n = self.size
+        if n == self.max_entries:
+            keep = n // 2
+            self._vectors[:keep] = self._vectors[n - keep:n]
+            del self.responses[:n - keep]
+            n = self.size = keep
+            if self._faiss_index is not None:
+                self._faiss_index.reset()
+                self._faiss_index.add(self._vectors[:n])
+        if n == len(self._vectors):
+            capacity = min(max(8, 2 * n), self.max_entries)
+            self._vectors = np.resize(self._vectors, (capacity, self._vectors.shape[1]))
+
+        self._vectors[n] = embedding
+        if self._faiss_index is not None:
+            self._faiss_index.add(embedding[None, :])
+        self.responses.append(response)
+        self.size = n + 1
+
+
+class PromptSemanticCache:
+    """
+    Semantic cache for LLM responses. User prompts are embedded with a
+    sentence-transformers model and a cached response is returned when a
+    previous prompt in the same namespace has cosine similarity >= threshold.
+    Uses faiss when available, otherwise a numpy inner-product search.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.92,
+                 model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 enabled: bool = True,
+                 max_entries_per_namespace: int = 4096):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            threshold (float): Minimum cosine similarity for a hit
+            model_name (str): sentence-transformers model used for embeddings
+            enabled (bool): Whether lookups and stores are active
+            max_entries_per_namespace (int): Entries kept per namespace before the oldest are evicted
+        """
+        self.threshold = threshold
+        self.model_name = model_name
+        self.enabled = enabled
+        self.max_entries_per_namespace = max_entries_per_namespace
+
+        self._model = None
+        self._indexes: Dict[str, _NamespaceIndex] = {}
+        self._lock = threading.Lock()
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed and L2-normalize a text; disables the cache if the model is unavailable"""
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                logger.warning("sentence-transformers is not installed - disabling semantic prompt cache")
+                self.enabled = False
+                return None
+            self._model = SentenceTransformer(self.model_name)
+
+        embedding = np.asarray(self._model.encode(text), dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+
+    def lookup(self, namespace: str, prompt: str, threshold: Optional[float] = None) -> Optional[str]:
+        """
+        Find a cached response for a semantically similar prompt.
+
+        Args:
+            namespace (str): Partition key (e.g. prompt type and agent)
+            prompt (str): User prompt to match
+            threshold (float): Override for the similarity threshold
+
+        Returns:
+            Optional[str]: Cached response or None on a miss
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                return None
+            embedding = self._embed(prompt)
+            if embedding is None:
+                return None
+            hit = index.search(embedding)
+
+        if hit is not None and hit[0] >= (self.threshold if threshold is None else threshold):
+            return hit[1]
+        return None
+
+    def store(self, namespace: str, prompt: str, response: str) -> None:
+        """
+        Store a response for a prompt.
+
+        Args:
+            namespace (str): Partition key (e.g. prompt type and agent)
+            prompt (str): User prompt that produced the response
+            response (str): LLM response
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            embedding = self._embed(prompt)
+            if embedding is None:
+                return
+            index = self._indexes.get(namespace)
+            if index is None:
+                index = self._indexes[namespace] = _NamespaceIndex(embedding.shape[0], self.max_entries_per_namespace)
+            index.add(embedding, response)
+
+    def clear(self) -> None:
+        """Remove all cached entries"""
+        with self._lock:
+            self._indexes.clear()
+
+
+# Shared cache, enabled with USE_SEMANTIC_CACHE=1
+semantic_cache = PromptSemanticCache(enabled=os.getenv('USE_SEMANTIC_CACHE', '0') == '1')
@@ -0,0 +1,50 @@
+from typing import Dict, List, TypedDict
+
+
+class _ScheduleItemRequired(TypedDict):
+    hour: int
+    activity: str
+
+
+class ScheduleItem(_ScheduleItemRequired, total=False):
+    """One entry of a daily plan's schedule"""
+    priority: float
+
+
+class _DailyPlanRequired(TypedDict):
+    schedule: List[ScheduleItem]
+
+
+class DailyPlan(_DailyPlanRequired, total=False):
+    """Response of run_gpt_prompt_daily_planning"""
+    wake_up_hour: int
+    sleep_hour: int
+    main_goals_today: List[str]
+    reflection_notes: str
+
+
+class DayPlan(TypedDict, total=False):
+    """One day of a weekly plan"""
+    theme: str
+    main_goals: List[str]
+    focus_areas: List[str]
+
+
+class _WeeklyPlanRequired(TypedDict):
+    daily_plans: Dict[str, DayPlan]
+
+
+class WeeklyPlan(_WeeklyPlanRequired, total=False):
+    """Response of run_gpt_prompt_weekly_planning"""
+    weekly_theme: str
+    weekly_goals: List[str]
+    challenges_to_address: List[str]
+
+
+class GoalUpdate(TypedDict, total=False):
+    """Response of run_gpt_prompt_goal_setting"""
+    long_term_goals: List[str]
+    core_principles: List[str]
+    short_term_objectives: List[str]
+    areas_for_growth: List[str]
+    goal_changes: str
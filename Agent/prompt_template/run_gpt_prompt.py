@@ -1,22 +1,84 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple, Callable, Awaitable
+import asyncio
 import datetime
-from .gpt_structure import generate_with_system_prompt, parse_json_response, parse_list_response, extract_importance_score
-
-def run_gpt_prompt_reflection(agent_name: str, 
-                            recent_memories: List[str],
-                            current_date: str) -> Optional[str]:
-    """
-    Generate a daily reflection based on recent memories.
-    
-    Args:
-        agent_name (str): Name of the agent
-        recent_memories (List[str]): List of recent memory texts
-        current_date (str): Current date string
-        
-    Returns:
-        Optional[str]: Generated reflection
-    """
-    system_prompt = f"""You are {agent_name}, a thoughtful person reflecting on your recent experiences. 
+import functools
+import os
+import re
+from .gpt_structure import (
+    generate_with_system_prompt, generate_with_system_prompt_async,
+    parse_json_response, parse_list_response, extract_importance_score, get_gpt_client
+)
+from .batching import AutoBatcher
+from .prompt_semantic_cache import semantic_cache
+from .response_schemas import DailyPlan, WeeklyPlan, GoalUpdate
+
+# Generation parameters per prompt type
+_REFLECTION_PARAMS = {"max_tokens": 500, "temperature": 0.7}
+_DAILY_PLANNING_PARAMS = {"max_tokens": 800, "temperature": 0.6}
+_WEEKLY_PLANNING_PARAMS = {"max_tokens": 1000, "temperature": 0.6}
+_IMPORTANCE_SCORING_PARAMS = {"max_tokens": 100, "temperature": 0.3}
+_GOAL_SETTING_PARAMS = {"max_tokens": 800, "temperature": 0.6}
+_ACTION_PLANNING_PARAMS = {"max_tokens": 300, "temperature": 0.7}
+_MEMORY_SYNTHESIS_PARAMS = {"max_tokens": 400, "temperature": 0.7}
+
+# Width of a max_tokens bin for multi-bin batching
+TOKEN_BIN_SIZE = 128
+
+# When set, run_many fires one max_tokens bin at a time so a self-hosted
+# server batches requests of similar length; provider APIs use a single bin
+TOKEN_BIN_BATCHING = os.getenv('TOKEN_BIN_BATCHING', '0') == '1'
+
+def _token_bin(params: Dict[str, Any]) -> int:
+    """Bin id of a set of generation parameters"""
+    return params["max_tokens"] // TOKEN_BIN_SIZE
+
+@functools.lru_cache(maxsize=256)
+def _bulletize_cached(items: Tuple[str, ...]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+def _bulletize(items: List[str]) -> str:
+    """Format items as a "- item" bullet list (memoized for repeated lists)"""
+    return _bulletize_cached(tuple(items))
+
+_JSON_REPAIR_USER_TMPL = """{user_prompt}
+
+Your previous response could not be used because it was not a JSON object in the requested format:
+{response}
+
+Respond again with only the JSON object."""
+
+def _generate_json(system_prompt: str,
+                   user_prompt: str,
+                   system_context: Optional[str],
+                   params: Dict[str, Any],
+                   target: type) -> Optional[Dict[str, Any]]:
+    """Generate a JSON response validated against target, re-prompting once if it does not match"""
+    response = generate_with_system_prompt(system_prompt, user_prompt, system_context=system_context, **params)
+    parsed = parse_json_response(response, target) if response else None
+    if parsed is None and response:
+        repair_prompt = _JSON_REPAIR_USER_TMPL.format(user_prompt=user_prompt, response=response)
+        response = generate_with_system_prompt(system_prompt, repair_prompt, system_context=system_context, **params)
+        parsed = parse_json_response(response, target) if response else None
+    return parsed
+
+async def _generate_json_async(system_prompt: str,
+                               user_prompt: str,
+                               system_context: Optional[str],
+                               params: Dict[str, Any],
+                               target: type) -> Optional[Dict[str, Any]]:
+    """Async version of _generate_json"""
+    response = await generate_with_system_prompt_async(system_prompt, user_prompt, system_context=system_context, **params)
+    parsed = parse_json_response(response, target) if response else None
+    if parsed is None and response:
+        repair_prompt = _JSON_REPAIR_USER_TMPL.format(user_prompt=user_prompt, response=response)
+        response = await generate_with_system_prompt_async(system_prompt, repair_prompt, system_context=system_context, **params)
+        parsed = parse_json_response(response, target) if response else None
+    return parsed
+
+# System prompts are agent-independent so the long instruction text forms an
+# identical prefix across agents (provider prompt caching); the agent's
+# identity is passed separately as a short system_context appendix.
+_REFLECTION_SYSTEM_PROMPT = """You are a thoughtful person reflecting on your recent experiences. 
 Your task is to create a meaningful reflection that captures the key themes, lessons, and insights from your recent memories.
 
 Focus on:
@@ -26,38 +88,54 @@ Focus on:
 - Areas for improvement or growth
 - Meaningful connections or relationships
 
-Keep your reflection personal, authentic, and insightful. Write in first person as {agent_name}."""
+Keep your reflection personal, authentic, and insightful. Write in first person as the person named below."""
 
-    memories_text = "\n".join([f"- {memory}" for memory in recent_memories])
-    
-    user_prompt = f"""Based on these recent experiences from {current_date}, please write a thoughtful reflection:
+_REFLECTION_USER_TMPL = """Based on these recent experiences from {current_date}, please write a thoughtful reflection:
 
 Recent Memories:
 {memories_text}
 
 Write a reflection that synthesizes these experiences into meaningful insights. What did you learn? What patterns do you notice? How do these experiences shape your understanding of yourself and your goals?"""
 
-    return generate_with_system_prompt(system_prompt, user_prompt, max_tokens=500, temperature=0.7)
+def _reflection_prompts(agent_name: str, 
+                        recent_memories: List[str],
+                        current_date: str) -> Tuple[str, str, Optional[str]]:
+    """Build the (system, user, system context) prompts for run_gpt_prompt_reflection"""
+    system_prompt = _REFLECTION_SYSTEM_PROMPT
+    system_context = f"You are {agent_name}."
+    
+    user_prompt = _REFLECTION_USER_TMPL.format(
+        current_date=current_date,
+        memories_text=_bulletize(recent_memories)
+    )
+    
+    return system_prompt, user_prompt, system_context
 
-def run_gpt_prompt_daily_planning(agent_name: str,
-                                reflection: str,
-                                goals: List[str],
-                                current_date: str,
-                                wake_up_hour: int = 7) -> Optional[Dict[str, Any]]:
+def run_gpt_prompt_reflection(agent_name: str, 
+                            recent_memories: List[str],
+                            current_date: str) -> Optional[str]:
     """
-    Generate a daily plan with hourly schedule.
+    Generate a daily reflection based on recent memories.
     
     Args:
         agent_name (str): Name of the agent
-        reflection (str): Recent reflection
-        goals (List[str]): Current goals
-        current_date (str): Current date
-        wake_up_hour (int): Hour to wake up
+        recent_memories (List[str]): List of recent memory texts
+        current_date (str): Current date string
         
     Returns:
-        Optional[Dict]: Daily plan with schedule
+        Optional[str]: Generated reflection
     """
-    system_prompt = f"""You are {agent_name}, planning your day thoughtfully. 
+    system_prompt, user_prompt, system_context = _reflection_prompts(agent_name, recent_memories, current_date)
+    return generate_with_system_prompt(system_prompt, user_prompt, system_context=system_context, **_REFLECTION_PARAMS)
+
+async def run_gpt_prompt_reflection_async(agent_name: str, 
+                                          recent_memories: List[str],
+                                          current_date: str) -> Optional[str]:
+    """Async version of run_gpt_prompt_reflection"""
+    system_prompt, user_prompt, system_context = _reflection_prompts(agent_name, recent_memories, current_date)
+    return await generate_with_system_prompt_async(system_prompt, user_prompt, system_context=system_context, **_REFLECTION_PARAMS)
+
+_DAILY_PLANNING_SYSTEM_PROMPT = """You are planning your day thoughtfully. 
 Create a realistic daily schedule that balances your goals, responsibilities, and personal needs.
 
 Your response should be a JSON object with:
@@ -69,9 +147,7 @@ Your response should be a JSON object with:
 
 Make the schedule realistic and balanced."""
 
-    goals_text = "\n".join([f"- {goal}" for goal in goals])
-    
-    user_prompt = f"""Plan your day for {current_date}.
+_DAILY_PLANNING_USER_TMPL = """Plan your day for {current_date}.
 
 Your recent reflection:
 {reflection}
@@ -81,26 +157,54 @@ Your current goals:
 
 Create a detailed hourly schedule from wake up to sleep. Include work, personal time, meals, exercise, social activities, and goal-related tasks. Be specific about activities and assign priority levels."""
 
-    response = generate_with_system_prompt(system_prompt, user_prompt, max_tokens=800, temperature=0.6)
-    return parse_json_response(response) if response else None
+def _daily_planning_prompts(agent_name: str,
+                            reflection: str,
+                            goals: List[str],
+                            current_date: str,
+                            wake_up_hour: int = 7) -> Tuple[str, str, Optional[str]]:
+    """Build the (system, user, system context) prompts for run_gpt_prompt_daily_planning"""
+    system_prompt = _DAILY_PLANNING_SYSTEM_PROMPT
+    system_context = f"You are {agent_name}."
+    
+    user_prompt = _DAILY_PLANNING_USER_TMPL.format(
+        current_date=current_date,
+        reflection=reflection,
+        goals_text=_bulletize(goals)
+    )
+    
+    return system_prompt, user_prompt, system_context
 
-def run_gpt_prompt_weekly_planning(agent_name: str,
-                                 daily_reflections: List[str],
-                                 long_term_goals: List[str],
-                                 current_week: str) -> Optional[Dict[str, Any]]:
+def run_gpt_prompt_daily_planning(agent_name: str,
+                                reflection: str,
+                                goals: List[str],
+                                current_date: str,
+                                wake_up_hour: int = 7) -> Optional[Dict[str, Any]]:
     """
-    Generate a weekly plan with daily themes and goals.
+    Generate a daily plan with hourly schedule.
     
     Args:
         agent_name (str): Name of the agent
-        daily_reflections (List[str]): Recent daily reflections
-        long_term_goals (List[str]): Long-term goals
-        current_week (str): Current week description
+        reflection (str): Recent reflection
+        goals (List[str]): Current goals
+        current_date (str): Current date
+        wake_up_hour (int): Hour to wake up
         
     Returns:
-        Optional[Dict]: Weekly plan
+        Optional[Dict]: Daily plan with schedule
     """
-    system_prompt = f"""You are {agent_name}, planning your week strategically.
+    system_prompt, user_prompt, system_context = _daily_planning_prompts(agent_name, reflection, goals, current_date, wake_up_hour)
+    return _generate_json(system_prompt, user_prompt, system_context, _DAILY_PLANNING_PARAMS, DailyPlan)
+
+async def run_gpt_prompt_daily_planning_async(agent_name: str,
+                                              reflection: str,
+                                              goals: List[str],
+                                              current_date: str,
+                                              wake_up_hour: int = 7) -> Optional[Dict[str, Any]]:
+    """Async version of run_gpt_prompt_daily_planning"""
+    system_prompt, user_prompt, system_context = _daily_planning_prompts(agent_name, reflection, goals, current_date, wake_up_hour)
+    return await _generate_json_async(system_prompt, user_prompt, system_context, _DAILY_PLANNING_PARAMS, DailyPlan)
+
+_WEEKLY_PLANNING_SYSTEM_PROMPT = """You are planning your week strategically.
 Create a weekly plan that moves you toward your long-term goals while maintaining balance.
 
 Your response should be a JSON object with:
@@ -112,10 +216,7 @@ Your response should be a JSON object with:
 - "weekly_goals": array of strings (3-5 major goals for the week)
 - "challenges_to_address": array of strings (potential challenges and how to handle them)"""
 
-    reflections_text = "\n".join([f"- {reflection}" for reflection in daily_reflections])
-    goals_text = "\n".join([f"- {goal}" for goal in long_term_goals])
-    
-    user_prompt = f"""Plan your week for {current_week}.
+_WEEKLY_PLANNING_USER_TMPL = """Plan your week for {current_week}.
 
 Recent daily reflections:
 {reflections_text}
@@ -125,22 +226,50 @@ Your long-term goals:
 
 Create a strategic weekly plan that builds on your recent insights and moves you toward your long-term objectives. Consider what you've learned from your daily reflections."""
 
-    response = generate_with_system_prompt(system_prompt, user_prompt, max_tokens=1000, temperature=0.6)
-    return parse_json_response(response) if response else None
+def _weekly_planning_prompts(agent_name: str,
+                             daily_reflections: List[str],
+                             long_term_goals: List[str],
+                             current_week: str) -> Tuple[str, str, Optional[str]]:
+    """Build the (system, user, system context) prompts for run_gpt_prompt_weekly_planning"""
+    system_prompt = _WEEKLY_PLANNING_SYSTEM_PROMPT
+    system_context = f"You are {agent_name}."
+    
+    user_prompt = _WEEKLY_PLANNING_USER_TMPL.format(
+        current_week=current_week,
+        reflections_text=_bulletize(daily_reflections),
+        goals_text=_bulletize(long_term_goals)
+    )
+    
+    return system_prompt, user_prompt, system_context
 
-def run_gpt_prompt_importance_scoring(memory_text: str, 
-                                    agent_context: str) -> float:
+def run_gpt_prompt_weekly_planning(agent_name: str,
+                                 daily_reflections: List[str],
+                                 long_term_goals: List[str],
+                                 current_week: str) -> Optional[Dict[str, Any]]:
     """
-    Score the importance of a memory for the agent.
+    Generate a weekly plan with daily themes and goals.
     
     Args:
-        memory_text (str): The memory to score
-        agent_context (str): Context about the agent
+        agent_name (str): Name of the agent
+        daily_reflections (List[str]): Recent daily reflections
+        long_term_goals (List[str]): Long-term goals
+        current_week (str): Current week description
         
     Returns:
-        float: Importance score from 1-10
+        Optional[Dict]: Weekly plan
     """
-    system_prompt = f"""You are evaluating the importance of a memory for someone. 
+    system_prompt, user_prompt, system_context = _weekly_planning_prompts(agent_name, daily_reflections, long_term_goals, current_week)
+    return _generate_json(system_prompt, user_prompt, system_context, _WEEKLY_PLANNING_PARAMS, WeeklyPlan)
+
+async def run_gpt_prompt_weekly_planning_async(agent_name: str,
+                                               daily_reflections: List[str],
+                                               long_term_goals: List[str],
+                                               current_week: str) -> Optional[Dict[str, Any]]:
+    """Async version of run_gpt_prompt_weekly_planning"""
+    system_prompt, user_prompt, system_context = _weekly_planning_prompts(agent_name, daily_reflections, long_term_goals, current_week)
+    return await _generate_json_async(system_prompt, user_prompt, system_context, _WEEKLY_PLANNING_PARAMS, WeeklyPlan)
+
+_IMPORTANCE_SCORING_SYSTEM_PROMPT = """You are evaluating the importance of a memory for someone. 
 Rate the importance on a scale of 1-10 where:
 
 1-3: Routine, everyday activities with little significance
@@ -157,32 +286,146 @@ Consider:
 
 Respond with just the number (1-10) and a brief explanation."""
 
-    user_prompt = f"""Agent context: {agent_context}
+_IMPORTANCE_SCORING_USER_TMPL = """Agent context: {agent_context}
 
 Memory to evaluate: {memory_text}
 
 Rate the importance of this memory (1-10):"""
 
-    response = generate_with_system_prompt(system_prompt, user_prompt, max_tokens=100, temperature=0.3)
+def _importance_scoring_prompts(memory_text: str, 
+                                agent_context: str) -> Tuple[str, str, Optional[str]]:
+    """Build the (system, user, system context) prompts for run_gpt_prompt_importance_scoring"""
+    system_prompt = _IMPORTANCE_SCORING_SYSTEM_PROMPT
+    system_context = None
+    
+    user_prompt = _IMPORTANCE_SCORING_USER_TMPL.format(
+        agent_context=agent_context,
+        memory_text=memory_text
+    )
+    
+    return system_prompt, user_prompt, system_context
+
+def run_gpt_prompt_importance_scoring(memory_text: str, 
+                                    agent_context: str) -> float:
+    """
+    Score the importance of a memory for the agent.
+    
+    Args:
+        memory_text (str): The memory to score
+        agent_context (str): Context about the agent
+        
+    Returns:
+        float: Importance score from 1-10
+    """
+    system_prompt, user_prompt, system_context = _importance_scoring_prompts(memory_text, agent_context)
+    response = generate_with_system_prompt(system_prompt, user_prompt, system_context=system_context, **_IMPORTANCE_SCORING_PARAMS)
     return extract_importance_score(response) if response else 5.0
 
-def run_gpt_prompt_goal_setting(agent_name: str,
-                              current_goals: List[str],
-                              reflections: List[str],
-                              life_context: str) -> Optional[Dict[str, Any]]:
+async def _run_importance_scoring_single_async(memory_text: str,
+                                               agent_context: str) -> float:
+    """Score one memory with the single-item importance prompt"""
+    system_prompt, user_prompt, system_context = _importance_scoring_prompts(memory_text, agent_context)
+    response = await generate_with_system_prompt_async(system_prompt, user_prompt, system_context=system_context, **_IMPORTANCE_SCORING_PARAMS)
+    return extract_importance_score(response) if response else 5.0
+
+async def run_gpt_prompt_importance_scoring_async(memory_text: str, 
+                                                  agent_context: str) -> float:
     """
-    Generate or update long-term goals based on reflections.
+    Async version of run_gpt_prompt_importance_scoring. Concurrent calls are
+    micro-batched into shared batch prompts by _importance_batcher.
+    """
+    return await _importance_batcher.submit((memory_text, agent_context))
+
+_IMPORTANCE_SCORING_BATCH_SYSTEM_PROMPT = _IMPORTANCE_SCORING_SYSTEM_PROMPT.replace(
+    "Respond with just the number (1-10) and a brief explanation.",
+    "Respond with one line per memory in the form \"Memory <number>: <score>\", with no explanations."
+)
+
+_MEMORY_LINE_RE = re.compile(r'^[-*\s]*memory\s*(\d+)\s*[:.)-]\s*(.*)$', re.IGNORECASE)
+
+def _importance_scoring_batch_prompts(memories: List[Tuple[str, str]]) -> Tuple[str, str, Optional[str]]:
+    """Build the (system, user, system context) prompts for run_gpt_prompt_importance_scoring_batch"""
+    system_prompt = _IMPORTANCE_SCORING_BATCH_SYSTEM_PROMPT
+    system_context = None
+    
+    contexts = {agent_context for _, agent_context in memories}
+    lines = []
+    if len(contexts) == 1:
+        lines.append(f"Agent context: {memories[0][1]}")
+        lines.append("")
+        for i, (memory_text, _) in enumerate(memories, 1):
+            lines.append(f"Memory {i}: {memory_text}")
+    else:
+        for i, (memory_text, agent_context) in enumerate(memories, 1):
+            lines.append(f"Memory {i}: {memory_text} (agent context: {agent_context})")
+    memories_text = "\n".join(lines)
+    
+    user_prompt = f"""{memories_text}
+
+Rate the importance of each memory (1-10):"""
+    
+    return system_prompt, user_prompt, system_context
+
+def _importance_batch_params(batch_size: int) -> Dict[str, Any]:
+    """Generation parameters for a batch prompt of batch_size memories"""
+    return {"max_tokens": 50 + 16 * batch_size, "temperature": _IMPORTANCE_SCORING_PARAMS["temperature"]}
+
+def _parse_importance_batch(response: Optional[str], batch_size: int) -> List[float]:
+    """Parse "Memory <n>: <score>" lines, defaulting missing scores to 5.0"""
+    scores = [5.0] * batch_size
+    if not response:
+        return scores
+    
+    position = 0
+    for line in response.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        match = _MEMORY_LINE_RE.match(line)
+        if match:
+            index, rest = int(match.group(1)) - 1, match.group(2)
+        else:
+            # Unlabelled lines are assigned positionally
+            index, rest = position, line
+        if 0 <= index < batch_size:
+            scores[index] = extract_importance_score(rest)
+        position += 1
+    return scores
+
+def run_gpt_prompt_importance_scoring_batch(memories: List[Tuple[str, str]]) -> List[float]:
+    """
+    Score the importance of several memories with a single request.
     
     Args:
-        agent_name (str): Name of the agent
-        current_goals (List[str]): Current goals
-        reflections (List[str]): Recent reflections
-        life_context (str): Context about the agent's life
+        memories (List[Tuple[str, str]]): (memory_text, agent_context) pairs
         
     Returns:
-        Optional[Dict]: Updated goals and principles
+        List[float]: Importance scores from 1-10, in input order
     """
-    system_prompt = f"""You are {agent_name}, thoughtfully setting and updating your life goals.
+    if not memories:
+        return []
+    # Mock responses (USE_API=0) answer one memory at a time, so score each separately
+    if len(memories) == 1 or not get_gpt_client().use_api:
+        return [run_gpt_prompt_importance_scoring(*memory) for memory in memories]
+    
+    system_prompt, user_prompt, system_context = _importance_scoring_batch_prompts(memories)
+    response = generate_with_system_prompt(system_prompt, user_prompt, system_context=system_context, **_importance_batch_params(len(memories)))
+    return _parse_importance_batch(response, len(memories))
+
+async def run_gpt_prompt_importance_scoring_batch_async(memories: List[Tuple[str, str]]) -> List[float]:
+    """Async version of run_gpt_prompt_importance_scoring_batch"""
+    if not memories:
+        return []
+    if len(memories) == 1 or not get_gpt_client().use_api:
+        return list(await asyncio.gather(*(_run_importance_scoring_single_async(*memory) for memory in memories)))
+    
+    system_prompt, user_prompt, system_context = _importance_scoring_batch_prompts(memories)
+    response = await generate_with_system_prompt_async(system_prompt, user_prompt, system_context=system_context, **_importance_batch_params(len(memories)))
+    return _parse_importance_batch(response, len(memories))
+
+_importance_batcher = AutoBatcher(run_gpt_prompt_importance_scoring_batch_async, max_batch=32, max_wait_ms=10)
+
+_GOAL_SETTING_SYSTEM_PROMPT = """You are thoughtfully setting and updating your life goals.
 Based on your recent reflections and current situation, refine your goals and principles.
 
 Your response should be a JSON object with:
@@ -194,10 +437,7 @@ Your response should be a JSON object with:
 
 Make goals specific, meaningful, and achievable."""
 
-    current_goals_text = "\n".join([f"- {goal}" for goal in current_goals])
-    reflections_text = "\n".join([f"- {reflection}" for reflection in reflections])
-    
-    user_prompt = f"""Your life context: {life_context}
+_GOAL_SETTING_USER_TMPL = """Your life context: {life_context}
 
 Your current goals:
 {current_goals_text}
@@ -207,28 +447,50 @@ Your recent reflections:
 
 Based on your reflections and growth, update your goals and principles. What have you learned about what matters most to you? What goals need to be added, modified, or removed?"""
 
-    response = generate_with_system_prompt(system_prompt, user_prompt, max_tokens=800, temperature=0.6)
-    return parse_json_response(response) if response else None
+def _goal_setting_prompts(agent_name: str,
+                          current_goals: List[str],
+                          reflections: List[str],
+                          life_context: str) -> Tuple[str, str, Optional[str]]:
+    """Build the (system, user, system context) prompts for run_gpt_prompt_goal_setting"""
+    system_prompt = _GOAL_SETTING_SYSTEM_PROMPT
+    system_context = f"You are {agent_name}."
+    
+    user_prompt = _GOAL_SETTING_USER_TMPL.format(
+        life_context=life_context,
+        current_goals_text=_bulletize(current_goals),
+        reflections_text=_bulletize(reflections)
+    )
+    
+    return system_prompt, user_prompt, system_context
 
-def run_gpt_prompt_action_planning(agent_name: str,
-                                 current_situation: str,
-                                 relevant_memories: List[str],
-                                 current_goals: List[str],
-                                 time_context: str) -> Optional[str]:
+def run_gpt_prompt_goal_setting(agent_name: str,
+                              current_goals: List[str],
+                              reflections: List[str],
+                              life_context: str) -> Optional[Dict[str, Any]]:
     """
-    Plan the next action based on current situation and memories.
+    Generate or update long-term goals based on reflections.
     
     Args:
         agent_name (str): Name of the agent
-        current_situation (str): Current situation description
-        relevant_memories (List[str]): Relevant memories for context
         current_goals (List[str]): Current goals
-        time_context (str): Time and context information
+        reflections (List[str]): Recent reflections
+        life_context (str): Context about the agent's life
         
     Returns:
-        Optional[str]: Planned action
+        Optional[Dict]: Updated goals and principles
     """
-    system_prompt = f"""You are {agent_name}, deciding what to do next.
+    system_prompt, user_prompt, system_context = _goal_setting_prompts(agent_name, current_goals, reflections, life_context)
+    return _generate_json(system_prompt, user_prompt, system_context, _GOAL_SETTING_PARAMS, GoalUpdate)
+
+async def run_gpt_prompt_goal_setting_async(agent_name: str,
+                                            current_goals: List[str],
+                                            reflections: List[str],
+                                            life_context: str) -> Optional[Dict[str, Any]]:
+    """Async version of run_gpt_prompt_goal_setting"""
+    system_prompt, user_prompt, system_context = _goal_setting_prompts(agent_name, current_goals, reflections, life_context)
+    return await _generate_json_async(system_prompt, user_prompt, system_context, _GOAL_SETTING_PARAMS, GoalUpdate)
+
+_ACTION_PLANNING_SYSTEM_PROMPT = """You are deciding what to do next.
 Based on your current situation, relevant memories, and goals, choose your next action.
 
 Consider:
@@ -240,10 +502,7 @@ Consider:
 
 Respond with a specific, actionable plan for what you should do next. Be concrete and realistic."""
 
-    memories_text = "\n".join([f"- {memory}" for memory in relevant_memories])
-    goals_text = "\n".join([f"- {goal}" for goal in current_goals])
-    
-    user_prompt = f"""Current situation: {current_situation}
+_ACTION_PLANNING_USER_TMPL = """Current situation: {current_situation}
 Time context: {time_context}
 
 Relevant memories:
@@ -254,23 +513,69 @@ Your current goals:
 
 What should you do next? Provide a specific action plan considering your situation, memories, and goals."""
 
-    return generate_with_system_prompt(system_prompt, user_prompt, max_tokens=300, temperature=0.7)
+def _action_planning_prompts(agent_name: str,
+                             current_situation: str,
+                             relevant_memories: List[str],
+                             current_goals: List[str],
+                             time_context: str) -> Tuple[str, str, Optional[str]]:
+    """Build the (system, user, system context) prompts for run_gpt_prompt_action_planning"""
+    system_prompt = _ACTION_PLANNING_SYSTEM_PROMPT
+    system_context = f"You are {agent_name}."
+    
+    user_prompt = _ACTION_PLANNING_USER_TMPL.format(
+        current_situation=current_situation,
+        time_context=time_context,
+        memories_text=_bulletize(relevant_memories),
+        goals_text=_bulletize(current_goals)
+    )
+    
+    return system_prompt, user_prompt, system_context
 
-def run_gpt_prompt_memory_synthesis(agent_name: str,
-                                  memories_to_synthesize: List[str],
-                                  context: str) -> Optional[str]:
+def run_gpt_prompt_action_planning(agent_name: str,
+                                 current_situation: str,
+                                 relevant_memories: List[str],
+                                 current_goals: List[str],
+                                 time_context: str) -> Optional[str]:
     """
-    Synthesize multiple memories into a higher-level insight.
+    Plan the next action based on current situation and memories.
     
     Args:
         agent_name (str): Name of the agent
-        memories_to_synthesize (List[str]): Memories to combine
-        context (str): Context for the synthesis
+        current_situation (str): Current situation description
+        relevant_memories (List[str]): Relevant memories for context
+        current_goals (List[str]): Current goals
+        time_context (str): Time and context information
         
     Returns:
-        Optional[str]: Synthesized insight
+        Optional[str]: Planned action
     """
-    system_prompt = f"""You are {agent_name}, looking for patterns and insights across multiple experiences.
+    system_prompt, user_prompt, system_context = _action_planning_prompts(agent_name, current_situation, relevant_memories, current_goals, time_context)
+    namespace = f"action_planning:{system_context}"
+    cached = semantic_cache.lookup(namespace, user_prompt)
+    if cached is not None:
+        return cached
+    response = generate_with_system_prompt(system_prompt, user_prompt, system_context=system_context, **_ACTION_PLANNING_PARAMS)
+    if response:
+        semantic_cache.store(namespace, user_prompt, response)
+    return response
+
+async def run_gpt_prompt_action_planning_async(agent_name: str,
+                                               current_situation: str,
+                                               relevant_memories: List[str],
+                                               current_goals: List[str],
+                                               time_context: str) -> Optional[str]:
+    """Async version of run_gpt_prompt_action_planning"""
+    system_prompt, user_prompt, system_context = _action_planning_prompts(agent_name, current_situation, relevant_memories, current_goals, time_context)
+    namespace = f"action_planning:{system_context}"
+    cached = semantic_cache.lookup(namespace, user_prompt)
+    if cached is not None:
+        return cached
+    response = await generate_with_system_prompt_async(system_prompt, user_prompt, system_context=system_context, **_ACTION_PLANNING_PARAMS)
+    if response:
+        semantic_cache.store(namespace, user_prompt, response)
+    return response
+
+_MEMORY_SYNTHESIS_SYSTEM_PROMPT = """You are looking for patterns and insights across multiple experiences.
 Synthesize these related memories into a higher-level understanding or insight.
 
 Focus on:
@@ -282,13 +587,99 @@ Focus on:
 
 Create a meaningful synthesis that captures the deeper understanding."""
 
-    memories_text = "\n".join([f"- {memory}" for memory in memories_to_synthesize])
-    
-    user_prompt = f"""Context: {context}
+_MEMORY_SYNTHESIS_USER_TMPL = """Context: {context}
 
 Related memories to synthesize:
 {memories_text}
 
 What patterns, themes, or insights emerge when you consider these memories together? What do they collectively tell you that individual memories might not reveal?"""
 
-    return generate_with_system_prompt(system_prompt, user_prompt, max_tokens=400, temperature=0.7) 
\ No newline at end of file
+def _memory_synthesis_prompts(agent_name: str,
+                              memories_to_synthesize: List[str],
+                              context: str) -> Tuple[str, str, Optional[str]]:
+    """Build the (system, user, system context) prompts for run_gpt_prompt_memory_synthesis"""
+    system_prompt = _MEMORY_SYNTHESIS_SYSTEM_PROMPT
+    system_context = f"You are {agent_name}."
+    
+    user_prompt = _MEMORY_SYNTHESIS_USER_TMPL.format(
+        context=context,
+        memories_text=_bulletize(memories_to_synthesize)
+    )
+    
+    return system_prompt, user_prompt, system_context
+
+def run_gpt_prompt_memory_synthesis(agent_name: str,
+                                  memories_to_synthesize: List[str],
+                                  context: str) -> Optional[str]:
+    """
+    Synthesize multiple memories into a higher-level insight.
+    
+    Args:
+        agent_name (str): Name of the agent
+        memories_to_synthesize (List[str]): Memories to combine
+        context (str): Context for the synthesis
+        
+    Returns:
+        Optional[str]: Synthesized insight
+    """
+    system_prompt, user_prompt, system_context = _memory_synthesis_prompts(agent_name, memories_to_synthesize, context)
+    namespace = f"memory_synthesis:{system_context}"
+    cached = semantic_cache.lookup(namespace, user_prompt)
+    if cached is not None:
+        return cached
+    response = generate_with_system_prompt(system_prompt, user_prompt, system_context=system_context, **_MEMORY_SYNTHESIS_PARAMS)
+    if response:
+        semantic_cache.store(namespace, user_prompt, response)
+    return response
+
+async def run_gpt_prompt_memory_synthesis_async(agent_name: str,
+                                                memories_to_synthesize: List[str],
+                                                context: str) -> Optional[str]:
+    """Async version of run_gpt_prompt_memory_synthesis"""
+    system_prompt, user_prompt, system_context = _memory_synthesis_prompts(agent_name, memories_to_synthesize, context)
+    namespace = f"memory_synthesis:{system_context}"
+    cached = semantic_cache.lookup(namespace, user_prompt)
+    if cached is not None:
+        return cached
+    response = await generate_with_system_prompt_async(system_prompt, user_prompt, system_context=system_context, **_MEMORY_SYNTHESIS_PARAMS)
+    if response:
+        semantic_cache.store(namespace, user_prompt, response)
+    return response
+
+# max_tokens bin of each async prompt function
+_PROMPT_TOKEN_BINS = {
+    run_gpt_prompt_reflection_async: _token_bin(_REFLECTION_PARAMS),
+    run_gpt_prompt_daily_planning_async: _token_bin(_DAILY_PLANNING_PARAMS),
+    run_gpt_prompt_weekly_planning_async: _token_bin(_WEEKLY_PLANNING_PARAMS),
+    run_gpt_prompt_importance_scoring_async: _token_bin(_IMPORTANCE_SCORING_PARAMS),
+    run_gpt_prompt_goal_setting_async: _token_bin(_GOAL_SETTING_PARAMS),
+    run_gpt_prompt_action_planning_async: _token_bin(_ACTION_PLANNING_PARAMS),
+    run_gpt_prompt_memory_synthesis_async: _token_bin(_MEMORY_SYNTHESIS_PARAMS),
+}
+
+async def run_many(calls: List[Tuple[Callable[..., Awaitable[Any]], Dict[str, Any]]]) -> List[Any]:
+    """
+    Run several async prompt functions concurrently. With TOKEN_BIN_BATCHING,
+    calls are grouped by max_tokens bin and each bin is fired in turn,
+    shortest first.
+    
+    Args:
+        calls (List[Tuple]): (async prompt function, keyword arguments) pairs
+        
+    Returns:
+        List[Any]: Results in the same order as calls
+    """
+    if not TOKEN_BIN_BATCHING:
+        return await asyncio.gather(*[fn(**kwargs) for fn, kwargs in calls])
+    
+    bins: Dict[int, List[int]] = {}
+    for i, (fn, _) in enumerate(calls):
+        bins.setdefault(_PROMPT_TOKEN_BINS.get(fn, 0), []).append(i)
+    
+    results: List[Any] = [None] * len(calls)
+    for bin_id in sorted(bins):
+        indices = bins[bin_id]
+        bin_results = await asyncio.gather(*[calls[i][0](**calls[i][1]) for i in indices])
+        for i, result in zip(indices, bin_results):
+            results[i] = result
+    return results
@@ -3,11 +3,16 @@ import time
 import logging
 import geopandas as gpd
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import shapely
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
 import json
+import sqlite3
 from ratelimit import limits, sleep_and_retry
 from datetime import datetime
 import warnings
@@ -16,6 +21,32 @@ from queue import Empty
 import threading
 from concurrent.futures import ThreadPoolExecutor
 import backoff
+import asyncio
+
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+try:
+    import aiohttp
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    aiohttp = None
+
+try:
+    import pyogrio
+except ImportError:
+    pyogrio = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,21 +60,95 @@ GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
 if not GOOGLE_MAPS_API_KEY:
     raise ValueError("GOOGLE_MAPS_API_KEY environment variable is not set")
 
-# Rate limiting constants
-CALLS = 1  # Number of calls allowed per period
+# Rate limiting constants: 10 QPS in total, shared by all pool workers through
+# the slot clock installed by init_worker and by all async tasks through one limiter
+CALLS = 10  # Number of calls allowed per period
 RATE_LIMIT_PERIOD = 1  # Time period in seconds
 MAX_RETRIES = 3  # Maximum number of retries for API calls
 BACKOFF_FACTOR = 2  # Exponential backoff factor
+REQUEST_TIMEOUT = 10.0  # Seconds before an API request is abandoned
+MAX_CONCURRENT_API_CALLS = 50  # In-flight requests for the async enrichment pipeline
+CACHE_MAX_AGE_DAYS = 30  # Cached place data older than this is refetched
+CACHE_DB_PATH = Path('cache/gmaps.sqlite')  # Place data cache shared by all workers
+CHECKPOINT_FSYNC_INTERVAL = 100  # Enrichment checkpoint records between fsyncs
+
+NEARBY_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+PLACE_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+
+# Fields kept from a nearby-search result and from a place details result
+_PLACE_KEYS = ('place_id', 'name', 'types', 'vicinity', 'rating', 'user_ratings_total')
+_DETAIL_KEYS = ('rating', 'website')
+
+# (enriched field, nearby-search key) and (enriched field, details key) pairs for enrich_building_data
+_NEARBY_FIELDS = (('googleName', 'name'), ('googleTypes', 'types'),
+                  ('googleVicinity', 'vicinity'), ('googlePlaceId', 'place_id'))
+_DETAIL_FIELDS = (('googleRating', 'rating'), ('googleWebsite', 'website'))
 
-# Global counter for API calls
+_now = datetime.now
+
+# Arrow string types read into pandas' pyarrow-backed string dtype
+_ARROW_STRING_DTYPES = {pa.string(): pd.StringDtype('pyarrow'), pa.large_string(): pd.StringDtype('pyarrow')}
+
+def _new_session() -> requests.Session:
+    """Create a pooled HTTP session so API calls reuse TLS connections"""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=64))
+    return session
+
+# Main-process session; pool workers get their own WORKER_SESSION from init_worker
+_SESSION = _new_session()
+WORKER_SESSION = None
+
+# Place cache connection, opened lazily once per process
+_cache_db = None
+_cache_db_pid = None
+
+# Global counter for API calls (shared memory, so pool workers see one count)
 api_call_counter = None
-api_call_lock = None
 
-def init_worker():
-    """Initialize worker process with global counter and lock."""
-    global api_call_counter, api_call_lock
-    api_call_counter = mp.Value('i', 0)
-    api_call_lock = mp.Lock()
+# Earliest time.time() at which the next API call may start (shared memory, so
+# pool workers pace their calls against one CALLS / RATE_LIMIT_PERIOD budget)
+api_rate_slot = None
+
+def init_worker(counter: Optional["mp.sharedctypes.Synchronized"] = None,
+                rate_slot: Optional["mp.sharedctypes.Synchronized"] = None):
+    """Initialize worker process with the shared API call counter, rate slot clock and its own HTTP session."""
+    global api_call_counter, api_rate_slot, WORKER_SESSION
+    api_call_counter = counter if counter is not None else mp.Value('i', 0)
+    api_rate_slot = rate_slot
+    WORKER_SESSION = _new_session()
+
+def _wait_for_rate_slot() -> None:
+    """Reserve the next free call slot on the shared clock and sleep until it starts"""
+    interval = RATE_LIMIT_PERIOD / CALLS
+    with api_rate_slot.get_lock():
+        now = time.time()
+        slot = max(now, api_rate_slot.value)
+        api_rate_slot.value = slot + interval
+    if slot > now:
+        time.sleep(slot - now)
+
+def _take_api_call(max_calls: Optional[int]) -> bool:
+    """
+    Reserve one API call against the shared counter.
+    
+    Args:
+        max_calls (int, optional): Maximum number of API calls allowed
+        
+    Returns:
+        bool: False if the limit has been reached
+    """
+    global api_call_counter
+    if api_call_counter is None:
+        # Called outside a pool worker
+        api_call_counter = mp.Value('i', 0)
+    
+    # Check-and-increment must be atomic across workers
+    with api_call_counter.get_lock():
+        if max_calls is not None and api_call_counter.value >= max_calls:
+            return False
+        api_call_counter.value += 1
+    return True
 
 @backoff.on_exception(
     backoff.expo,
@@ -51,9 +156,11 @@ def init_worker():
     max_tries=MAX_RETRIES,
     factor=BACKOFF_FACTOR
 )
+@sleep_and_retry
+@limits(calls=CALLS, period=RATE_LIMIT_PERIOD)
 def make_api_request(url: str, params: Dict) -> Dict:
     """
-    Make an API request with exponential backoff retry.
+    Make a rate-limited API request with exponential backoff retry.
     
     Args:
         url (str): API endpoint URL
@@ -62,10 +169,87 @@ def make_api_request(url: str, params: Dict) -> Dict:
     Returns:
         Dict: API response data
     """
-    response = requests.get(url, params=params)
+    if api_rate_slot is not None:
+        # Pool worker: @limits only sees this process, so also pace against the shared clock
+        _wait_for_rate_slot()
+    session = WORKER_SESSION if WORKER_SESSION is not None else _SESSION
+    response = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     return response.json()
 
+def _get_cache_db() -> sqlite3.Connection:
+    """
+    Get this process's connection to the place cache, creating the table on first use.
+    
+    Returns:
+        sqlite3.Connection: Cache database connection
+    """
+    global _cache_db, _cache_db_pid
+    
+    # SQLite connections must not cross a fork, so each worker opens its own
+    if _cache_db is None or _cache_db_pid != os.getpid():
+        CACHE_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _cache_db = sqlite3.connect(str(CACHE_DB_PATH), isolation_level=None, timeout=30, check_same_thread=False)
+        _cache_db.execute("PRAGMA journal_mode=WAL")
+        _cache_db.execute("CREATE TABLE IF NOT EXISTS places (key TEXT PRIMARY KEY, ts REAL, data BLOB)")
+        _cache_db_pid = os.getpid()
+    return _cache_db
+
+def _load_cached_place(lat: float, lng: float) -> Optional[Dict]:
+    """
+    Load cached place data for a coordinate if it is fresh enough.
+    
+    Args:
+        lat (float): Latitude
+        lng (float): Longitude
+        
+    Returns:
+        Optional[Dict]: Cached place data or None on a miss
+    """
+    try:
+        row = _get_cache_db().execute(
+            "SELECT data, ts FROM places WHERE key = ?", (f"{lat:.6f}_{lng:.6f}",)
+        ).fetchone()
+        # Check if cache is less than 30 days old
+        if row is not None and time.time() - row[1] < CACHE_MAX_AGE_DAYS * 86400:
+            return _json_loads(row[0])
+    except Exception as e:
+        logger.warning(f"Error reading cache: {str(e)}")
+    return None
+
+def _store_cached_place(lat: float, lng: float, place_data: Dict) -> None:
+    """
+    Cache place data for a coordinate.
+    
+    Args:
+        lat (float): Latitude
+        lng (float): Longitude
+        place_data (Dict): Place data to cache
+    """
+    try:
+        _get_cache_db().execute(
+            "INSERT OR REPLACE INTO places (key, ts, data) VALUES (?, ?, ?)",
+            (f"{lat:.6f}_{lng:.6f}", time.time(), _json_dumps(place_data))
+        )
+    except Exception as e:
+        logger.warning(f"Error writing to cache: {str(e)}")
+
+def _extract_place_data(result: Dict) -> Dict:
+    """
+    Extract the fields we keep from a Places nearby-search result.
+    
+    Args:
+        result (Dict): A single nearby-search result
+        
+    Returns:
+        Dict: Place data
+    """
+    place_data = {key: result.get(key) for key in _PLACE_KEYS}
+    if place_data['types'] is None:
+        place_data['types'] = []
+    place_data['cache_time'] = _now().isoformat()
+    return place_data
+
 def get_place_data(lat: float, lng: float, max_calls: Optional[int] = None) -> Optional[Dict]:
     """
     Get place data from Google Maps API with caching and rate limiting.
@@ -78,38 +262,18 @@ def get_place_data(lat: float, lng: float, max_calls: Optional[int] = None) -> O
     Returns:
         Optional[Dict]: Place data or None if not found
     """
-    global api_call_counter, api_call_lock
-    
     # Check if we've hit the API call limit
-    with api_call_lock:
-        if max_calls is not None and api_call_counter.value >= max_calls:
-            return None
-        api_call_counter.value += 1
-    
-    # Create cache directory if it doesn't exist
-    cache_dir = Path('cache/google_maps')
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Create cache key from coordinates
-    cache_key = f"{lat:.6f}_{lng:.6f}"
-    cache_file = cache_dir / f"{cache_key}.json"
+    if not _take_api_call(max_calls):
+        return None
     
     # Check cache first
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r') as f:
-                cached_data = json.load(f)
-                # Check if cache is less than 30 days old
-                cache_time = datetime.fromisoformat(cached_data.get('cache_time', '2000-01-01'))
-                if (datetime.now() - cache_time).days < 30:
-                    return cached_data
-        except Exception as e:
-            logger.warning(f"Error reading cache: {str(e)}")
+    cached_data = _load_cached_place(lat, lng)
+    if cached_data:
+        return cached_data
     
     try:
-        # Make API request with rate limiting
-        time.sleep(1)  # Basic rate limiting
-        url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+        # Make API request (rate limited by make_api_request)
+        url = NEARBY_SEARCH_URL
         params = {
             'location': f"{lat},{lng}",
             'radius': '50',  # 50 meters radius
@@ -119,27 +283,9 @@ def get_place_data(lat: float, lng: float, max_calls: Optional[int] = None) -> O
         data = make_api_request(url, params)
         
         if data['status'] == 'OK' and data['results']:
-            # Get the first result
-            result = data['results'][0]
-            
-            # Extract relevant data
-            place_data = {
-                'place_id': result.get('place_id'),
-                'name': result.get('name'),
-                'types': result.get('types', []),
-                'vicinity': result.get('vicinity'),
-                'rating': result.get('rating'),
-                'user_ratings_total': result.get('user_ratings_total'),
-                'cache_time': datetime.now().isoformat()
-            }
-            
-            # Cache the result
-            try:
-                with open(cache_file, 'w') as f:
-                    json.dump(place_data, f)
-            except Exception as e:
-                logger.warning(f"Error writing to cache: {str(e)}")
-            
+            # Extract relevant data from the first result and cache it
+            place_data = _extract_place_data(data['results'][0])
+            _store_cached_place(lat, lng, place_data)
             return place_data
             
         return None
@@ -159,18 +305,13 @@ def get_place_details(place_id: str, max_calls: Optional[int] = None) -> Dict:
     Returns:
         Dict: Place details
     """
-    global api_call_counter, api_call_lock
-    
     # Check if we've hit the API call limit
-    with api_call_lock:
-        if max_calls is not None and api_call_counter.value >= max_calls:
-            return {'status': 'OVER_QUERY_LIMIT'}
-        api_call_counter.value += 1
+    if not _take_api_call(max_calls):
+        return {'status': 'OVER_QUERY_LIMIT'}
     
     try:
-        # Make API request with rate limiting
-        time.sleep(1)  # Basic rate limiting
-        url = "https://maps.googleapis.com/maps/api/place/details/json"
+        # Make API request (rate limited by make_api_request)
+        url = PLACE_DETAILS_URL
         params = {
             'place_id': place_id,
             'key': GOOGLE_MAPS_API_KEY
@@ -187,38 +328,25 @@ def process_building(args: Tuple) -> Optional[Dict]:
     Process a single building for enrichment.
     
     Args:
-        args (Tuple): Tuple containing (building_data, max_calls, counter, lock)
+        args (Tuple): Tuple containing (building_data, max_calls); API calls are
+            counted against the counter installed by init_worker
         
     Returns:
         Optional[Dict]: Enriched building data or None if processing failed
     """
-    building_data, max_calls, counter, lock = args
+    building_data, max_calls = args
     try:
-        # Check if we've hit the API call limit
-        with lock:
-            if max_calls is not None and counter.value >= max_calls:
-                return None
-            counter.value += 1
-            current_calls = counter.value
-        
-        # Get initial place data
-        place_data = get_place_data(building_data['lat'], building_data['lng'])
+        # Get initial place data (None once the API call limit is reached)
+        place_data = get_place_data(building_data['lat'], building_data['lng'], max_calls)
         if not place_data:
             return None
             
         # Get place details if we have a place_id
         if place_data.get('place_id'):
-            with lock:
-                if max_calls is not None and counter.value >= max_calls:
-                    return place_data
-                counter.value += 1
-                current_calls = counter.value
-            
-            details = get_place_details(place_data['place_id'])
+            details = get_place_details(place_data['place_id'], max_calls)
             if details['status'] == 'OK':
                 result = details['result']
-                place_data['rating'] = result.get('rating')
-                place_data['website'] = result.get('website')
+                place_data.update({key: result.get(key) for key in _DETAIL_KEYS})
         
         return place_data
         
@@ -226,12 +354,280 @@ def process_building(args: Tuple) -> Optional[Dict]:
         logger.error(f"Error processing building: {str(e)}")
         return None
 
+async def make_api_request_async(session: "aiohttp.ClientSession", limiter: "AsyncLimiter",
+                                 url: str, params: Dict) -> Dict:
+    """
+    Make a rate-limited API request on the event loop with exponential backoff retry.
+    
+    Args:
+        session (aiohttp.ClientSession): Shared HTTP session
+        limiter (AsyncLimiter): Shared rate limiter
+        url (str): API endpoint URL
+        params (Dict): Request parameters
+        
+    Returns:
+        Dict: API response data
+    """
+    for attempt in range(MAX_RETRIES):
+        try:
+            async with limiter:
+                async with session.get(url, params=params) as response:
+                    response.raise_for_status()
+                    return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt == MAX_RETRIES - 1:
+                raise
+            await asyncio.sleep(BACKOFF_FACTOR ** attempt)
+
+async def get_place_data_async(session: "aiohttp.ClientSession", limiter: "AsyncLimiter",
+                               lat: float, lng: float) -> Optional[Dict]:
+    """
+    Async version of get_place_data (shares its cache).
+    
+    Args:
+        session (aiohttp.ClientSession): Shared HTTP session
+        limiter (AsyncLimiter): Shared rate limiter
+        lat (float): Latitude
+        lng (float): Longitude
+        
+    Returns:
+        Optional[Dict]: Place data or None if not found
+    """
+    cached_data = _load_cached_place(lat, lng)
+    if cached_data:
+        return cached_data
+    
+    try:
+        params = {
+            'location': f"{lat},{lng}",
+            'radius': '50',  # 50 meters radius
+            'key': GOOGLE_MAPS_API_KEY
+        }
+        data = await make_api_request_async(session, limiter, NEARBY_SEARCH_URL, params)
+        
+        if data['status'] == 'OK' and data['results']:
+            place_data = _extract_place_data(data['results'][0])
+            _store_cached_place(lat, lng, place_data)
+            return place_data
+            
+        return None
+        
+    except Exception as e:
+        logger.error(f"API request failed: {str(e)}")
+        return None
+
+async def get_place_details_async(session: "aiohttp.ClientSession", limiter: "AsyncLimiter",
+                                  place_id: str) -> Dict:
+    """
+    Async version of get_place_details.
+    
+    Args:
+        session (aiohttp.ClientSession): Shared HTTP session
+        limiter (AsyncLimiter): Shared rate limiter
+        place_id (str): Google Maps place ID
+        
+    Returns:
+        Dict: Place details
+    """
+    try:
+        params = {
+            'place_id': place_id,
+            'key': GOOGLE_MAPS_API_KEY
+        }
+        return await make_api_request_async(session, limiter, PLACE_DETAILS_URL, params)
+        
+    except Exception as e:
+        logger.error(f"API request failed: {str(e)}")
+        return {'status': 'ERROR', 'error': str(e)}
+
+async def _enrich_all(building_data: List[Dict], max_calls: Optional[int], on_result) -> int:
+    """
+    Enrich buildings concurrently in a single event loop.
+    
+    Args:
+        building_data (List[Dict]): Buildings with 'lat' and 'lng'
+        max_calls (int, optional): Maximum number of API calls to make
+        on_result (Callable): Called with (position, place_data) as each building finishes
+        
+    Returns:
+        int: Number of API calls made
+    """
+    calls = 0
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_API_CALLS)
+    limiter = AsyncLimiter(CALLS, RATE_LIMIT_PERIOD)
+    
+    def take_call() -> bool:
+        # Runs on the event loop thread, so no lock is needed
+        nonlocal calls
+        if max_calls is not None and calls >= max_calls:
+            return False
+        calls += 1
+        return True
+    
+    async def enrich_one(i: int, data: Dict) -> Tuple[int, Optional[Dict]]:
+        async with semaphore:
+            if not take_call():
+                return i, None
+            place_data = await get_place_data_async(session, limiter, data['lat'], data['lng'])
+            if place_data and place_data.get('place_id') and take_call():
+                details = await get_place_details_async(session, limiter, place_data['place_id'])
+                if details['status'] == 'OK':
+                    result = details['result']
+                    place_data.update({key: result.get(key) for key in _DETAIL_KEYS})
+            return i, place_data
+    
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        tasks = [enrich_one(i, data) for i, data in enumerate(building_data)]
+        for next_done in asyncio.as_completed(tasks):
+            i, place_data = await next_done
+            on_result(i, place_data)
+    
+    return calls
+
+def _ring_moments(coords: np.ndarray, offsets: np.ndarray,
+                  area: np.ndarray, moment_x: np.ndarray, moment_y: np.ndarray) -> None:
+    """
+    Shoelace signed area and first moments of each closed ring.
+    
+    Args:
+        coords (np.ndarray): (N, 2) vertex coordinates of all rings, concatenated
+        offsets (np.ndarray): Start of each ring in coords, plus a final end offset
+        area (np.ndarray): Output signed area per ring
+        moment_x (np.ndarray): Output area * centroid x per ring
+        moment_y (np.ndarray): Output area * centroid y per ring
+    """
+    for r in prange(len(offsets) - 1):
+        start, end = offsets[r], offsets[r + 1]
+        # Work relative to the first vertex to keep precision with lon/lat offsets
+        x0, y0 = coords[start, 0], coords[start, 1]
+        a = 0.0
+        mx = 0.0
+        my = 0.0
+        for j in range(start, end - 1):
+            xi, yi = coords[j, 0] - x0, coords[j, 1] - y0
+            xj, yj = coords[j + 1, 0] - x0, coords[j + 1, 1] - y0
+            cross = xi * yj - xj * yi
+            a += cross
+            mx += (xi + xj) * cross
+            my += (yi + yj) * cross
+        area[r] = a / 2
+        moment_x[r] = mx / 6 + x0 * a / 2
+        moment_y[r] = my / 6 + y0 * a / 2
+
+# Compiled once and cached on disk so later runs skip the JIT warm-up
+_ring_moments_jit = njit(parallel=True, cache=True)(_ring_moments) if njit is not None else None
+
+def _centroid_lat_lng(geometry: gpd.GeoSeries) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Area-weighted centroids of building footprints as (lat, lng) arrays.
+    
+    Polygon rings are processed by a numba kernel over the raw coordinate
+    arrays; geometries without area (points, lines, empty) and all
+    geometries when numba is not installed use GeoSeries.centroid.
+    
+    Args:
+        geometry (gpd.GeoSeries): Building geometries
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Centroid latitudes and longitudes
+    """
+    geoms = geometry.values
+    n = len(geoms)
+    lat = np.full(n, np.nan)
+    lng = np.full(n, np.nan)
+    
+    if _ring_moments_jit is not None and n:
+        # Simple polygons (no holes) are a single ring and use their coordinates directly;
+        # multipolygons and polygons with holes are split into rings (exterior first)
+        simple = (shapely.get_type_id(geoms) == 3) & (shapely.get_num_interior_rings(geoms) == 0)
+        simple_idx = np.flatnonzero(simple)
+        complex_idx = np.flatnonzero(~simple)
+        parts, part_geom = shapely.get_parts(geoms[complex_idx], return_index=True)
+        rings, ring_part = shapely.get_rings(parts, return_index=True)
+        
+        ring_geoms = np.concatenate([geoms[simple_idx], rings])
+        ring_geom = np.concatenate([simple_idx, complex_idx[part_geom[ring_part]]])
+        is_exterior = np.ones(len(ring_geoms), dtype=bool)
+        is_exterior[len(simple_idx) + 1:] = ring_part[1:] != ring_part[:-1]
+        
+        coords = shapely.get_coordinates(ring_geoms)
+        offsets = np.zeros(len(ring_geoms) + 1, dtype=np.int64)
+        np.cumsum(shapely.get_num_coordinates(ring_geoms), out=offsets[1:])
+        
+        area = np.empty(len(ring_geoms))
+        moment_x = np.empty(len(ring_geoms))
+        moment_y = np.empty(len(ring_geoms))
+        _ring_moments_jit(coords, offsets, area, moment_x, moment_y)
+        
+        # Normalize ring orientation, then subtract holes from their exterior
+        weight = np.sign(area) * np.where(is_exterior, 1.0, -1.0)
+        total_area = np.bincount(ring_geom, weights=area * weight, minlength=n)
+        total_x = np.bincount(ring_geom, weights=moment_x * weight, minlength=n)
+        total_y = np.bincount(ring_geom, weights=moment_y * weight, minlength=n)
+        
+        has_area = total_area > 0
+        lng[has_area] = total_x[has_area] / total_area[has_area]
+        lat[has_area] = total_y[has_area] / total_area[has_area]
+    
+    remaining = np.isnan(lat)
+    if remaining.any():
+        # Suppress geographic CRS centroid warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            centroids = geometry[remaining].centroid
+        lng[remaining] = centroids.x.values
+        lat[remaining] = centroids.y.values
+    
+    return lat, lng
+
+def _read_features(path: str) -> gpd.GeoDataFrame:
+    """
+    Read a GeoParquet or GeoJSON file, the latter through pyogrio's Arrow
+    reader when available. GeoParquet string columns are loaded with the
+    pyarrow-backed string dtype.
+    
+    Args:
+        path (str): GeoParquet (.parquet) or GeoJSON file path
+        
+    Returns:
+        gpd.GeoDataFrame: Features in the file
+    """
+    if Path(path).suffix == '.parquet':
+        # Keep OSM tag columns as Arrow strings so null checks run on the validity bitmap
+        return gpd.read_parquet(path, to_pandas_kwargs={'types_mapper': _ARROW_STRING_DTYPES.get})
+    if pyogrio is not None:
+        return pyogrio.read_dataframe(path, use_arrow=True)
+    return gpd.read_file(path)
+
+def _write_features(gdf: gpd.GeoDataFrame, path: str) -> None:
+    """
+    Write a GeoDataFrame as GeoParquet or GeoJSON depending on the file suffix,
+    GeoJSON through pyogrio when available.
+    
+    Args:
+        gdf (gpd.GeoDataFrame): Features to write
+        path (str): Output file path
+    """
+    if Path(path).suffix == '.parquet':
+        try:
+            gdf.to_parquet(path, compression='zstd', geometry_encoding='geoarrow')
+        except ValueError:
+            # Mixed geometry types have no GeoArrow encoding
+            gdf.to_parquet(path, compression='zstd', geometry_encoding='WKB')
+    elif pyogrio is not None:
+        pyogrio.write_dataframe(gdf, path, driver='GeoJSON')
+    else:
+        gdf.to_file(path, driver='GeoJSON')
+
 def enrich_osm_data(input_path: str, output_path: str, testing: bool = False, max_calls: int = None) -> str:
     """
-    Enrich OSM building data with Google Maps data using multiprocessing.
+    Enrich OSM building data with Google Maps data. Uses a single asyncio
+    event loop when aiohttp and aiolimiter are installed, otherwise a
+    multiprocessing pool.
     
     Args:
-        input_path (str): Path to input GeoJSON file
+        input_path (str): Path to input GeoParquet or GeoJSON file
         output_path (str): Path to save enriched data
         testing (bool): Whether we're in testing mode (affects data directory only)
         max_calls (int, optional): Maximum number of API calls to make. If None, no limit.
@@ -241,7 +637,7 @@ def enrich_osm_data(input_path: str, output_path: str, testing: bool = False, ma
     """
     try:
         # Read the input data
-        buildings = gpd.read_file(input_path)
+        buildings = _read_features(input_path)
         logger.info(f"Loaded {len(buildings)} total features")
         
         # Filter for buildings only
@@ -249,59 +645,87 @@ def enrich_osm_data(input_path: str, output_path: str, testing: bool = False, ma
         logger.info(f"Found {len(buildings)} buildings")
         
         # Identify buildings that need enrichment
+        # Without a place_id column every building is missing one
+        missing_place_id = (
+            pd.isna(buildings['place_id'].values) if 'place_id' in buildings.columns
+            else np.ones(len(buildings), dtype=bool)
+        )
         needs_enrichment_mask = (
-            buildings['name'].isna() |
-            buildings['building'].isin(['yes', 'unknown']) |
-            ~buildings.get('place_id', pd.Series([None]*len(buildings), index=buildings.index)).notna()
+            buildings['name'].isna().values |
+            buildings['building'].isin(('yes', 'unknown')).values |
+            missing_place_id
         )
         needs_enrichment = buildings[needs_enrichment_mask]
         logger.info(f"Found {len(needs_enrichment)} buildings that need enrichment")
         
-        # Calculate centroids efficiently (suppress coordinate warnings)
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            buildings_copy = buildings.copy()
-            centroids = buildings_copy.geometry.centroid
-            buildings_copy['lat'] = centroids.y
-            buildings_copy['lng'] = centroids.x
+        # Calculate centroids
+        buildings_copy = buildings.copy()
+        buildings_copy['lat'], buildings_copy['lng'] = _centroid_lat_lng(buildings_copy.geometry)
         
         # Filter to only buildings that need enrichment
         buildings_to_enrich = buildings_copy[needs_enrichment_mask]
         
-        # Initialize manager for shared counter
-        manager = mp.Manager()
-        counter = manager.Value('i', 0)
-        lock = manager.Lock()
+        # Buildings whose centroids round to the same point (~11 cm) share one lookup
+        bucket_keys = pd.Series(
+            list(zip(buildings_to_enrich['lat'].round(6), buildings_to_enrich['lng'].round(6))),
+            index=buildings_to_enrich.index
+        )
+        unique_buildings = buildings_to_enrich[~bucket_keys.duplicated()]
+        bucket_rows = bucket_keys.groupby(bucket_keys, sort=False).groups
+        
+        # Results are appended to a checkpoint as they arrive; locations already
+        # in it (from an interrupted run) are not looked up again
+        checkpoint_path = Path(f"{output_path}.checkpoint.jsonl")
+        bucket_results = _load_enrichment_checkpoint(checkpoint_path)
+        if bucket_results:
+            logger.info(f"Resuming from checkpoint: {len(bucket_results)} locations already enriched")
+            unique_buildings = unique_buildings[
+                [key not in bucket_results for key in bucket_keys.loc[unique_buildings.index]]
+            ]
         
-        # Prepare data for multiprocessing
-        building_data = buildings_to_enrich[['lat', 'lng']].to_dict('records')
-        process_args = [(data, max_calls, counter, lock) for data in building_data]
+        building_data = unique_buildings[['lat', 'lng']].to_dict('records')
+        logger.info(f"Enriching {len(building_data)} unique locations")
         
-        # Determine number of workers (use 75% of available CPUs)
-        num_workers = max(1, int(mp.cpu_count() * 0.75))
-        logger.info(f"Using {num_workers} worker processes")
+        processed_count = 0
+        checkpointed_count = 0
+        checkpoint = open(checkpoint_path, 'a', buffering=1)
+        
+        def apply_result(i: int, result: Optional[Dict]) -> None:
+            nonlocal processed_count, checkpointed_count
+            processed_count += 1
+            if result:
+                key = bucket_keys.at[unique_buildings.index[i]]
+                bucket_results[key] = result
+                # Line buffering hands each record to the OS; fsync periodically so
+                # a machine crash loses at most CHECKPOINT_FSYNC_INTERVAL records
+                checkpoint.write(json.dumps({'key': list(key), 'data': result}) + '\n')
+                checkpointed_count += 1
+                if checkpointed_count % CHECKPOINT_FSYNC_INTERVAL == 0:
+                    os.fsync(checkpoint.fileno())
+            
+            if processed_count % 100 == 0:
+                logger.info(f"Progress: {processed_count}/{len(building_data)} locations processed")
         
-        # Process buildings in parallel
+        try:
+            api_calls = _run_enrichment(building_data, max_calls, apply_result)
+        finally:
+            checkpoint.close()
+        
+        # Update every building row in each enriched bucket
         enriched_count = 0
-        with mp.Pool(processes=num_workers) as pool:
-            for i, result in enumerate(pool.imap_unordered(process_building, process_args)):
-                if result:
-                    idx = buildings_to_enrich.index[i]
-                    # Update the building row with enriched data
-                    for key, value in result.items():
-                        if key != 'cache_time':  # Don't add cache_time to the building data
-                            buildings_copy.at[idx, key] = value
-                    enriched_count += 1
-                
-                # Save progress every 10 buildings
-                if (enriched_count % 10 == 0) or (i == len(process_args) - 1):
-                    logger.info(f"Saving progress... ({enriched_count} buildings enriched, {counter.value} API calls made)")
-                    buildings_copy.to_file(output_path, driver='GeoJSON')
+        for bucket_key, result in bucket_results.items():
+            rows = bucket_rows.get(bucket_key, ())
+            for idx in rows:
+                for key, value in result.items():
+                    if key != 'cache_time':  # Don't add cache_time to the building data
+                        buildings_copy.at[idx, key] = value
+            enriched_count += len(rows)
         
         # Final save
-        buildings_copy.to_file(output_path, driver='GeoJSON')
+        _write_features(buildings_copy, output_path)
+        checkpoint_path.unlink(missing_ok=True)
         logger.info(f"Final save complete: {len(buildings_copy)} total records")
-        logger.info(f"Made {counter.value} API calls")
+        logger.info(f"Made {api_calls} API calls")
         logger.info(f"Enriched {enriched_count} buildings")
         
         return output_path
@@ -310,6 +734,63 @@ def enrich_osm_data(input_path: str, output_path: str, testing: bool = False, ma
         logger.error(f"Error in enrich_osm_data: {str(e)}")
         raise
 
+def _load_enrichment_checkpoint(checkpoint_path: Path) -> Dict[Tuple[float, float], Dict]:
+    """
+    Load enrichment results recorded by an earlier, interrupted run.
+    
+    Args:
+        checkpoint_path (Path): JSONL checkpoint file
+        
+    Returns:
+        Dict: Place data keyed by rounded (lat, lng)
+    """
+    results = {}
+    if not checkpoint_path.exists():
+        return results
+    
+    with open(checkpoint_path, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partial last line from a crash
+                continue
+            results[tuple(record['key'])] = record['data']
+    return results
+
+def _run_enrichment(building_data: List[Dict], max_calls: Optional[int], on_result) -> int:
+    """
+    Enrich buildings with the async pipeline, or a process pool if aiohttp is unavailable.
+    
+    Args:
+        building_data (List[Dict]): Buildings with 'lat' and 'lng'
+        max_calls (int, optional): Maximum number of API calls to make
+        on_result (Callable): Called with (position, place_data) as each building finishes
+        
+    Returns:
+        int: Number of API calls made
+    """
+    if aiohttp is not None:
+        logger.info(f"Enriching with up to {MAX_CONCURRENT_API_CALLS} concurrent requests")
+        return asyncio.run(_enrich_all(building_data, max_calls, on_result))
+    
+    # Shared-memory call counter and rate slot clock handed to every worker by init_worker
+    counter = mp.Value('i', 0)
+    rate_slot = mp.Value('d', 0.0)
+    
+    # Prepare data for multiprocessing
+    process_args = [(data, max_calls) for data in building_data]
+    
+    # Determine number of workers (use 75% of available CPUs)
+    num_workers = max(1, int(mp.cpu_count() * 0.75))
+    logger.info(f"aiohttp not installed - using {num_workers} worker processes")
+    
+    # Process buildings in parallel (imap keeps results aligned with building_data)
+    with mp.Pool(processes=num_workers, initializer=init_worker, initargs=(counter, rate_slot)) as pool:
+        for i, result in enumerate(pool.imap(process_building, process_args)):
+            on_result(i, result)
+    return counter.value
+
 def get_reverse_geocode(lat: float, lng: float) -> Dict:
     """
     Get reverse geocoding information for a location.
@@ -350,9 +831,10 @@ def extract_building_centroids(buildings_gdf: gpd.GeoDataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame with building centroids
     """
     centroids = buildings_gdf.copy()
-    centroids['centroid'] = centroids.geometry.centroid
-    centroids['lat'] = centroids.centroid.y
-    centroids['lng'] = centroids.centroid.x
+    centroids['lat'], centroids['lng'] = _centroid_lat_lng(centroids.geometry)
+    centroids['centroid'] = gpd.GeoSeries(
+        shapely.points(centroids['lng'], centroids['lat']), index=centroids.index, crs=centroids.crs
+    )
     return centroids
 
 def identify_candidate_buildings(buildings_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
@@ -407,18 +889,16 @@ def enrich_building_data(building_row: pd.Series) -> Dict:
         nearby_data = get_nearby_places(building_row['lat'], building_row['lng'])
         if nearby_data['status'] == 'OK' and nearby_data['results']:
             place = nearby_data['results'][0]
-            enriched_data['googleName'] = place.get('name')
-            enriched_data['googleTypes'] = place.get('types', [])
-            enriched_data['googleVicinity'] = place.get('vicinity')
-            enriched_data['googlePlaceId'] = place.get('place_id')
+            enriched_data.update({field: place.get(key) for field, key in _NEARBY_FIELDS})
+            if enriched_data['googleTypes'] is None:
+                enriched_data['googleTypes'] = []
             
             # Get place details if we have a place_id
             if enriched_data['googlePlaceId']:
                 details = get_place_details(enriched_data['googlePlaceId'])
                 if details['status'] == 'OK':
                     result = details['result']
-                    enriched_data['googleRating'] = result.get('rating')
-                    enriched_data['googleWebsite'] = result.get('website')
+                    enriched_data.update({field: result.get(key) for field, key in _DETAIL_FIELDS})
         
     except Exception as e:
         logger.error(f"Error enriching building data: {str(e)}")
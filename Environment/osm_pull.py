@@ -1,14 +1,70 @@
 import osmnx as ox
 import os
+import functools
+import hashlib
+import math
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import geopandas as gpd
-from typing import Tuple, Optional, List
+import json
+from typing import Dict, Tuple, Optional, List
+
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Every primary OSM feature key, for callers that want the full feature set
+FULL_OSM_TAGS = {
+    "aerialway": True,
+    "aeroway": True,
+    "amenity": True,
+    "barrier": True,
+    "boundary": True,
+    "building": True,
+    "craft": True,
+    "emergency": True,
+    "geological": True,
+    "healthcare": True,
+    "highway": True,
+    "historic": True,
+    "landuse": True,
+    "leisure": True,
+    "man_made": True,
+    "military": True,
+    "natural": True,
+    "office": True,
+    "place": True,
+    "power": True,
+    "public_transport": True,
+    "railway": True,
+    "route": True,
+    "shop": True,
+    "telecom": True,
+    "tourism": True,
+    "water": True,
+    "waterway": True
+}
+
+# Feature keys used by the visualization and Google Maps enrichment
+DEFAULT_OSM_TAGS = {"building": True, "highway": True}
+
+# Degrees added around the boundary's bounding box when clipping a local PBF
+PBF_BBOX_PADDING = 0.01
+
+# Highway values excluded from the "all" network type (as in OSMnx's Overpass filter)
+_EXCLUDED_HIGHWAYS = frozenset((
+    "abandoned", "construction", "no", "planned", "platform", "proposed", "raceway", "razed"
+))
+
+@functools.lru_cache(maxsize=256)
 def parse_place_name(place: str) -> Tuple[str, str, str]:
     """
     Parse a place name into its components (city, state, country).
@@ -62,16 +118,100 @@ def get_osm_file_paths(base_dir: str, city: str, state: str, country: str) -> Tu
         country (str): Country name
         
     Returns:
-        Tuple[Path, Path, Path]: Paths to network, features, and boundary files
+        Tuple[Path, Path, Path]: Paths to network, features, and boundary files. The network
+            path is the GraphML file; see get_network_parquet_paths for the nodes/edges files
     """
+    return _resolve_paths(str(base_dir), f"{city}, {state}, {country}")[1:]
+
+@functools.lru_cache(maxsize=256)
+def _resolve_paths(base_dir: str, place: str) -> Tuple[Path, Path, Path, Path]:
+    """
+    Parse a place and create its data directory once; later calls for the
+    same (base_dir, place) reuse the result without touching the filesystem.
+    
+    Args:
+        base_dir (str): Base directory for OSM data
+        place (str): Place name in format "City, State, Country"
+        
+    Returns:
+        Tuple[Path, Path, Path, Path]: Data directory and paths to network, features, and boundary files
+    """
+    city, state, country = parse_place_name(place)
     safe_city = city.replace(" ", "_").lower()
     data_path = create_hierarchical_path(base_dir, city, state, country)
     
     network_path = data_path / f"{safe_city}_network.graphml"
-    features_path = data_path / f"{safe_city}_all_features.geojson"
-    boundary_path = data_path / f"{safe_city}_boundary.geojson"
+    features_path = data_path / f"{safe_city}_all_features.parquet"
+    boundary_path = data_path / f"{safe_city}_boundary.parquet"
+    
+    return data_path, network_path, features_path, boundary_path
+
+def get_network_parquet_paths(network_path: Path) -> Tuple[Path, Path]:
+    """
+    Get the nodes and edges GeoParquet paths stored alongside a network path.
     
-    return network_path, features_path, boundary_path
+    Args:
+        network_path (Path): Network GraphML path from get_osm_file_paths
+        
+    Returns:
+        Tuple[Path, Path]: Paths to the nodes and edges files
+    """
+    network_path = Path(network_path)
+    return network_path.with_suffix(".nodes.parquet"), network_path.with_suffix(".edges.parquet")
+
+def _stringify_value(value):
+    """Stringify list and other non-scalar attribute values, as GraphML does"""
+    if value is None or isinstance(value, str) or (isinstance(value, float) and math.isnan(value)):
+        return value
+    return str(value)
+
+def write_network_parquet(G, network_path: Path) -> None:
+    """
+    Write a graph's nodes and edges as GeoParquet. OSMnx merges attributes
+    of simplified edges into lists, which have no single Arrow type, so
+    mixed object columns are stored as strings.
+    
+    Args:
+        G: OSMnx graph
+        network_path (Path): Network GraphML path from get_osm_file_paths
+    """
+    nodes_path, edges_path = get_network_parquet_paths(network_path)
+    for gdf, path in zip(ox.graph_to_gdfs(G), (nodes_path, edges_path)):
+        for col in gdf.columns:
+            if col != gdf.geometry.name and gdf[col].dtype == object:
+                gdf[col] = gdf[col].map(_stringify_value)
+        write_geoparquet(gdf, path)
+
+def write_geoparquet(gdf: gpd.GeoDataFrame, path: Path) -> None:
+    """
+    Write a GeoDataFrame as zstd-compressed GeoParquet. Uses native GeoArrow
+    geometry encoding when the geometry types allow it (a single type, or a
+    type with its multi-part counterpart), otherwise WKB.
+    
+    Args:
+        gdf (gpd.GeoDataFrame): Features to write
+        path (Path): Output file path
+    """
+    try:
+        gdf.to_parquet(path, compression="zstd", geometry_encoding="geoarrow")
+    except ValueError:
+        # Mixed geometry types (e.g. points and polygons) have no GeoArrow encoding
+        gdf.to_parquet(path, compression="zstd", geometry_encoding="WKB")
+
+def write_boundary_geojson(boundary, path: Path) -> None:
+    """
+    Write a boundary polygon as a one-feature GeoJSON FeatureCollection
+    directly from its geometry, without going through a GDAL driver.
+    
+    Args:
+        boundary: Boundary polygon (EPSG:4326)
+        path (Path): Output file path
+    """
+    collection = {
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "properties": {}, "geometry": boundary.__geo_interface__}]
+    }
+    path.write_bytes(_json_dumps(collection))
 
 def check_osm_data_exists(base_dir: str, city: str, state: str, country: str) -> bool:
     """
@@ -87,95 +227,219 @@ def check_osm_data_exists(base_dir: str, city: str, state: str, country: str) ->
         bool: True if all required files exist, False otherwise
     """
     network_path, features_path, boundary_path = get_osm_file_paths(base_dir, city, state, country)
-    return all(path.exists() for path in [network_path, features_path, boundary_path])
+    return all(path.exists() for path in [*get_network_parquet_paths(network_path), features_path, boundary_path])
 
-def pull_osm_data(place: str, output_dir: str, force: bool = False) -> tuple[Path, Path, Path]:
+def _clip_pbf(pbf_source: Path, boundary, tags: Dict[str, bool], output_path: Path) -> Tuple[Path, Path]:
+    """
+    Clip a local OSM PBF extract to a boundary's (padded) bounding box with
+    pyosmium, writing the street network and the tagged features as two OSM
+    XML files for OSMnx. Ways are written complete, with all their nodes.
+    Clips are cached in output_path, keyed by the source file, its mtime,
+    the bounding box and the tag keys.
+    
+    Args:
+        pbf_source (Path): Local .osm.pbf file covering the boundary
+        boundary: Boundary polygon
+        tags (Dict[str, bool]): OSM feature keys to keep
+        output_path (Path): Directory for the clipped files
+        
+    Returns:
+        Tuple[Path, Path]: Paths to the network and features OSM XML files
+    """
+    import osmium
+    
+    pbf_source = Path(pbf_source).resolve()
+    min_lon, min_lat, max_lon, max_lat = (round(value, 6) for value in (
+        boundary.bounds[0] - PBF_BBOX_PADDING, boundary.bounds[1] - PBF_BBOX_PADDING,
+        boundary.bounds[2] + PBF_BBOX_PADDING, boundary.bounds[3] + PBF_BBOX_PADDING
+    ))
+    key = hashlib.blake2b(
+        repr((str(pbf_source), pbf_source.stat().st_mtime_ns,
+              (min_lon, min_lat, max_lon, max_lat), sorted(tags))).encode(),
+        digest_size=8
+    ).hexdigest()
+    network_xml = output_path / f"pbf_clip_{key}.network.osm"
+    features_xml = output_path / f"pbf_clip_{key}.features.osm"
+    if network_xml.exists() and features_xml.exists():
+        logger.info(f"Using cached PBF clip {key}")
+        return network_xml, features_xml
+    
+    def in_bbox(location) -> bool:
+        return location.valid() and min_lon <= location.lon <= max_lon and min_lat <= location.lat <= max_lat
+    
+    logger.info(f"Clipping {pbf_source} to ({min_lon}, {min_lat}, {max_lon}, {max_lat})")
+    ways_in_bbox = set()
+    # Untagged nodes are only needed for way locations and never reach Python
+    processor = (
+        osmium.FileProcessor(str(pbf_source))
+        .with_locations()
+        .with_filter(osmium.filter.EmptyTagFilter().enable_for(osmium.osm.NODE))
+    )
+    with osmium.BackReferenceWriter(str(network_xml), ref_src=str(pbf_source), overwrite=True) as network_writer, \
+            osmium.BackReferenceWriter(str(features_xml), ref_src=str(pbf_source), overwrite=True) as features_writer:
+        for obj in processor:
+            if obj.is_node():
+                if in_bbox(obj.location) and any(key in obj.tags for key in tags):
+                    features_writer.add_node(obj)
+            elif obj.is_way():
+                if not any(in_bbox(node.location) for node in obj.nodes):
+                    continue
+                ways_in_bbox.add(obj.id)
+                highway = obj.tags.get("highway")
+                if highway is not None and highway not in _EXCLUDED_HIGHWAYS and obj.tags.get("area") != "yes":
+                    network_writer.add_way(obj)
+                if any(key in obj.tags for key in tags):
+                    features_writer.add_way(obj)
+            elif obj.is_relation():
+                if any(key in obj.tags for key in tags) and any(
+                    member.type == "w" and member.ref in ways_in_bbox for member in obj.members
+                ):
+                    features_writer.add_relation(obj)
+    
+    return network_xml, features_xml
+
+def _download_network(place: str, boundary, network_path: Path, export_graphml: bool,
+                      network_xml: Optional[Path] = None) -> None:
+    """
+    Download the street network inside a boundary and save its nodes and
+    edges, keeping existing cached copies if the download fails.
+    
+    Args:
+        place (str): Place name, for logging
+        boundary: Boundary polygon to query
+        network_path (Path): Network GraphML path from get_osm_file_paths
+        export_graphml (bool): If True, also write the graph as GraphML
+        network_xml (Path, optional): Clipped OSM XML to build the network from instead of Overpass
+    """
+    logger.info(f"Downloading complete street network for {place}")
+    try:
+        if network_xml is not None:
+            # Build the network from the local extract and cut it to the boundary
+            G = ox.graph_from_xml(network_xml)
+            G = ox.truncate.truncate_graph_polygon(G, boundary)
+        else:
+            # Download the entire street network (all modes)
+            G = ox.graph_from_polygon(boundary, network_type="all")
+        
+        # Save the network
+        write_network_parquet(G, network_path)
+        if export_graphml:
+            ox.save_graphml(G, filepath=str(network_path))
+        logger.info(f"Saved network to {network_path.parent}")
+    except Exception as e:
+        if not all(path.exists() for path in get_network_parquet_paths(network_path)):
+            raise
+        logger.warning(f"Network download failed ({e}), using cached copy at {network_path.parent}")
+
+def _download_features(place: str, boundary, tags: Dict[str, bool], features_path: Path,
+                       export_geojson: bool, features_xml: Optional[Path] = None) -> None:
+    """
+    Download the features with the given tags inside a boundary and save them,
+    keeping an existing cached copy if the download fails.
+    
+    Args:
+        place (str): Place name, for logging
+        boundary: Boundary polygon to query
+        tags (Dict[str, bool]): OSM feature keys to download
+        features_path (Path): Output file path
+        export_geojson (bool): If True, also write a GeoJSON copy
+        features_xml (Path, optional): Clipped OSM XML to read the features from instead of Overpass
+    """
+    logger.info(f"Downloading all features for {place}")
+    try:
+        # Fetch all geometries with any of those tags inside the boundary
+        if features_xml is not None:
+            all_features = ox.features_from_xml(features_xml, polygon=boundary, tags=tags)
+        else:
+            all_features = ox.features_from_polygon(boundary, tags)
+        
+        # Save all features
+        write_geoparquet(all_features, features_path)
+        if export_geojson:
+            all_features.to_file(str(features_path.with_suffix(".geojson")), driver="GeoJSON")
+        logger.info(f"Saved all features to {features_path}")
+        
+        # Log the feature keys we pulled
+        logger.info(f"Downloaded feature keys: {all_features.columns.tolist()}")
+    except Exception as e:
+        if not features_path.exists():
+            raise
+        logger.warning(f"Feature download failed ({e}), using cached copy at {features_path}")
+
+def pull_osm_data(place: str, output_dir: str, force: bool = False, export_geojson: bool = False,
+                  tags: Optional[Dict[str, bool]] = None, export_graphml: bool = False,
+                  pbf_source: Optional[Path] = None) -> tuple[Path, Path, Path]:
     """
     Pull comprehensive OSM data for a specified place and save it to the output directory.
     
     Args:
         place (str): The place to pull data for (e.g., "Bar Harbor, Maine, USA")
         output_dir (str): Base directory to save the data to
-        force (bool): If True, force re-download even if data exists
+        force (bool): If True, re-download every file even if it exists (cached copies
+            are still used if a download fails)
+        export_geojson (bool): If True, also write GeoJSON copies of the features and boundary
+        tags (Dict[str, bool], optional): OSM feature keys to download. Defaults to
+            DEFAULT_OSM_TAGS; pass FULL_OSM_TAGS for every primary key
+        export_graphml (bool): If True, also write the network as GraphML at the network path
+        pbf_source (Path, optional): Local .osm.pbf extract (e.g. from Geofabrik) to clip the
+            network and features from instead of querying Overpass; requires pyosmium
         
     Returns:
-        tuple[Path, Path, Path]: Paths to the saved network, all features, and boundary files
+        tuple[Path, Path, Path]: Paths to the saved network, all features, and boundary files.
+            The network nodes and edges are at get_network_parquet_paths(network_path)
     """
     try:
-        # Parse the place name into components
+        # Parse the place name and create its directory structure
         city, state, country = parse_place_name(place)
+        output_path, network_path, features_path, boundary_path = _resolve_paths(
+            str(output_dir), f"{city}, {state}, {country}"
+        )
         
-        # Get expected file paths
-        network_path, features_path, boundary_path = get_osm_file_paths(output_dir, city, state, country)
-        
-        # Check if data already exists
-        if not force and check_osm_data_exists(output_dir, city, state, country):
+        # Check each output independently so a partial run only fetches what is missing
+        have_network = not force and all(path.exists() for path in get_network_parquet_paths(network_path))
+        have_features = not force and features_path.exists()
+        have_boundary = not force and boundary_path.exists()
+        if have_network and have_features and have_boundary:
             logger.info(f"OSM data already exists for {city}, {state}, {country}")
             return network_path, features_path, boundary_path
         
-        # Create hierarchical directory structure
-        output_path = create_hierarchical_path(output_dir, city, state, country)
-        logger.info(f"Created directory structure at: {output_path}")
-        
-        logger.info(f"Getting administrative boundary for {place}")
-        # Get the administrative boundary polygon
-        gdf_place = ox.geocode_to_gdf(place)
-        boundary = gdf_place.loc[0, "geometry"]
+        logger.info(f"Using directory structure at: {output_path}")
         
-        # Save the boundary
-        gdf_place.to_file(str(boundary_path), driver="GeoJSON")
-        logger.info(f"Saved boundary to {boundary_path}")
+        if have_boundary:
+            logger.info(f"Loading cached boundary from {boundary_path}")
+            boundary = gpd.read_parquet(boundary_path).loc[0, "geometry"]
+        else:
+            logger.info(f"Getting administrative boundary for {place}")
+            # Get the administrative boundary polygon
+            gdf_place = ox.geocode_to_gdf(place)
+            boundary = gdf_place.loc[0, "geometry"]
+            
+            # Save the boundary
+            write_geoparquet(gdf_place, boundary_path)
+            if export_geojson:
+                write_boundary_geojson(boundary, boundary_path.with_suffix(".geojson"))
+            logger.info(f"Saved boundary to {boundary_path}")
         
-        logger.info(f"Downloading complete street network for {place}")
-        # Download the entire street network (all modes)
-        G = ox.graph_from_polygon(boundary, network_type="all")
-        
-        # Save the network
-        ox.save_graphml(G, filepath=str(network_path))
-        logger.info(f"Saved network to {network_path}")
-        
-        # Define all primary OSM feature keys
-        tags = {
-            "aerialway": True,
-            "aeroway": True,
-            "amenity": True,
-            "barrier": True,
-            "boundary": True,
-            "building": True,
-            "craft": True,
-            "emergency": True,
-            "geological": True,
-            "healthcare": True,
-            "highway": True,
-            "historic": True,
-            "landuse": True,
-            "leisure": True,
-            "man_made": True,
-            "military": True,
-            "natural": True,
-            "office": True,
-            "place": True,
-            "power": True,
-            "public_transport": True,
-            "railway": True,
-            "route": True,
-            "shop": True,
-            "telecom": True,
-            "tourism": True,
-            "water": True,
-            "waterway": True
-        }
-        
-        logger.info(f"Downloading all features for {place}")
-        # Fetch all geometries with any of those tags inside the boundary
-        all_features = ox.features_from_polygon(boundary, tags)
+        if tags is None:
+            tags = DEFAULT_OSM_TAGS
         
-        # Save all features
-        all_features.to_file(str(features_path), driver="GeoJSON")
-        logger.info(f"Saved all features to {features_path}")
+        network_xml = features_xml = None
+        if pbf_source is not None and not (have_network and have_features):
+            network_xml, features_xml = _clip_pbf(pbf_source, boundary, tags, output_path)
         
-        # Log the feature keys we pulled
-        logger.info(f"Downloaded feature keys: {all_features.columns.tolist()}")
+        # The network and feature queries only depend on the boundary, so run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            downloads = []
+            if not have_network:
+                downloads.append(executor.submit(
+                    _download_network, place, boundary, network_path, export_graphml, network_xml
+                ))
+            if not have_features:
+                downloads.append(executor.submit(
+                    _download_features, place, boundary, tags, features_path, export_geojson, features_xml
+                ))
+            for download in downloads:
+                download.result()
         
         return network_path, features_path, boundary_path
         
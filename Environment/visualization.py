@@ -1,32 +1,97 @@
 import folium
-import osmnx as ox
 import json
 from datetime import datetime
 import os
 import geopandas as gpd
+import pandas as pd
+import shapely
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import logging
 from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from Environment.osm_pull import get_network_parquet_paths
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class TimestampEncoder(json.JSONEncoder):
-    """Custom JSON encoder to handle Timestamp objects."""
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+WGS84 = "EPSG:4326"
+
+def _json_default(obj):
+    """Serialize Timestamp objects (and other datetimes) the JSON encoders do not handle."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _geojson_dumps(gdf: gpd.GeoDataFrame) -> str:
+    """
+    Serialize a GeoDataFrame to a GeoJSON string, with orjson when available.
+    
+    Args:
+        gdf (gpd.GeoDataFrame): Features to serialize
+        
+    Returns:
+        str: GeoJSON FeatureCollection
+    """
+    geo_dict = gdf.to_geo_dict(drop_id=True)
+    if orjson is not None:
+        return orjson.dumps(
+            geo_dict, default=_json_default, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+    return json.dumps(geo_dict, default=_json_default)
+
+def _to_wgs84(*frames: gpd.GeoDataFrame) -> List[gpd.GeoDataFrame]:
+    """
+    Reproject GeoDataFrames to EPSG:4326 with one to_crs call per source CRS.
+    Frames already in EPSG:4326 are returned unchanged.
+    
+    Args:
+        *frames (gpd.GeoDataFrame): Frames to reproject
+        
+    Returns:
+        List[gpd.GeoDataFrame]: Reprojected frames, in the given order
+    """
+    results = list(frames)
+    groups: Dict[Any, List[int]] = {}
+    for i, frame in enumerate(frames):
+        if not frame.crs.equals(WGS84):
+            groups.setdefault(frame.crs, []).append(i)
+    
+    for crs, indices in groups.items():
+        # Reproject the concatenated geometries, then slice them back out per frame
+        geometry = gpd.GeoSeries(
+            pd.concat([frames[i].geometry for i in indices], ignore_index=True), crs=crs
+        ).to_crs(WGS84).values
+        offset = 0
+        for i in indices:
+            frame = frames[i].copy()
+            frame[frame.geometry.name] = gpd.GeoSeries(
+                geometry[offset:offset + len(frame)], index=frame.index, crs=WGS84
+            )
+            results[i] = frame
+            offset += len(frame)
+    
+    return results
 
-def create_interactive_map(network_path: str, features_path: str, boundary_path: str, output_path: str = None) -> str:
+def create_interactive_map(network_path: str, features_path: str, boundary_path: str, output_path: str = None,
+                           simplify_tol: float = 1e-4) -> str:
     """
     Create an interactive map using Folium.
     
     Args:
-        network_path (str): Path to the network GraphML file
-        features_path (str): Path to the features GeoJSON file
-        boundary_path (str): Path to the boundary GeoJSON file
+        network_path (str): Network path from pull_osm_data (nodes/edges GeoParquet are read from alongside it)
+        features_path (str): Path to the features GeoParquet file
+        boundary_path (str): Path to the boundary GeoParquet file
         output_path (str, optional): Path to save the map. If None, saves in the same directory as network_path
+        simplify_tol (float): Douglas-Peucker tolerance in degrees applied to street geometries
+            before rendering (about 11 m at the default; 0 disables simplification)
         
     Returns:
         str: Path to the saved map
@@ -34,18 +99,28 @@ def create_interactive_map(network_path: str, features_path: str, boundary_path:
     try:
         # Load the data
         logger.info("Loading data for visualization...")
-        G = ox.load_graphml(network_path)
-        features = gpd.read_file(features_path)
-        boundary = gpd.read_file(boundary_path)
+        # Only the edge geometries are plotted and only node coordinates are needed
+        nodes_path, edges_path = get_network_parquet_paths(network_path)
+        edges = gpd.read_parquet(edges_path, columns=["geometry"])
+        node_coords = pq.read_table(nodes_path, columns=["y", "x"])
+        # Only building rows and the columns the map uses are read from the features file
+        available = set(pq.read_schema(features_path).names)
+        buildings = gpd.read_parquet(
+            features_path,
+            columns=[col for col in ("geometry", "building", "name") if col in available],
+            filters=pc.field("building").is_valid()
+        )
+        boundary = gpd.read_parquet(boundary_path)
         
-        # Convert graph to GeoDataFrames
-        nodes, edges = ox.graph_to_gdfs(G)
-        edges = edges.to_crs(epsg=4326)
+        edges, boundary, buildings = _to_wgs84(edges, boundary, buildings)
+        if simplify_tol > 0:
+            edges = edges[["geometry"]].copy()
+            edges["geometry"] = shapely.simplify(edges.geometry.values, tolerance=simplify_tol, preserve_topology=False)
         
-        # Compute map center
+        # Compute map center from the node coordinate columns
         map_center = [
-            nodes.geometry.y.mean(),
-            nodes.geometry.x.mean()
+            pc.mean(node_coords["y"]).as_py(),
+            pc.mean(node_coords["x"]).as_py()
         ]
         
         # Create Folium map
@@ -65,7 +140,7 @@ def create_interactive_map(network_path: str, features_path: str, boundary_path:
         
         # Add boundary
         folium.GeoJson(
-            boundary.to_crs(epsg=4326),
+            boundary,
             name="boundary",
             style_function=lambda feat: {
                 "fill": False,
@@ -74,16 +149,10 @@ def create_interactive_map(network_path: str, features_path: str, boundary_path:
             }
         ).add_to(m)
         
-        # Filter and add buildings
-        buildings = features[features['building'].notna()]
+        # Add buildings
         if not buildings.empty:
-            # Convert buildings to GeoJSON with custom encoder
-            buildings_json = json.loads(
-                json.dumps(
-                    buildings.to_crs(epsg=4326).__geo_interface__,
-                    cls=TimestampEncoder
-                )
-            )
+            # Serialize the buildings to a GeoJSON string once
+            buildings_json = _geojson_dumps(buildings)
             
             # Add buildings with popups
             folium.GeoJson(
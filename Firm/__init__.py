@@ -1,57 +1,147 @@
 # __init__.py
 # Firm module with comprehensive NAICS-based firm specializations
 
+import importlib
+from collections.abc import Mapping
+
 from .firm import BaseFirm, Money, Transaction, License
 from .org_chart import (
     OrgChart, Role, RoleType, VotingRights, 
     PersonInOrg, Shareholder
 )
 
-# Import all specialized firm classes
-from .agriculture_firm import AgriculturalFirm, CropType, LivestockType, ProductionMethod
-from .mining_firm import MiningFirm, ExtractionType, ProjectPhase
-from .utilities_firm import UtilitiesFirm, UtilityType, FuelType, RateStructure
-from .construction_firm import ConstructionFirm, ConstructionType, ProjectPhase as ConstructionPhase
-from .manufacturing_firm import ManufacturingFirm, ManufacturingType, ProductionStrategy
-from .wholesale_firm import WholesaleFirm, WholesaleType
-from .retail_firm import RetailFirm, RetailChannel
-from .transportation_firm import TransportationFirm, TransportMode
-from .information_firm import InformationFirm, InformationType
-from .financial_firm import FinancialFirm, FinancialServiceType, RiskRating
-from .professional_services_firm import ProfessionalServicesFirm, ServiceType, BillingModel
-from .support_services_firm import SupportServicesFirm, ManagementCompany, GovernmentAgency, SupportServiceType
-from .education_firm import EducationFirm, EducationType
-from .healthcare_firm import HealthcareFirm, HealthcareType, InsuranceType
-from .hospitality_firm import HospitalityFirm, HospitalityType
+# Specialized firm classes are imported on first access (PEP 562), so
+# `from Firm import BaseFirm` does not load every industry module
+_LAZY = {
+    "AgriculturalFirm": ("agriculture_firm", "AgriculturalFirm"),
+    "CropType": ("agriculture_firm", "CropType"),
+    "LivestockType": ("agriculture_firm", "LivestockType"),
+    "ProductionMethod": ("agriculture_firm", "ProductionMethod"),
+    "MiningFirm": ("mining_firm", "MiningFirm"),
+    "ExtractionType": ("mining_firm", "ExtractionType"),
+    "ProjectPhase": ("mining_firm", "ProjectPhase"),
+    "UtilitiesFirm": ("utilities_firm", "UtilitiesFirm"),
+    "UtilityType": ("utilities_firm", "UtilityType"),
+    "FuelType": ("utilities_firm", "FuelType"),
+    "RateStructure": ("utilities_firm", "RateStructure"),
+    "ConstructionFirm": ("construction_firm", "ConstructionFirm"),
+    "ConstructionType": ("construction_firm", "ConstructionType"),
+    "ConstructionPhase": ("construction_firm", "ProjectPhase"),
+    "ManufacturingFirm": ("manufacturing_firm", "ManufacturingFirm"),
+    "ManufacturingType": ("manufacturing_firm", "ManufacturingType"),
+    "ProductionStrategy": ("manufacturing_firm", "ProductionStrategy"),
+    "WholesaleFirm": ("wholesale_firm", "WholesaleFirm"),
+    "WholesaleType": ("wholesale_firm", "WholesaleType"),
+    "RetailFirm": ("retail_firm", "RetailFirm"),
+    "RetailChannel": ("retail_firm", "RetailChannel"),
+    "TransportationFirm": ("transportation_firm", "TransportationFirm"),
+    "TransportMode": ("transportation_firm", "TransportMode"),
+    "InformationFirm": ("information_firm", "InformationFirm"),
+    "InformationType": ("information_firm", "InformationType"),
+    "FinancialFirm": ("financial_firm", "FinancialFirm"),
+    "FinancialServiceType": ("financial_firm", "FinancialServiceType"),
+    "RiskRating": ("financial_firm", "RiskRating"),
+    "ProfessionalServicesFirm": ("professional_services_firm", "ProfessionalServicesFirm"),
+    "ServiceType": ("professional_services_firm", "ServiceType"),
+    "BillingModel": ("professional_services_firm", "BillingModel"),
+    "SupportServicesFirm": ("support_services_firm", "SupportServicesFirm"),
+    "ManagementCompany": ("support_services_firm", "ManagementCompany"),
+    "GovernmentAgency": ("support_services_firm", "GovernmentAgency"),
+    "SupportServiceType": ("support_services_firm", "SupportServiceType"),
+    "EducationFirm": ("education_firm", "EducationFirm"),
+    "EducationType": ("education_firm", "EducationType"),
+    "HealthcareFirm": ("healthcare_firm", "HealthcareFirm"),
+    "HealthcareType": ("healthcare_firm", "HealthcareType"),
+    "InsuranceType": ("healthcare_firm", "InsuranceType"),
+    "HospitalityFirm": ("hospitality_firm", "HospitalityFirm"),
+    "HospitalityType": ("hospitality_firm", "HospitalityType"),
+}
+
+def _resolve(module_name: str, attr: str):
+    """Import a specialized firm module and return one of its attributes"""
+    return getattr(importlib.import_module(f".{module_name}", __name__), attr)
+
+def __getattr__(name: str):
+    """Import a specialized firm module on first access to one of its names"""
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = _resolve(module_name, attr)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
-# NAICS classification mapping
-NAICS_FIRM_MAPPING = {
-    "11": AgriculturalFirm,      # Agriculture, Forestry, Fishing and Hunting
-    "21": MiningFirm,            # Mining, Quarrying, and Oil and Gas Extraction
-    "22": UtilitiesFirm,         # Utilities
-    "23": ConstructionFirm,      # Construction
-    "31": ManufacturingFirm,     # Manufacturing (31-33)
-    "32": ManufacturingFirm,
-    "33": ManufacturingFirm,
-    "42": WholesaleFirm,         # Wholesale Trade
-    "44": RetailFirm,            # Retail Trade (44-45)
-    "45": RetailFirm,
-    "48": TransportationFirm,    # Transportation and Warehousing (48-49)
-    "49": TransportationFirm,
-    "51": InformationFirm,       # Information
-    "52": FinancialFirm,         # Finance and Insurance
-    "53": FinancialFirm,         # Real Estate (can use financial firm as base)
-    "54": ProfessionalServicesFirm,  # Professional, Scientific, and Technical Services
-    "55": ManagementCompany,     # Management of Companies and Enterprises
-    "56": SupportServicesFirm,   # Administrative and Support Services
-    "61": EducationFirm,         # Educational Services
-    "62": HealthcareFirm,        # Health Care and Social Assistance
-    "71": HospitalityFirm,       # Arts, Entertainment, and Recreation
-    "72": HospitalityFirm,       # Accommodation and Food Services
-    "81": SupportServicesFirm,   # Other Services (except Public Administration)
-    "92": GovernmentAgency,      # Public Administration
+# NAICS sector -> (module, class) names of its firm class
+_NAICS_CLASS_NAMES = {
+    "11": ("agriculture_firm", "AgriculturalFirm"),              # Agriculture, Forestry, Fishing and Hunting
+    "21": ("mining_firm", "MiningFirm"),                         # Mining, Quarrying, and Oil and Gas Extraction
+    "22": ("utilities_firm", "UtilitiesFirm"),                   # Utilities
+    "23": ("construction_firm", "ConstructionFirm"),             # Construction
+    "31": ("manufacturing_firm", "ManufacturingFirm"),           # Manufacturing (31-33)
+    "32": ("manufacturing_firm", "ManufacturingFirm"),
+    "33": ("manufacturing_firm", "ManufacturingFirm"),
+    "42": ("wholesale_firm", "WholesaleFirm"),                   # Wholesale Trade
+    "44": ("retail_firm", "RetailFirm"),                         # Retail Trade (44-45)
+    "45": ("retail_firm", "RetailFirm"),
+    "48": ("transportation_firm", "TransportationFirm"),         # Transportation and Warehousing (48-49)
+    "49": ("transportation_firm", "TransportationFirm"),
+    "51": ("information_firm", "InformationFirm"),               # Information
+    "52": ("financial_firm", "FinancialFirm"),                   # Finance and Insurance
+    "53": ("financial_firm", "FinancialFirm"),                   # Real Estate (can use financial firm as base)
+    "54": ("professional_services_firm", "ProfessionalServicesFirm"),  # Professional, Scientific, and Technical Services
+    "55": ("support_services_firm", "ManagementCompany"),        # Management of Companies and Enterprises
+    "56": ("support_services_firm", "SupportServicesFirm"),      # Administrative and Support Services
+    "61": ("education_firm", "EducationFirm"),                   # Educational Services
+    "62": ("healthcare_firm", "HealthcareFirm"),                 # Health Care and Social Assistance
+    "71": ("hospitality_firm", "HospitalityFirm"),               # Arts, Entertainment, and Recreation
+    "72": ("hospitality_firm", "HospitalityFirm"),               # Accommodation and Food Services
+    "81": ("support_services_firm", "SupportServicesFirm"),      # Other Services (except Public Administration)
+    "92": ("support_services_firm", "GovernmentAgency"),         # Public Administration
 }
 
+class _LazyFirmMapping(Mapping):
+    """Read-only NAICS sector -> firm class mapping that imports each firm module on first lookup"""
+    
+    def __init__(self, class_names: dict):
+        self._class_names = class_names
+    
+    def __getitem__(self, naics_code: str) -> type:
+        return _resolve(*self._class_names[naics_code])
+    
+    def __iter__(self):
+        return iter(self._class_names)
+    
+    def __len__(self) -> int:
+        return len(self._class_names)
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._class_names!r})"
+
+# NAICS classification mapping to firm classes
+NAICS_FIRM_MAPPING = _LazyFirmMapping(_NAICS_CLASS_NAMES)
+
+def _lazy_factory(module_name: str, class_name: str):
+    """Return a constructor that imports its firm class on the first call"""
+    firm_class = None
+    
+    def create(**kwargs):
+        nonlocal firm_class
+        if firm_class is None:
+            firm_class = _resolve(module_name, class_name)
+        return firm_class(**kwargs)
+    
+    return create
+
+# Firm constructor for every 2-digit NAICS sector, indexed by the sector number
+_NAICS_TABLE = [BaseFirm] * 100
+for _code, _entry in _NAICS_CLASS_NAMES.items():
+    _NAICS_TABLE[int(_code)] = _lazy_factory(*_entry)
+_NAICS_TABLE = tuple(_NAICS_TABLE)
+del _code, _entry
+
 def create_firm_by_naics(naics_code: str, **kwargs) -> BaseFirm:
     """
     Factory function to create appropriate firm class based on NAICS code.
@@ -63,11 +153,13 @@ def create_firm_by_naics(naics_code: str, **kwargs) -> BaseFirm:
     Returns:
         Specialized firm instance based on NAICS classification
     """
-    # Extract 2-digit code from longer NAICS codes
-    naics_2digit = naics_code[:2] if len(naics_code) >= 2 else naics_code
-    
-    firm_class = NAICS_FIRM_MAPPING.get(naics_2digit, BaseFirm)
-    return firm_class(naics=naics_code, **kwargs)
+    # Index the sector table by the 2-digit prefix of longer NAICS codes
+    try:
+        firm_factory = _NAICS_TABLE[int(naics_code[:2])]
+    except ValueError:
+        # Malformed codes fall back to the base firm
+        firm_factory = BaseFirm
+    return firm_factory(naics=naics_code, **kwargs)
 
 def get_available_naics_codes() -> dict:
     """
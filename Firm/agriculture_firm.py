@@ -6,6 +6,9 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from datetime import date, timedelta
 from enum import Enum
+from itertools import compress
+
+import numpy as np
 
 from .firm import BaseFirm, Money, Transaction
 from .org_chart import Role, RoleType, VotingRights
@@ -30,7 +33,7 @@ class ProductionMethod(Enum):
     SUSTAINABLE = "sustainable"
     INTENSIVE = "intensive"
 
-@dataclass
+@dataclass(slots=True)
 class Land:
     parcel_id: str
     acreage: float
@@ -40,7 +43,7 @@ class Land:
     location: str
     last_rotation: date = None
 
-@dataclass
+@dataclass(slots=True)
 class Crop:
     crop_type: CropType
     variety: str
@@ -51,7 +54,7 @@ class Crop:
     input_costs_per_acre: float
     production_method: ProductionMethod
 
-@dataclass
+@dataclass(slots=True)
 class Livestock:
     livestock_type: LivestockType
     head_count: int
@@ -60,7 +63,7 @@ class Livestock:
     feeding_cost_per_head_per_day: float
     expected_market_date: date = None
 
-@dataclass
+@dataclass(slots=True)
 class WeatherRisk:
     drought_probability: float
     flood_probability: float
@@ -127,14 +130,21 @@ class AgriculturalFirm(BaseFirm):
     vessel_inventory: List[str] = field(default_factory=list)
     harvest_permits: List[str] = field(default_factory=list)
     
+    # Row indexes maintained by add_land_parcel and add_equipment, verified on lookup
+    _parcel_rows: Dict[str, int] = field(default_factory=dict, init=False, repr=False)  # parcel_id -> row in land_holdings
+    _equipment_rows: Dict[str, int] = field(default_factory=dict, init=False, repr=False)  # equipment_id -> row in equipment_list
+    
     def __post_init__(self):
         super().__post_init__()
         if not self.naics:
             self.naics = "11"  # Agriculture base code
+        self._index_parcels()
+        self._index_equipment()
     
     # Land management methods
     def add_land_parcel(self, parcel: Land) -> None:
         """Add a land parcel to holdings"""
+        self._parcel_rows.setdefault(parcel.parcel_id, len(self.land_holdings))
         self.land_holdings.append(parcel)
         self.soil_health_scores[parcel.parcel_id] = parcel.soil_quality
     
@@ -142,9 +152,25 @@ class AgriculturalFirm(BaseFirm):
         """Calculate total land holdings"""
         return sum(land.acreage for land in self.land_holdings)
     
+    def _index_parcels(self) -> None:
+        """Rebuild the parcel id -> row index from land_holdings (first parcel of an id wins)"""
+        self._parcel_rows = {}
+        for row, parcel in enumerate(self.land_holdings):
+            self._parcel_rows.setdefault(parcel.parcel_id, row)
+    
+    def _find_parcel(self, parcel_id: str) -> Optional[Land]:
+        """Parcel with parcel_id, reindexing when the cached row misses or no longer holds that parcel"""
+        row = self._parcel_rows.get(parcel_id)
+        if row is None or row >= len(self.land_holdings) or self.land_holdings[row].parcel_id != parcel_id:
+            self._index_parcels()
+            row = self._parcel_rows.get(parcel_id)
+            if row is None:
+                return None
+        return self.land_holdings[row]
+    
     def plan_crop_rotation(self, parcel_id: str, crop_sequence: List[str]) -> bool:
         """Set rotation schedule for a parcel"""
-        if any(land.parcel_id == parcel_id for land in self.land_holdings):
+        if self._find_parcel(parcel_id):
             self.rotation_schedule[parcel_id] = crop_sequence
             return True
         return False
@@ -152,7 +178,7 @@ class AgriculturalFirm(BaseFirm):
     # Production methods
     def plant_crop(self, crop: Crop, parcel_id: str) -> bool:
         """Plant a crop on specified parcel"""
-        parcel = next((land for land in self.land_holdings if land.parcel_id == parcel_id), None)
+        parcel = self._find_parcel(parcel_id)
         if not parcel or crop.planted_acreage > parcel.acreage:
             return False
         
@@ -167,21 +193,22 @@ class AgriculturalFirm(BaseFirm):
     
     def harvest_crop(self, crop_variety: str) -> float:
         """Harvest a specific crop and return yield"""
-        crops_to_harvest = [c for c in self.current_crops if c.variety == crop_variety]
-        if not crops_to_harvest:
+        weather_factor = 1.0 - (self.weather_risk_profile.impact_factor if self.weather_risk_profile else 0.0)
+        
+        # Columns built from current_crops at harvest time, so direct edits to the crops are seen
+        crops = self.current_crops
+        n = len(crops)
+        mask = np.fromiter((c.variety == crop_variety for c in crops), dtype=bool, count=n)
+        if not mask.any():
             return 0.0
+        acreage = np.fromiter((c.planted_acreage for c in crops), dtype=np.float64, count=n)
+        yield_per_acre = np.fromiter((c.expected_yield_per_acre for c in crops), dtype=np.float64, count=n)
         
-        total_yield = 0.0
-        for crop in crops_to_harvest:
-            base_yield = crop.planted_acreage * crop.expected_yield_per_acre
-            weather_factor = 1.0 - (self.weather_risk_profile.impact_factor if self.weather_risk_profile else 0.0)
-            
-            actual_yield = base_yield * weather_factor
-            total_yield += actual_yield
-            
-            self.inventory[crop.variety] = self.inventory.get(crop.variety, 0) + actual_yield
+        total_yield = float(np.dot(acreage[mask], yield_per_acre[mask])) * weather_factor
+        self.inventory[crop_variety] = self.inventory.get(crop_variety, 0) + total_yield
         
-        self.current_crops = [c for c in self.current_crops if c.variety != crop_variety]
+        # Keep the crops left in the ground
+        self.current_crops = list(compress(crops, ~mask))
         return total_yield
     
     def calculate_diversification_index(self) -> float:
@@ -196,7 +223,7 @@ class AgriculturalFirm(BaseFirm):
     # Sub-industry specific methods
     def irrigate(self, parcel_id: str, inches: float) -> bool:
         """Apply irrigation to a parcel"""
-        if parcel_id not in [l.parcel_id for l in self.land_holdings]:
+        if not self._find_parcel(parcel_id):
             return False
         self.water_rights[parcel_id] = self.water_rights.get(parcel_id, 0) - inches
         return True
@@ -217,10 +244,27 @@ class AgriculturalFirm(BaseFirm):
 
     # Additional methods for AgriculturalFirm
     def add_equipment(self, equipment: Equipment) -> None:
+        self._equipment_rows.setdefault(equipment.equipment_id, len(self.equipment_list))
         self.equipment_list.append(equipment)
     
+    def _index_equipment(self) -> None:
+        """Rebuild the equipment id -> row index from equipment_list (first item of an id wins)"""
+        self._equipment_rows = {}
+        for row, equipment in enumerate(self.equipment_list):
+            self._equipment_rows.setdefault(equipment.equipment_id, row)
+    
+    def _find_equipment(self, equipment_id: str) -> Optional[Equipment]:
+        """Equipment with equipment_id, reindexing when the cached row misses or no longer holds that item"""
+        row = self._equipment_rows.get(equipment_id)
+        if row is None or row >= len(self.equipment_list) or self.equipment_list[row].equipment_id != equipment_id:
+            self._index_equipment()
+            row = self._equipment_rows.get(equipment_id)
+            if row is None:
+                return None
+        return self.equipment_list[row]
+    
     def schedule_maintenance(self, equipment_id: str, record: Dict[str, Any]) -> bool:
-        eq = next((e for e in self.equipment_list if e.equipment_id == equipment_id), None)
+        eq = self._find_equipment(equipment_id)
         if not eq:
             return False
         eq.maintenance_records.append(record)
@@ -5,9 +5,18 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from datetime import date, timedelta
-from enum import Enum
+from collections import Counter
+from enum import Enum, IntEnum
+from itertools import compress
 
-from .firm import BaseFirm, Money, Transaction
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+from .firm import BaseFirm, Money, Transaction, intern_id
 from .org_chart import Role, RoleType, VotingRights
 
 class ConstructionType(Enum):
@@ -25,7 +34,51 @@ class ProjectPhase(Enum):
     CLOSEOUT = "closeout"
     COMPLETE = "complete"
 
-@dataclass
+class IncidentSeverity(IntEnum):
+    OTHER = 0
+    FIRST_AID = 1
+    RECORDABLE = 2
+    LOST_TIME = 3
+    FATALITY = 4
+
+# Default lead times
+_MOBILIZATION_LEAD = timedelta(days=30)  # award -> construction start
+_MATERIAL_LEAD = timedelta(days=7)  # order -> delivery
+
+# Incident severity string -> code for the severity array; unknown strings count as OTHER
+_SEVERITY_CODES = {severity.name.lower(): severity for severity in IncidentSeverity}
+
+def _draw_materials(quantities: np.ndarray, type_ids: np.ndarray, type_id: int, needed: float) -> int:
+    """
+    Draw `needed` units of one material type from inventory lots in FIFO
+    order, updating quantities in place. Returns the index just past the
+    last lot drawn from, or -1 (leaving quantities untouched) if there is no
+    lot of that type or not enough quantity.
+    """
+    found = False
+    available = 0.0
+    for i in range(quantities.size):
+        if type_ids[i] == type_id:
+            found = True
+            available += quantities[i]
+    if not found or available < needed:
+        return -1
+    
+    remaining = needed
+    end = 0
+    for i in range(quantities.size):
+        if remaining <= 0:
+            break
+        if type_ids[i] == type_id:
+            used = min(remaining, quantities[i])
+            quantities[i] -= used
+            remaining -= used
+            end = i + 1
+    return end
+
+_draw_materials_jit = njit(cache=True, boundscheck=False)(_draw_materials) if njit is not None else None
+
+@dataclass(slots=True)
 class ConstructionProject:
     project_id: str
     client_id: str
@@ -37,8 +90,48 @@ class ConstructionProject:
     percent_complete: float = 0.0
     change_orders: List[Dict] = field(default_factory=list)
     milestone_payments: Dict[float, float] = field(default_factory=dict)  # % complete -> payment
+    
+    # milestone_payments as arrays sorted by % complete (keys rounded to basis points, payments of
+    # keys that round together summed), the dict they were built from and the % complete the
+    # milestones have been paid through
+    _ms_pct: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    _ms_pay: np.ndarray = field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    _ms_source: Dict[float, float] = field(default_factory=dict, init=False, repr=False)
+    _ms_paid_pct: float = field(default=0.0, init=False, repr=False)
+    
+    def __post_init__(self):
+        self._ms_paid_pct = self.percent_complete
+        self._build_milestone_arrays()
+    
+    def _build_milestone_arrays(self) -> None:
+        """Rebuild the sorted milestone arrays from milestone_payments"""
+        by_bp: Dict[int, float] = {}
+        for pct, pay in self.milestone_payments.items():
+            bp = round(pct * 100)
+            by_bp[bp] = by_bp.get(bp, 0.0) + pay
+        milestones = sorted(by_bp.items())
+        self._ms_pct = np.array([bp for bp, _ in milestones], dtype=np.float64) / 100.0
+        self._ms_pay = np.array([pay for _, pay in milestones], dtype=np.float64)
+        self._ms_source = dict(self.milestone_payments)
+    
+    def add_milestone_payment(self, percent_complete: float, payment: float) -> None:
+        """Add a payment due when the project reaches percent_complete"""
+        self.milestone_payments[percent_complete] = payment
+        self._build_milestone_arrays()
+    
+    def collect_milestone_payments(self) -> float:
+        """Total the milestones passed between the last call's % complete (exclusive) and the current one (inclusive)"""
+        if self.milestone_payments != self._ms_source:
+            # milestone_payments was edited directly
+            self._build_milestone_arrays()
+        paid_idx = int(np.searchsorted(self._ms_pct, self._ms_paid_pct, side="right"))
+        new_idx = int(np.searchsorted(self._ms_pct, self.percent_complete, side="right"))
+        self._ms_paid_pct = self.percent_complete
+        if new_idx <= paid_idx:
+            return 0.0
+        return float(self._ms_pay[paid_idx:new_idx].sum())
 
-@dataclass
+@dataclass(slots=True)
 class LaborCrew:
     crew_id: str
     trade_specialty: str
@@ -47,7 +140,7 @@ class LaborCrew:
     certifications: List[str] = field(default_factory=list)
     current_project: str = None
 
-@dataclass
+@dataclass(slots=True)
 class MaterialInventory:
     material_type: str
     quantity: float
@@ -98,63 +191,135 @@ class ConstructionFirm(BaseFirm):
     permit_delays: Dict[str, int] = field(default_factory=dict)  # project_id -> days delayed
     quality_control_metrics: Dict[str, float] = field(default_factory=dict)
     
+    # Lookup indexes over active_projects, bid_pipeline and labor_crews (id -> row)
+    _project_rows: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _bid_rows: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _crew_rows: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _bids_submitted: int = field(default=0, init=False, repr=False)
+    
     def __post_init__(self):
         super().__post_init__()
         if not self.naics:
             self.naics = "23"  # Construction base code
+        self._index_projects()
+        self._index_bids()
+        self._index_crews()
+        self._bids_submitted = len(self.bid_pipeline)
+    
+    @classmethod
+    def warmup(cls) -> None:
+        """Compile the numba kernels ahead of the first simulation tick (loaded from disk cache when available)"""
+        if _draw_materials_jit is not None:
+            _draw_materials_jit(np.zeros(1), np.zeros(1, dtype=np.int64), 0, 0.0)
+    
+    # Row indexes: each lookup checks that the cached row still holds the id and
+    # reindexes otherwise, so direct edits to the lists are picked up
+    def _index_projects(self) -> None:
+        """Rebuild the project id -> row index from active_projects (first project of an id wins)"""
+        self._project_rows = {}
+        for row, project in enumerate(self.active_projects):
+            self._project_rows.setdefault(project.project_id, row)
+    
+    def _find_project(self, project_id: str) -> Optional[ConstructionProject]:
+        """Active project with project_id, reindexing when the cached row misses or no longer holds it"""
+        row = self._project_rows.get(project_id)
+        if row is None or row >= len(self.active_projects) or self.active_projects[row].project_id != project_id:
+            self._index_projects()
+            row = self._project_rows.get(project_id)
+            if row is None:
+                return None
+        return self.active_projects[row]
+    
+    def _index_bids(self) -> None:
+        """Rebuild the bid id -> row index from bid_pipeline (first bid of an id wins)"""
+        self._bid_rows = {}
+        for row, bid in enumerate(self.bid_pipeline):
+            self._bid_rows.setdefault(bid["bid_id"], row)
+    
+    def _find_bid(self, bid_id: str) -> Optional[Dict]:
+        """Pipeline bid with bid_id, reindexing when the cached row misses or no longer holds it"""
+        row = self._bid_rows.get(bid_id)
+        if row is None or row >= len(self.bid_pipeline) or self.bid_pipeline[row]["bid_id"] != bid_id:
+            self._index_bids()
+            row = self._bid_rows.get(bid_id)
+            if row is None:
+                return None
+        return self.bid_pipeline[row]
+    
+    def _index_crews(self) -> None:
+        """Rebuild the crew id -> row index from labor_crews (first crew of an id wins)"""
+        self._crew_rows = {}
+        for row, crew in enumerate(self.labor_crews):
+            self._crew_rows.setdefault(crew.crew_id, row)
+    
+    def _find_crew(self, crew_id: str) -> Optional[LaborCrew]:
+        """Labor crew with crew_id, reindexing when the cached row misses or no longer holds it"""
+        row = self._crew_rows.get(crew_id)
+        if row is None or row >= len(self.labor_crews) or self.labor_crews[row].crew_id != crew_id:
+            self._index_crews()
+            row = self._crew_rows.get(crew_id)
+            if row is None:
+                return None
+        return self.labor_crews[row]
     
     # Project management
     def submit_bid(self, project_opportunity: Dict, bid_amount: float) -> str:
         """Submit bid for construction project"""
-        bid_id = f"bid_{len(self.bid_pipeline)}"
+        # Numbered by submissions so ids stay unique after bids leave the pipeline
+        bid_id = f"bid_{self._bids_submitted}"
+        self._bids_submitted += 1
         bid = {
             "bid_id": bid_id,
             "project_details": project_opportunity,
             "bid_amount": bid_amount,
-            "submission_date": date.today(),
+            "submission_date": self.today(),
             "status": "submitted"
         }
+        self._bid_rows.setdefault(bid_id, len(self.bid_pipeline))
         self.bid_pipeline.append(bid)
         return bid_id
     
     def win_project(self, bid_id: str) -> bool:
         """Convert winning bid to active project"""
-        bid = next((b for b in self.bid_pipeline if b["bid_id"] == bid_id), None)
+        bid = self._find_bid(bid_id)
         if not bid:
             return False
         
+        today = self.today()
         project = ConstructionProject(
             project_id=f"proj_{bid_id}",
             client_id=bid["project_details"]["client_id"],
             construction_type=ConstructionType(bid["project_details"]["type"]),
             contract_value=bid["bid_amount"],
             phase=ProjectPhase.AWARDED,
-            start_date=date.today() + timedelta(days=30),
-            scheduled_completion=date.today() + timedelta(days=bid["project_details"]["duration_days"])
+            start_date=today + _MOBILIZATION_LEAD,
+            scheduled_completion=today + timedelta(days=bid["project_details"]["duration_days"])
         )
         
+        self._project_rows.setdefault(project.project_id, len(self.active_projects))
         self.active_projects.append(project)
         self.backlog_value += project.contract_value
         
         # Remove from bid pipeline
-        self.bid_pipeline = [b for b in self.bid_pipeline if b["bid_id"] != bid_id]
+        del self.bid_pipeline[self._bid_rows[bid_id]]
+        self._index_bids()
         return True
     
     def update_project_progress(self, project_id: str, new_percent_complete: float) -> bool:
         """Update project completion percentage"""
-        project = next((p for p in self.active_projects if p.project_id == project_id), None)
+        project = self._find_project(project_id)
         if not project:
             return False
         
         old_progress = project.percent_complete
         project.percent_complete = min(100.0, new_percent_complete)
         
-        # Check for milestone payments
-        for milestone_pct, payment_amount in project.milestone_payments.items():
-            if old_progress < milestone_pct <= project.percent_complete:
-                self.post("cash", "milestone_revenue", payment_amount, 
-                         f"Milestone payment: {project_id}")
-                self.income_statement["revenue"] += payment_amount
+        # Collect milestone payments reached by this update
+        payment_amount = project.collect_milestone_payments()
+        if payment_amount:
+            self.post("cash", "milestone_revenue", payment_amount, 
+                     f"Milestone payment: {project_id}")
+            self.income_statement["revenue"] += payment_amount
         
         # Update backlog
         progress_delta = (project.percent_complete - old_progress) / 100.0
@@ -163,11 +328,31 @@ class ConstructionFirm(BaseFirm):
         
         return True
     
+    def complete_project(self, project_id: str) -> bool:
+        """Close out an active project and move it to completed_projects"""
+        project = self._find_project(project_id)
+        if not project:
+            return False
+        
+        del self.active_projects[self._project_rows[project_id]]
+        self._index_projects()
+        self.completed_projects.append(project_id)
+        project.phase = ProjectPhase.COMPLETE
+        
+        # Drop whatever backlog was not recognized through progress updates
+        self.backlog_value -= project.contract_value * (100.0 - project.percent_complete) / 100.0
+        return True
+    
     # Workforce management
+    def add_labor_crew(self, crew: LaborCrew) -> None:
+        """Add a labor crew to the workforce"""
+        self._crew_rows.setdefault(crew.crew_id, len(self.labor_crews))
+        self.labor_crews.append(crew)
+    
     def assign_crew_to_project(self, crew_id: str, project_id: str) -> bool:
         """Assign labor crew to specific project"""
-        crew = next((c for c in self.labor_crews if c.crew_id == crew_id), None)
-        project = next((p for p in self.active_projects if p.project_id == project_id), None)
+        crew = self._find_crew(crew_id)
+        project = self._find_project(project_id)
         
         if not crew or not project or crew.current_project:
             return False
@@ -203,7 +388,7 @@ class ConstructionFirm(BaseFirm):
             quantity=quantity,
             unit_cost=unit_cost,
             supplier=supplier_info.get("supplier", "default"),
-            delivery_date=date.today() + timedelta(days=7),
+            delivery_date=self.today() + _MATERIAL_LEAD,
             quality_grade=supplier_info.get("grade", "standard")
         )
         
@@ -213,29 +398,47 @@ class ConstructionFirm(BaseFirm):
     
     def consume_materials(self, material_type: str, quantity: float, project_id: str) -> bool:
         """Consume materials for project work"""
-        available_materials = [m for m in self.material_inventory if m.material_type == material_type]
+        if _draw_materials_jit is None:
+            return self._draw_material_lots(material_type, quantity)
         
-        if not available_materials or sum(m.quantity for m in available_materials) < quantity:
+        # Read quantities and types off the records each call so direct edits to them are seen
+        inventory = self.material_inventory
+        n = len(inventory)
+        quantities = np.fromiter((m.quantity for m in inventory), dtype=np.float64, count=n)
+        type_ids = np.fromiter((intern_id(m.material_type) for m in inventory), dtype=np.int64, count=n)
+        type_id = intern_id(material_type)
+        end = _draw_materials_jit(quantities, type_ids, type_id, float(quantity))
+        if end < 0:
             return False
         
-        remaining_needed = quantity
-        materials_used = []
+        # Write the drawn quantities back to the inventory records
+        for i in np.flatnonzero(type_ids[:end] == type_id):
+            inventory[i].quantity = float(quantities[i])
+        
+        # Remove depleted materials
+        keep = (type_ids != type_id) | (quantities > 0)
+        if not keep.all():
+            self.material_inventory = list(compress(inventory, keep))
+        
+        return True
+    
+    def _draw_material_lots(self, material_type: str, quantity: float) -> bool:
+        """FIFO drawdown over the inventory records, used when numba is not installed"""
+        lots = [m for m in self.material_inventory if m.material_type == material_type]
+        if not lots or sum(m.quantity for m in lots) < quantity:
+            return False
         
-        for material in available_materials:
+        remaining_needed = quantity
+        for material in lots:
             if remaining_needed <= 0:
                 break
-            
             used = min(remaining_needed, material.quantity)
             material.quantity -= used
             remaining_needed -= used
-            
-            if material.quantity == 0:
-                materials_used.append(material)
         
         # Remove depleted materials
-        for used_material in materials_used:
-            self.material_inventory.remove(used_material)
-        
+        self.material_inventory = [m for m in self.material_inventory
+                                   if m.material_type != material_type or m.quantity > 0]
         return True
     
     # Financial operations
@@ -255,14 +458,14 @@ class ConstructionFirm(BaseFirm):
     def process_change_order(self, project_id: str, change_description: str, 
                            cost_impact: float) -> bool:
         """Process change order for project"""
-        project = next((p for p in self.active_projects if p.project_id == project_id), None)
+        project = self._find_project(project_id)
         if not project:
             return False
         
         change_order = {
             "description": change_description,
             "cost_impact": cost_impact,
-            "date": date.today(),
+            "date": self.today(),
             "approved": False
         }
         
@@ -284,7 +487,7 @@ class ConstructionFirm(BaseFirm):
             "incident_type": incident_type,
             "severity": severity,
             "workers_affected": workers_affected,
-            "date": date.today()
+            "date": self.today()
         }
         
         self.safety_record["incidents"].append(incident)
@@ -294,27 +497,31 @@ class ConstructionFirm(BaseFirm):
         incidents = self.safety_record.get("incidents", [])
         total_incidents = len(incidents)
         
+        # Severity codes read off the incident records each call, so edits to them are counted
+        codes = np.fromiter((_SEVERITY_CODES.get(i["severity"], IncidentSeverity.OTHER) for i in incidents),
+                            dtype=np.int8, count=total_incidents)
+        severity_counts = np.bincount(codes, minlength=len(IncidentSeverity))
+        
         # Calculate incidents per project
-        if len(self.active_projects) + len(self.completed_projects) == 0:
-            incidents_per_project = 0.0
-        else:
-            incidents_per_project = total_incidents / (len(self.active_projects) + len(self.completed_projects))
+        total_projects = len(self.active_projects) + len(self.completed_projects)
+        incidents_per_project = total_incidents / total_projects if total_projects else 0.0
         
         return {
             "total_incidents": total_incidents,
             "incidents_per_project": incidents_per_project,
-            "lost_time_incidents": len([i for i in incidents if i["severity"] == "lost_time"])
+            "lost_time_incidents": int(severity_counts[IncidentSeverity.LOST_TIME])
         }
     
     # Analytics and reporting
     def get_project_portfolio_summary(self) -> Dict[str, Any]:
         """Generate summary of project portfolio"""
+        # One pass over active_projects, so direct edits to the list are counted
+        type_counts = Counter(p.construction_type for p in self.active_projects)
         return {
             "active_projects": len(self.active_projects),
             "total_backlog_value": self.backlog_value,
             "average_project_value": self.backlog_value / max(1, len(self.active_projects)),
-            "projects_by_type": {ct.value: len([p for p in self.active_projects if p.construction_type == ct]) 
-                               for ct in ConstructionType},
+            "projects_by_type": {ct.value: type_counts.get(ct, 0) for ct in ConstructionType},
             "workforce_utilization": self.workforce_utilization,
             "bonding_capacity_used": sum(self.surety_bonds.values()),
             "safety_metrics": self.calculate_safety_metrics()
@@ -3,9 +3,17 @@
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Tuple, Any
 from datetime import date, timedelta
 from enum import Enum
+from itertools import compress
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 from .firm import BaseFirm, Money, Transaction
 from .org_chart import Role, RoleType, VotingRights
@@ -47,7 +55,7 @@ class FundingSource(Enum):
     RESEARCH_GRANTS = "research_grants"
     AUXILIARY_SERVICES = "auxiliary_services"
 
-@dataclass
+@dataclass(slots=True)
 class Student:
     student_id: str
     enrollment_date: date
@@ -62,7 +70,27 @@ class Student:
     demographics: Dict[str, Any] = field(default_factory=dict)
     housing: str = "off_campus"  # on_campus, off_campus
 
-@dataclass
+# Share of the annual student services budget spent per service (unlisted services use the whole budget)
+_SERVICE_COST_SHARES = {
+    "counseling": 0.20,
+    "career_services": 0.25,
+    "tutoring": 0.15,
+    "health_services": 0.30,
+    "student_activities": 0.10
+}
+
+# Facility type -> (capacity attribute, cost per unit of capacity)
+_FACILITY_UNIT_COSTS = {
+    "classroom": ("classroom_capacity", 10000),  # $10k per seat
+    "dormitory": ("dormitory_capacity", 50000),  # $50k per bed
+    "laboratory": ("laboratory_facilities", 100000),  # $100k per lab
+    "library": ("library_holdings", 50)  # $50 per book/resource
+}
+
+# Tenure statuses counted in tenure_track_percentage
+_TENURE_LINE = frozenset(("tenured", "tenure_track"))
+
+@dataclass(slots=True)
 class AcademicProgram:
     program_id: str
     program_name: str
@@ -75,7 +103,7 @@ class AcademicProgram:
     accreditation_status: str = "accredited"
     faculty_requirements: int = 5  # minimum faculty needed
 
-@dataclass
+@dataclass(slots=True)
 class Faculty:
     faculty_id: str
     name: str
@@ -87,7 +115,7 @@ class Faculty:
     teaching_load: int = 12  # credit hours per semester
     publications: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class Course:
     course_id: str
     course_name: str
@@ -98,7 +126,7 @@ class Course:
     tuition_revenue: float = 0.0
     semester: str = "fall"
 
-@dataclass
+@dataclass(slots=True)
 class ResearchGrant:
     grant_id: str
     funding_agency: str
@@ -108,6 +136,30 @@ class ResearchGrant:
     end_date: date
     indirect_cost_rate: float = 0.30  # 30% overhead
 
+def _select_dropouts(gpa: np.ndarray, gpa_threshold: float, dropout_fraction: float) -> np.ndarray:
+    """
+    Rows of the students who drop out this period: the first
+    int(at_risk * dropout_fraction) rows, in enrollment order, whose GPA is
+    below gpa_threshold.
+    """
+    at_risk = 0
+    for i in range(gpa.size):
+        if gpa[i] < gpa_threshold:
+            at_risk += 1
+    
+    dropout_count = int(at_risk * dropout_fraction)
+    rows = np.empty(dropout_count, dtype=np.int64)
+    k = 0
+    for i in range(gpa.size):
+        if k == dropout_count:
+            break
+        if gpa[i] < gpa_threshold:
+            rows[k] = i
+            k += 1
+    return rows
+
+_select_dropouts_jit = njit(cache=True)(_select_dropouts) if njit is not None else None
+
 @dataclass
 class EducationFirm(BaseFirm):
     # Institutional characteristics
@@ -192,29 +244,34 @@ class EducationFirm(BaseFirm):
     ncaa_division: str = "III"  # I, II, III, or None
     intramural_programs: int = 10
     
+    # Lookup indexes over enrolled_students, faculty_members and academic_programs
+    _students_by_id: Dict[str, Student] = field(default_factory=dict, init=False, repr=False)
+    _faculty_rows: Dict[str, int] = field(default_factory=dict, init=False, repr=False)  # faculty_id -> row in faculty_members
+    _program_rows: Dict[str, int] = field(default_factory=dict, init=False, repr=False)  # program_id -> row in academic_programs
+    
+    # Each enrolled student's position in enrolled_students (keyed by id() of the Student object)
+    _student_rows: Dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    
     def __post_init__(self):
         super().__post_init__()
         if not self.naics:
             self.naics = "61"  # Educational Services
+        self._index_students()
+        self._index_faculty()
+        self._index_programs()
+    
+    @classmethod
+    def warmup(cls) -> None:
+        """Compile the numba kernels ahead of the first simulation tick (loaded from disk cache when available)"""
+        if _select_dropouts_jit is not None:
+            _select_dropouts_jit(np.zeros(1), 2.0, 0.20)
     
     # Student enrollment and management
     def enroll_student(self, student: Student) -> bool:
         """Enroll new student"""
-        if self.current_enrollment >= self.enrollment_capacity:
-            return False
-        
-        # Find appropriate program
-        program = next((p for p in self.academic_programs if p.program_id == student.program), None)
-        if not program or program.current_enrollment >= program.enrollment_capacity:
+        if not self._admit(student):
             return False
         
-        self.enrolled_students.append(student)
-        self.current_enrollment += 1
-        program.current_enrollment += 1
-        
-        # Update enrollment by level
-        self.enrollment_by_level[student.degree_level] = self.enrollment_by_level.get(student.degree_level, 0) + 1
-        
         # Record tuition revenue
         net_tuition = student.tuition_rate - student.financial_aid
         self.post("cash", "tuition_revenue", net_tuition, f"Enrollment: {student.student_id}")
@@ -229,9 +286,63 @@ class EducationFirm(BaseFirm):
         
         return True
     
+    def bulk_enroll(self, students: List[Student]) -> List[Student]:
+        """
+        Enroll a batch of students, in order, with one tuition posting and one
+        financial aid posting for the whole batch.
+        
+        Args:
+            students (List[Student]): Students to enroll
+            
+        Returns:
+            List[Student]: Students rejected for lack of institution or program capacity
+        """
+        rejected = []
+        net_tuition = 0.0
+        total_aid = 0.0
+        for student in students:
+            if not self._admit(student):
+                rejected.append(student)
+                continue
+            net_tuition += student.tuition_rate - student.financial_aid
+            if student.financial_aid > 0:
+                total_aid += student.financial_aid
+        
+        admitted = len(students) - len(rejected)
+        if admitted:
+            self.post("cash", "tuition_revenue", net_tuition, f"Bulk enrollment: {admitted} students")
+            self.income_statement["revenue"] += net_tuition
+            self.tuition_revenue += net_tuition
+        if total_aid > 0:
+            self.post("financial_aid_expense", "cash", total_aid, f"Financial aid: {admitted} students")
+            self.income_statement["opex"] += total_aid
+        
+        return rejected
+    
+    def _admit(self, student: Student) -> bool:
+        """Check capacity and add a student to the enrolled list, indexes and counts (no postings)"""
+        if self.current_enrollment >= self.enrollment_capacity:
+            return False
+        
+        # Find appropriate program
+        program = self._find_program(student.program)
+        if not program or program.current_enrollment >= program.enrollment_capacity:
+            return False
+        
+        self._sync_students()  # sync before appending so the new row lines up
+        self._student_rows[id(student)] = len(self.enrolled_students)
+        self.enrolled_students.append(student)
+        self._students_by_id.setdefault(student.student_id, student)  # lookups find the first enrollment of an id
+        self.current_enrollment += 1
+        program.current_enrollment += 1
+        
+        # Update enrollment by level
+        self.enrollment_by_level[student.degree_level] = self.enrollment_by_level.get(student.degree_level, 0) + 1
+        return True
+    
     def graduate_student(self, student_id: str) -> bool:
         """Graduate student who has completed requirements"""
-        student = next((s for s in self.enrolled_students if s.student_id == student_id), None)
+        student, row = self._find_student(student_id)
         if not student:
             return False
         
@@ -245,24 +356,39 @@ class EducationFirm(BaseFirm):
         # Update graduation statistics
         self.graduation_rate = (self.graduation_rate * 0.95 + 1.0 * 0.05)  # weighted average
         
-        # Remove from enrolled students list
-        self.enrolled_students = [s for s in self.enrolled_students if s.student_id != student_id]
+        # Remove from enrolled students list in place, keeping enrollment order
+        del self.enrolled_students[row]
+        del self._students_by_id[student_id]
+        del self._student_rows[id(student)]
+        for later_row in range(row, len(self.enrolled_students)):
+            self._student_rows[id(self.enrolled_students[later_row])] = later_row
         
         return True
     
     def process_student_retention(self) -> float:
         """Process student retention and dropouts"""
-        students_at_risk = [s for s in self.enrolled_students if s.gpa < 2.0]
+        # Read GPAs off the Student objects each call so term updates made directly on them are seen
+        gpa = np.fromiter((s.gpa for s in self.enrolled_students), dtype=np.float64,
+                          count=len(self.enrolled_students))
+        
+        # Some at-risk (GPA below 2.0) students drop out: 20% of them
+        if _select_dropouts_jit is not None:
+            dropout_rows = _select_dropouts_jit(gpa, 2.0, 0.20)
+        else:
+            at_risk_rows = np.flatnonzero(gpa < 2.0)
+            dropout_rows = at_risk_rows[:int(len(at_risk_rows) * 0.20)]
+        dropout_count = len(dropout_rows)
         
-        # Some at-risk students drop out
-        dropout_count = int(len(students_at_risk) * 0.20)  # 20% of at-risk students
+        for row in dropout_rows:
+            student = self.enrolled_students[row]
+            student.status = StudentStatus.DROPPED_OUT
+        self.current_enrollment -= dropout_count
         
-        for i in range(dropout_count):
-            if students_at_risk:
-                student = students_at_risk.pop(0)
-                student.status = StudentStatus.DROPPED_OUT
-                self.current_enrollment -= 1
-                self.enrolled_students.remove(student)
+        # Drop them from the enrolled list and the columns in one pass
+        if dropout_count:
+            dropped = np.zeros(len(gpa), dtype=bool)
+            dropped[dropout_rows] = True
+            self._remove_students(dropped)
         
         # Update retention rate
         if self.current_enrollment > 0:
@@ -271,9 +397,77 @@ class EducationFirm(BaseFirm):
         
         return self.retention_rate
     
+    def _index_students(self) -> None:
+        """Rebuild the student id index and row map from enrolled_students"""
+        self._students_by_id = {}
+        for student in self.enrolled_students:
+            self._students_by_id.setdefault(student.student_id, student)  # lookups find the first enrollment of an id
+        self._student_rows = {id(s): row for row, s in enumerate(self.enrolled_students)}
+    
+    def _sync_students(self) -> None:
+        """Rebuild the student id index and row map if enrolled_students was replaced or edited directly"""
+        if len(self._student_rows) != len(self.enrolled_students):
+            self._index_students()
+    
+    def _find_student(self, student_id: str) -> Tuple[Optional[Student], Optional[int]]:
+        """
+        Enrolled student with student_id and their row in enrolled_students,
+        or (None, None). The indexes are rebuilt when they miss or point at a
+        row that no longer holds the student (enrolled_students edited directly).
+        """
+        self._sync_students()
+        student = self._students_by_id.get(student_id)
+        row = self._student_rows.get(id(student))
+        if (row is None or row >= len(self.enrolled_students) or self.enrolled_students[row] is not student
+                or student.student_id != student_id):
+            self._index_students()
+            student = self._students_by_id.get(student_id)
+            row = self._student_rows.get(id(student))
+        if student is None:
+            return None, None
+        return student, row
+    
+    def _remove_students(self, mask: np.ndarray) -> None:
+        """Drop the masked rows from enrolled_students and reindex"""
+        self.enrolled_students = list(compress(self.enrolled_students, ~mask))
+        self._index_students()
+    
+    def _index_faculty(self) -> None:
+        """Rebuild the faculty id -> row index from faculty_members (first member of an id wins)"""
+        self._faculty_rows = {}
+        for row, f in enumerate(self.faculty_members):
+            self._faculty_rows.setdefault(f.faculty_id, row)
+    
+    def _find_faculty(self, faculty_id: str) -> Optional[Faculty]:
+        """Faculty member with faculty_id, reindexing when the cached row misses or no longer holds them"""
+        row = self._faculty_rows.get(faculty_id)
+        if row is None or row >= len(self.faculty_members) or self.faculty_members[row].faculty_id != faculty_id:
+            self._index_faculty()
+            row = self._faculty_rows.get(faculty_id)
+            if row is None:
+                return None
+        return self.faculty_members[row]
+    
     # Academic program management
+    def _index_programs(self) -> None:
+        """Rebuild the program id -> row index from academic_programs (first program of an id wins)"""
+        self._program_rows = {}
+        for row, program in enumerate(self.academic_programs):
+            self._program_rows.setdefault(program.program_id, row)
+    
+    def _find_program(self, program_id: str) -> Optional[AcademicProgram]:
+        """Program with program_id, reindexing when the cached row misses or no longer holds that program"""
+        row = self._program_rows.get(program_id)
+        if row is None or row >= len(self.academic_programs) or self.academic_programs[row].program_id != program_id:
+            self._index_programs()
+            row = self._program_rows.get(program_id)
+            if row is None:
+                return None
+        return self.academic_programs[row]
+    
     def create_academic_program(self, program: AcademicProgram) -> str:
         """Create new academic program"""
+        self._program_rows.setdefault(program.program_id, len(self.academic_programs))
         self.academic_programs.append(program)
         self.degree_programs.append(program.program_name)
         
@@ -290,7 +484,7 @@ class EducationFirm(BaseFirm):
     
     def seek_program_accreditation(self, program_id: str, accrediting_body: str, cost: float) -> bool:
         """Seek accreditation for academic program"""
-        program = next((p for p in self.academic_programs if p.program_id == program_id), None)
+        program = self._find_program(program_id)
         if not program:
             return False
         
@@ -306,7 +500,7 @@ class EducationFirm(BaseFirm):
     def schedule_course(self, course: Course) -> str:
         """Schedule course offering"""
         # Check if instructor is available
-        instructor = next((f for f in self.faculty_members if f.faculty_id == course.instructor_id), None)
+        instructor = self._find_faculty(course.instructor_id)
         if not instructor:
             return ""
         
@@ -322,6 +516,7 @@ class EducationFirm(BaseFirm):
     # Faculty management
     def hire_faculty(self, faculty: Faculty) -> bool:
         """Hire new faculty member"""
+        self._faculty_rows.setdefault(faculty.faculty_id, len(self.faculty_members))
         self.faculty_members.append(faculty)
         
         # Record salary expense
@@ -329,18 +524,17 @@ class EducationFirm(BaseFirm):
         self.post("faculty_salaries", "cash", annual_salary, f"Faculty hire: {faculty.faculty_id}")
         self.income_statement["opex"] += annual_salary
         
-        # Update faculty metrics
+        # Update faculty metrics, summed over the records so direct salary and status edits count
         total_faculty = len(self.faculty_members)
         self.average_faculty_salary = sum(f.salary for f in self.faculty_members) / total_faculty
-        
-        tenure_track_count = len([f for f in self.faculty_members if f.tenure_status in ["tenured", "tenure_track"]])
+        tenure_track_count = sum(f.tenure_status in _TENURE_LINE for f in self.faculty_members)
         self.tenure_track_percentage = tenure_track_count / total_faculty
         
         return True
     
     def grant_tenure(self, faculty_id: str) -> bool:
         """Grant tenure to faculty member"""
-        faculty = next((f for f in self.faculty_members if f.faculty_id == faculty_id), None)
+        faculty = self._find_faculty(faculty_id)
         if not faculty or faculty.tenure_status != "tenure_track":
             return False
         
@@ -351,7 +545,7 @@ class EducationFirm(BaseFirm):
     
     def promote_faculty(self, faculty_id: str, new_rank: str) -> bool:
         """Promote faculty to new rank"""
-        faculty = next((f for f in self.faculty_members if f.faculty_id == faculty_id), None)
+        faculty = self._find_faculty(faculty_id)
         if not faculty:
             return False
         
@@ -412,7 +606,7 @@ class EducationFirm(BaseFirm):
     
     def award_financial_aid(self, student_id: str, aid_amount: float, aid_type: str) -> bool:
         """Award financial aid to student"""
-        student = next((s for s in self.enrolled_students if s.student_id == student_id), None)
+        student, _ = self._find_student(student_id)
         if not student:
             return False
         
@@ -443,7 +637,7 @@ class EducationFirm(BaseFirm):
         
         # Update faculty research activity
         for faculty_id in faculty_investigators:
-            faculty = next((f for f in self.faculty_members if f.faculty_id == faculty_id), None)
+            faculty = self._find_faculty(faculty_id)
             if faculty:
                 faculty.research_active = True
         
@@ -451,7 +645,7 @@ class EducationFirm(BaseFirm):
     
     def publish_research(self, faculty_id: str, publication_count: int) -> None:
         """Record research publications"""
-        faculty = next((f for f in self.faculty_members if f.faculty_id == faculty_id), None)
+        faculty = self._find_faculty(faculty_id)
         if faculty:
             faculty.publications += publication_count
             self.research_publications += publication_count
@@ -467,15 +661,7 @@ class EducationFirm(BaseFirm):
     # Student services and support
     def provide_student_services(self, service_type: str, annual_budget: float) -> None:
         """Provide student support services"""
-        service_costs = {
-            "counseling": annual_budget * 0.20,
-            "career_services": annual_budget * 0.25,
-            "tutoring": annual_budget * 0.15,
-            "health_services": annual_budget * 0.30,
-            "student_activities": annual_budget * 0.10
-        }
-        
-        cost = service_costs.get(service_type, annual_budget)
+        cost = annual_budget * _SERVICE_COST_SHARES.get(service_type, 1.0)
         
         self.post("student_services", "cash", cost, f"Student services: {service_type}")
         self.income_statement["opex"] += cost
@@ -496,14 +682,10 @@ class EducationFirm(BaseFirm):
     # Facilities and infrastructure
     def invest_in_facilities(self, facility_type: str, investment: float) -> None:
         """Invest in campus facilities"""
-        if facility_type == "classroom":
-            self.classroom_capacity += int(investment / 10000)  # $10k per seat
-        elif facility_type == "dormitory":
-            self.dormitory_capacity += int(investment / 50000)  # $50k per bed
-        elif facility_type == "laboratory":
-            self.laboratory_facilities += int(investment / 100000)  # $100k per lab
-        elif facility_type == "library":
-            self.library_holdings += int(investment / 50)  # $50 per book/resource
+        entry = _FACILITY_UNIT_COSTS.get(facility_type)
+        if entry:
+            attr, unit_cost = entry
+            setattr(self, attr, getattr(self, attr) + int(investment / unit_cost))
         
         self.post("facilities_investment", "cash", investment, 
                  f"Facility investment: {facility_type}")
@@ -530,10 +712,10 @@ class EducationFirm(BaseFirm):
     
     def calculate_net_tuition_revenue(self) -> float:
         """Calculate net tuition revenue after financial aid"""
-        gross_tuition = sum(s.tuition_rate for s in self.enrolled_students)
-        total_aid = sum(s.financial_aid for s in self.enrolled_students)
-        
-        return gross_tuition - total_aid
+        n = len(self.enrolled_students)
+        tuition = np.fromiter((s.tuition_rate for s in self.enrolled_students), dtype=np.float64, count=n)
+        aid = np.fromiter((s.financial_aid for s in self.enrolled_students), dtype=np.float64, count=n)
+        return float(tuition.sum() - aid.sum())
     
     def generate_institutional_effectiveness_report(self) -> Dict[str, Any]:
         """Generate comprehensive institutional effectiveness metrics"""
@@ -2,11 +2,19 @@
 # NAICS 52: Finance and Insurance
 
 from __future__ import annotations
+import math
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from datetime import date
 from enum import Enum
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 from .firm import BaseFirm, Money, Transaction
 from .org_chart import Role, RoleType, VotingRights
 
@@ -28,6 +36,22 @@ class RiskRating(Enum):
     CCC = "CCC"
     DEFAULT = "DEFAULT"
 
+# Risk weight per RiskRating, indexed by the rating's position in the enum
+_RATING_ORDINALS = {rating: i for i, rating in enumerate(RiskRating)}
+_RATING_WEIGHTS = np.array([0.2, 0.3, 0.5, 1.0, 1.5, 2.0, 3.0, 12.5])
+
+def _stress_losses(principals: np.ndarray, loss_rate: float, trading_value: float) -> float:
+    """
+    Stressed losses for a loss-rate scenario: loss_rate on every loan
+    principal plus 1.5x loss_rate on the trading portfolio.
+    """
+    total_principal = 0.0
+    for i in range(principals.size):
+        total_principal += principals[i]
+    return total_principal * loss_rate + trading_value * loss_rate * 1.5
+
+_stress_losses_jit = njit(cache=True)(_stress_losses) if njit is not None else _stress_losses
+
 @dataclass
 class LoanPortfolio:
     loan_id: str
@@ -68,6 +92,10 @@ class FinancialFirm(BaseFirm):
     
     # Risk management
     value_at_risk: float = 0.0  # VaR calculation
+    # Historical daily return scenarios (T x K) over the named risk factors; security_type selects a holding's factor.
+    # Left as None, VaR falls back to the parametric normal approximation.
+    returns_matrix: Optional[np.ndarray] = None
+    risk_factors: List[str] = field(default_factory=list)
     tier_1_capital_ratio: float = 0.12  # regulatory capital
     risk_weighted_assets: float = 0.0
     stress_test_results: Dict[str, float] = field(default_factory=dict)
@@ -78,10 +106,21 @@ class FinancialFirm(BaseFirm):
     leverage_ratio: float = 0.05
     compliance_costs: float = 0.0
     
+    # id -> row of the first loan / holding with that id in the public lists
+    _loan_rows: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _security_rows: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    
     def __post_init__(self):
         super().__post_init__()
         if not self.naics:
             self.naics = "52"  # Finance and Insurance
+        self._index_loans()
+        self._index_securities()
+    
+    @classmethod
+    def warmup(cls) -> None:
+        """Compile the numba kernels ahead of the first simulation tick (loaded from disk cache when available)"""
+        _stress_losses_jit(np.zeros(1), 0.0, 0.0)
     
     # Banking operations
     def create_deposit_account(self, customer_id: str, initial_deposit: float) -> str:
@@ -106,6 +145,7 @@ class FinancialFirm(BaseFirm):
             risk_rating=RiskRating.BBB  # default rating
         )
         
+        self._loan_rows.setdefault(loan.loan_id, len(self.loan_portfolio))
         self.loan_portfolio.append(loan)
         
         # Record loan asset and cash outflow
@@ -123,9 +163,30 @@ class FinancialFirm(BaseFirm):
         self.income_statement["revenue"] += total_income
         return total_income
     
+    def _loan_principals(self) -> np.ndarray:
+        """Principal of every loan, read off the records each call so repayments and write-downs are seen"""
+        return np.fromiter((l.principal_amount for l in self.loan_portfolio), dtype=np.float64,
+                           count=len(self.loan_portfolio))
+    
+    def _index_loans(self) -> None:
+        """Rebuild the loan id -> row index from loan_portfolio"""
+        self._loan_rows = {}
+        for row, loan in enumerate(self.loan_portfolio):
+            self._loan_rows.setdefault(loan.loan_id, row)
+    
+    def _find_loan(self, loan_id: str) -> Optional[LoanPortfolio]:
+        """Loan with loan_id, reindexing when the cached row misses or no longer holds that loan"""
+        row = self._loan_rows.get(loan_id)
+        if row is None or row >= len(self.loan_portfolio) or self.loan_portfolio[row].loan_id != loan_id:
+            self._index_loans()
+            row = self._loan_rows.get(loan_id)
+            if row is None:
+                return None
+        return self.loan_portfolio[row]
+    
     def assess_credit_risk(self, loan_id: str) -> RiskRating:
         """Assess credit risk for specific loan"""
-        loan = next((l for l in self.loan_portfolio if l.loan_id == loan_id), None)
+        loan = self._find_loan(loan_id)
         if not loan:
             return RiskRating.DEFAULT
         
@@ -156,6 +217,7 @@ class FinancialFirm(BaseFirm):
             portfolio_allocation=portfolio_type
         )
         
+        self._security_rows.setdefault(security_id, len(self.security_holdings))
         self.security_holdings.append(holding)
         
         # Record investment
@@ -170,7 +232,7 @@ class FinancialFirm(BaseFirm):
     
     def mark_to_market(self, security_id: str, new_market_price: float) -> float:
         """Mark security to market value"""
-        holding = next((h for h in self.security_holdings if h.security_id == security_id), None)
+        holding = self._find_security(security_id)
         if not holding:
             return 0.0
         
@@ -190,10 +252,31 @@ class FinancialFirm(BaseFirm):
         
         return mark_to_market_gain_loss
     
+    def _index_securities(self) -> None:
+        """Rebuild the security id -> row index from security_holdings"""
+        self._security_rows = {}
+        for row, holding in enumerate(self.security_holdings):
+            self._security_rows.setdefault(holding.security_id, row)
+    
+    def _find_security(self, security_id: str) -> Optional[SecurityHolding]:
+        """Holding with security_id, reindexing when the cached row misses or no longer holds that security"""
+        row = self._security_rows.get(security_id)
+        if row is None or row >= len(self.security_holdings) or self.security_holdings[row].security_id != security_id:
+            self._index_securities()
+            row = self._security_rows.get(security_id)
+            if row is None:
+                return None
+        return self.security_holdings[row]
+    
     # Risk management
     def calculate_value_at_risk(self, confidence_level: float = 0.95, 
                               time_horizon_days: int = 1) -> float:
         """Calculate Value at Risk for portfolio"""
+        if self.returns_matrix is not None and len(self.returns_matrix) > 0:
+            var = self._historical_var(confidence_level) * math.sqrt(time_horizon_days)
+            self.value_at_risk = var
+            return var
+        
         # Simplified VaR calculation using portfolio value and volatility assumption
         total_portfolio_value = (self.trading_portfolio_value + 
                                self.available_for_sale_portfolio)
@@ -202,21 +285,36 @@ class FinancialFirm(BaseFirm):
         daily_volatility = 0.02
         
         # Normal distribution VaR calculation
-        import math
         z_score = 1.645 if confidence_level == 0.95 else 2.33  # 95% or 99%
         var = total_portfolio_value * daily_volatility * z_score * math.sqrt(time_horizon_days)
         
         self.value_at_risk = var
         return var
     
+    def _historical_var(self, confidence_level: float) -> float:
+        """One-day historical-simulation VaR of the trading and AFS holdings, revalued under every return scenario"""
+        factor_index = {factor: k for k, factor in enumerate(self.risk_factors)}
+        exposures = np.zeros(self.returns_matrix.shape[1])
+        for holding in self.security_holdings:
+            k = factor_index.get(holding.security_type)
+            if k is not None and holding.portfolio_allocation in ("trading", "available_for_sale"):
+                exposures[k] += holding.current_market_value
+        
+        pnl = self.returns_matrix @ exposures
+        q = int((1.0 - confidence_level) * (len(pnl) - 1))  # lower-percentile order statistic
+        return max(-float(np.partition(pnl, q)[q]), 0.0)
+    
     def calculate_capital_ratios(self) -> Dict[str, float]:
         """Calculate regulatory capital ratios"""
         # Simplified capital calculation
         tier1_capital = self.balance_sheet.get("equity", 0) * 0.8  # assume 80% qualifies as Tier 1
         
-        # Risk-weighted assets calculation (simplified)
-        self.risk_weighted_assets = sum(loan.principal_amount * 1.0 for loan in self.loan_portfolio)  # 100% risk weight
-        self.risk_weighted_assets += self.trading_portfolio_value * 1.25  # 125% risk weight for trading
+        # Risk-weighted assets: loans weighted by their current risk rating, 125% risk weight for trading
+        principals = self._loan_principals()
+        ordinals = np.fromiter((_RATING_ORDINALS[l.risk_rating] for l in self.loan_portfolio), dtype=np.intp,
+                               count=len(self.loan_portfolio))
+        self.risk_weighted_assets = (float(np.dot(principals, _RATING_WEIGHTS[ordinals]))
+                                     + self.trading_portfolio_value * 1.25)
         
         if self.risk_weighted_assets > 0:
             self.tier_1_capital_ratio = tier1_capital / self.risk_weighted_assets
@@ -231,16 +329,9 @@ class FinancialFirm(BaseFirm):
     # Regulatory compliance
     def conduct_stress_test(self, scenario_name: str, loss_rate: float) -> float:
         """Conduct regulatory stress test"""
-        # Apply stress scenario to loan portfolio
-        stressed_losses = 0.0
-        for loan in self.loan_portfolio:
-            stressed_loss = loan.principal_amount * loss_rate
-            stressed_losses += stressed_loss
-        
-        # Apply to trading portfolio
-        trading_losses = self.trading_portfolio_value * loss_rate * 1.5  # higher impact on trading
-        
-        total_stressed_losses = stressed_losses + trading_losses
+        # Apply stress scenario to loan portfolio and (at 1.5x, higher impact) to trading portfolio
+        principals = self._loan_principals()
+        total_stressed_losses = _stress_losses_jit(principals, float(loss_rate), float(self.trading_portfolio_value))
         self.stress_test_results[scenario_name] = total_stressed_losses
         
         # Check if capital would remain adequate
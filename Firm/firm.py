@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Tuple, Any
+from typing import ClassVar, Dict, List, Tuple, Any
 from uuid import uuid4
 from datetime import date
 import yaml
@@ -18,6 +18,18 @@ from .org_chart import OrgChart, Shareholder, Role, RoleType, VotingRights
 
 Money = float  # usd unless otherwise noted
 
+# Repeated string keys (crop varieties, material types, ...) -> small int ids,
+# shared by all firms so sector modules can key numpy arrays by them
+_interned_ids: Dict[str, int] = {}
+
+def intern_id(key: str) -> int:
+    """Return the int id of a string key, assigning the next id on first use"""
+    return _interned_ids.setdefault(key, len(_interned_ids))
+
+def _public_fields(items: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    """asdict() dict_factory that drops underscore-prefixed (private cache) fields"""
+    return {name: value for name, value in items if not name.startswith("_")}
+
 @dataclass
 class License:
     name: str
@@ -70,6 +82,12 @@ class BaseFirm:
     resources: Dict[str, float] = field(default_factory=dict)      # ore reserves, bandwidth, etc.
     ledger: List[Transaction] = field(default_factory=list)        # raw journal lines
 
+    # simulation date shared by all firms, set once per tick (None = wall-clock date)
+    _current_tick_date: ClassVar[date | None] = None
+
+    def __post_init__(self) -> None:
+        """hook for sector subclasses, which all chain to it via super().__post_init__()"""
+
     # -----------------------------------------------------------------------
     # workforce management (now delegated to org_chart)
     # -----------------------------------------------------------------------
@@ -129,6 +147,19 @@ class BaseFirm:
         """get total voting power for an entity"""
         return self.org_chart.get_voting_power(entity_id)
 
+    # -----------------------------------------------------------------------
+    # simulation clock
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def set_tick_date(tick_date: date | None) -> None:
+        """set the date seen by every firm for the current tick"""
+        BaseFirm._current_tick_date = tick_date
+
+    def today(self) -> date:
+        """current simulation date, falling back to the wall-clock date"""
+        return self._current_tick_date or date.today()
+
     # -----------------------------------------------------------------------
     # accounting helpers
     # -----------------------------------------------------------------------
@@ -199,7 +230,8 @@ class BaseFirm:
     # -----------------------------------------------------------------------
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
+        # leave out private lookup caches and their counters, here and in nested dataclasses
+        d = asdict(self, dict_factory=_public_fields)
         d["type"] = self.__class__.__name__
         # Convert org_chart to dict
         d["org_chart"] = self.org_chart.to_dict()
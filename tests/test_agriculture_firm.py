@@ -0,0 +1,81 @@
+from datetime import date
+
+from Firm.agriculture_firm import (AgriculturalFirm, Crop, CropType, Land, Livestock, LivestockType, ProductionMethod,
+                                   WeatherRisk)
+
+
+def _crop(variety, crop_type=CropType.GRAIN, acreage=10.0, yield_per_acre=100.0):
+    return Crop(crop_type, variety, acreage, date(2024, 4, 1), date(2024, 9, 1), yield_per_acre, 5.0,
+                ProductionMethod.CONVENTIONAL)
+
+
+def _farm(**kwargs):
+    firm = AgriculturalFirm(name="farm", **kwargs)
+    firm.add_land_parcel(Land("p1", 100.0, 0.8, True, "crop", "x"))
+    return firm
+
+
+def test_harvest_sums_every_planting_of_a_variety():
+    firm = _farm(weather_risk_profile=WeatherRisk(0.1, 0.1, 0.1, 0.2))
+    for crop in (_crop("corn"), _crop("wheat"), _crop("corn", acreage=5.0)):
+        assert firm.plant_crop(crop, "p1")
+
+    assert firm.harvest_crop("corn") == 15.0 * 100.0 * 0.8
+    assert [c.variety for c in firm.current_crops] == ["wheat"]
+    assert firm.harvest_crop("corn") == 0.0
+
+
+def test_harvest_sees_direct_crop_edits():
+    firm = _farm()
+    firm.plant_crop(_crop("corn"), "p1")
+    firm.current_crops.append(_crop("wheat", acreage=4.0))
+    assert firm.harvest_crop("wheat") == 400.0
+
+    # same-length edits: a field change, a renamed variety and a replaced crop
+    firm.plant_crop(_crop("rye"), "p1")
+    firm.current_crops[0].planted_acreage = 20.0
+    firm.current_crops[1].variety = "corn"
+    assert firm.harvest_crop("corn") == 3000.0
+    assert firm.current_crops == []
+
+    firm.plant_crop(_crop("corn"), "p1")
+    firm.current_crops[0] = _crop("oats", CropType.FRUIT, acreage=2.0)
+    assert firm.harvest_crop("corn") == 0.0
+    assert firm.calculate_diversification_index() == 0.2
+    assert firm.harvest_crop("oats") == 200.0
+
+
+def test_parcel_lookups_and_acreage_see_direct_edits():
+    firm = _farm()
+    firm.add_land_parcel(Land("p2", 40.0, 0.5, False, "fallow", "y"))
+    assert firm.get_total_acreage() == 140.0
+
+    # same-length edits: a field change, a reorder and a replaced parcel
+    firm.land_holdings[0].acreage = 50.0
+    assert firm.get_total_acreage() == 90.0
+    assert not firm.plant_crop(_crop("corn", acreage=60.0), "p1")
+
+    firm.land_holdings.reverse()
+    assert firm.plant_crop(_crop("corn", acreage=30.0), "p2")
+    assert firm.land_holdings[0].current_use == "grain_corn"
+
+    firm.land_holdings[1] = Land("p3", 10.0, 0.5, True, "crop", "z")
+    assert not firm.irrigate("p1", 1.0)
+    assert firm.irrigate("p3", 1.0)
+    assert firm.plan_crop_rotation("p2", ["corn", "soy"])
+    assert firm.get_total_acreage() == 50.0
+
+
+def test_diversification_index_sees_direct_livestock_edits():
+    firm = _farm()
+    firm.plant_crop(_crop("corn"), "p1")
+    firm.plant_crop(_crop("apple", CropType.FRUIT), "p1")
+    firm.livestock_inventory.append(Livestock(LivestockType.CATTLE, 10, "angus", 500.0, 3.0))
+    firm.livestock_inventory.append(Livestock(LivestockType.CATTLE, 5, "hereford", 450.0, 3.0))
+    assert firm.calculate_diversification_index() == 0.6
+
+    # same-length edits: a changed type and a replaced group
+    firm.livestock_inventory[0].livestock_type = LivestockType.SHEEP
+    assert firm.calculate_diversification_index() == 0.8
+    firm.livestock_inventory[1] = Livestock(LivestockType.SHEEP, 20, "merino", 60.0, 1.0)
+    assert firm.calculate_diversification_index() == 0.6
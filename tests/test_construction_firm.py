@@ -0,0 +1,185 @@
+from datetime import date
+
+import pytest
+
+import Firm.construction_firm as construction_firm
+from Firm.construction_firm import (ConstructionFirm, ConstructionProject, ConstructionType, LaborCrew,
+                                    MaterialInventory, ProjectPhase)
+
+
+@pytest.fixture(params=["kernel", "python"])
+def draw_path(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(construction_firm, "_draw_materials_jit", None)
+    return request.param
+
+
+def _quantities(firm):
+    return [(m.material_type, m.quantity) for m in firm.material_inventory]
+
+
+def test_consume_materials_draws_oldest_stock_first(draw_path):
+    firm = ConstructionFirm(name="builder")
+    firm.order_materials("wood", 10, "p")
+    firm.order_materials("steel", 7, "p")
+    firm.order_materials("wood", 3, "p")
+
+    assert not firm.consume_materials("wood", 14, "p")
+    assert firm.consume_materials("wood", 11, "p")
+    assert _quantities(firm) == [("steel", 7), ("wood", 2)]
+    assert not firm.consume_materials("brick", 1, "p")
+
+
+def test_consume_materials_sees_direct_inventory_edits(draw_path):
+    firm = ConstructionFirm(name="builder",
+                            material_inventory=[MaterialInventory("steel", 5, 1.0, "s", date(2024, 1, 1), "a")])
+    firm.order_materials("wood", 10, "p")
+    firm.material_inventory.append(MaterialInventory("wood", 4, 1.0, "s", date(2024, 1, 1), "a"))
+    assert firm.consume_materials("wood", 12, "p")
+    assert _quantities(firm) == [("steel", 5), ("wood", 2)]
+
+    # same-length edits: a quantity change, a retyped lot and a replaced lot
+    firm.material_inventory[0].quantity += 5
+    assert firm.consume_materials("steel", 8, "p")
+    assert _quantities(firm) == [("steel", 2), ("wood", 2)]
+
+    firm.material_inventory[1].material_type = "steel"
+    assert firm.consume_materials("steel", 3, "p")
+    assert _quantities(firm) == [("steel", 1)]
+
+    firm.material_inventory[0] = MaterialInventory("brick", 6, 1.0, "s", date(2024, 1, 1), "a")
+    assert not firm.consume_materials("steel", 1, "p")
+    assert firm.consume_materials("brick", 6, "p")
+    assert firm.material_inventory == []
+
+
+def _firm_with_project():
+    firm = ConstructionFirm(name="builder")
+    bid_id = firm.submit_bid({"client_id": "c1", "type": "residential", "duration_days": 100}, 1000.0)
+    assert firm.win_project(bid_id)
+    return firm, firm.active_projects[0].project_id
+
+
+def test_lookups_see_direct_list_edits():
+    firm, project_id = _firm_with_project()
+    bid_a = firm.submit_bid({"client_id": "c2", "type": "commercial", "duration_days": 50}, 500.0)
+    bid_b = firm.submit_bid({"client_id": "c3", "type": "industrial", "duration_days": 50}, 700.0)
+    firm.add_labor_crew(LaborCrew("c1", "elec", 4))
+    firm.add_labor_crew(LaborCrew("c2", "plumb", 3))
+
+    # same-length edits: a reorder, a replacement and a renamed id
+    firm.bid_pipeline.reverse()
+    firm.labor_crews[0] = LaborCrew("c9", "hvac", 2)
+    firm.active_projects[0].project_id = "renamed"
+    assert not firm.assign_crew_to_project("c1", "renamed")
+    assert firm.assign_crew_to_project("c9", "renamed")
+    assert not firm.update_project_progress(project_id, 10.0)
+
+    assert firm.win_project(bid_a)
+    assert [b["bid_id"] for b in firm.bid_pipeline] == [bid_b]
+    assert firm.win_project(bid_b)
+    assert firm.complete_project("renamed")
+    assert [p.project_id for p in firm.active_projects] == [f"proj_{bid_a}", f"proj_{bid_b}"]
+    assert firm.process_change_order(f"proj_{bid_b}", "extra", 100.0)
+    assert firm.active_projects[1].contract_value == 800.0
+
+
+def test_bonding_used_sums_the_current_bonds():
+    firm = ConstructionFirm(name="builder", bonding_capacity=1000.0)
+    assert firm.post_surety_bond("p1", 200.0)
+    assert firm.post_surety_bond("p2", 300.0)
+    firm.surety_bonds["p1"] = 50.0
+    assert firm.get_project_portfolio_summary()["bonding_capacity_used"] == 350.0
+
+
+def test_labor_cost_uses_current_crew_rates():
+    firm, project_id = _firm_with_project()
+    hours = {"journeyman": 10, "apprentice": 5, "foreman": 2}
+    assert firm.calculate_labor_cost(project_id, hours) == 0.0
+
+    firm.add_labor_crew(LaborCrew("c1", "elec", 4, {"journeyman": 40.0, "apprentice": 20.0}))
+    firm.add_labor_crew(LaborCrew("c2", "plumb", 3, {"foreman": 60.0}))
+    assert firm.assign_crew_to_project("c1", project_id)
+    assert firm.assign_crew_to_project("c2", project_id)
+    # c1 prices foreman at the $25 default, c2 prices journeyman and apprentice at it
+    assert firm.calculate_labor_cost(project_id, hours) == 10 * 65.0 + 5 * 45.0 + 2 * 85.0
+
+    firm.labor_crews[1].hourly_rates["foreman"] = 80.0
+    assert firm.calculate_labor_cost(project_id, hours) == 10 * 65.0 + 5 * 45.0 + 2 * 105.0
+
+
+def test_order_materials_reads_supplier_contracts():
+    firm = ConstructionFirm(name="builder", supplier_contracts={"wood": {"price": 4.0, "supplier": "mill"}})
+    firm.order_materials("wood", 10, "p")
+    firm.supplier_contracts["wood"]["price"] = 6.0
+    firm.order_materials("wood", 10, "p")
+    firm.order_materials("steel", 1, "p")
+
+    assert [(m.unit_cost, m.supplier) for m in firm.material_inventory] == [
+        (4.0, "mill"), (6.0, "mill"), (100.0, "default")]
+
+
+def test_projects_by_type_counts_current_active_projects():
+    firm, project_id = _firm_with_project()
+    bid_id = firm.submit_bid({"client_id": "c2", "type": "commercial", "duration_days": 50}, 500.0)
+    firm.win_project(bid_id)
+    assert firm.get_project_portfolio_summary()["projects_by_type"]["residential"] == 1
+
+    # same-length edit: a project retyped in place, then one completed by a direct list edit
+    firm.active_projects[1].construction_type = ConstructionType.RESIDENTIAL
+    summary = firm.get_project_portfolio_summary()
+    assert summary["projects_by_type"]["residential"] == 2
+    assert summary["projects_by_type"]["commercial"] == 0
+
+    firm.completed_projects.append(firm.active_projects.pop().project_id)
+    assert firm.get_project_portfolio_summary()["projects_by_type"]["residential"] == 1
+    assert firm.complete_project(project_id)
+    assert firm.get_project_portfolio_summary()["projects_by_type"]["residential"] == 0
+
+
+def test_incidents_per_project_follows_the_project_lists():
+    firm, project_id = _firm_with_project()
+    firm.record_safety_incident(project_id, "fall", "first_aid", 1)
+    firm.record_safety_incident(project_id, "cut", "first_aid", 1)
+    assert firm.calculate_safety_metrics()["incidents_per_project"] == 2.0
+
+    firm.completed_projects.extend(["old_1", "old_2", "old_3"])
+    assert firm.calculate_safety_metrics()["incidents_per_project"] == 0.5
+    firm.active_projects.clear()
+    assert firm.calculate_safety_metrics()["incidents_per_project"] == 2 / 3
+
+
+def test_lost_time_incidents_see_severity_edits():
+    firm, project_id = _firm_with_project()
+    firm.record_safety_incident(project_id, "fall", "lost_time", 1)
+    firm.record_safety_incident(project_id, "cut", "first_aid", 1)
+    firm.record_safety_incident(project_id, "dust", "unclassified", 2)
+    assert firm.calculate_safety_metrics()["lost_time_incidents"] == 1
+
+    incidents = firm.safety_record["incidents"]
+    incidents[1]["severity"] = "lost_time"
+    assert firm.calculate_safety_metrics()["lost_time_incidents"] == 2
+    incidents[0] = dict(incidents[0], severity="fatality")
+    assert firm.calculate_safety_metrics()["lost_time_incidents"] == 1
+
+
+def test_milestone_payments_follow_progress_and_edits():
+    project = ConstructionProject("p1", "c1", ConstructionType.RESIDENTIAL, 1000.0, ProjectPhase.CONSTRUCTION,
+                                  date(2024, 1, 1), date(2025, 1, 1), milestone_payments={50.0: 100.0})
+    project.add_milestone_payment(25.0, 50.0)
+    project.percent_complete = 30.0
+    assert project.collect_milestone_payments() == 50.0
+    assert project.collect_milestone_payments() == 0.0
+
+    # same-length edit: a payment amount changed in place
+    project.milestone_payments[50.0] = 150.0
+    project.percent_complete = 60.0
+    assert project.collect_milestone_payments() == 150.0
+
+    # progress set back and forward again passes the milestone again, as it always has
+    project.percent_complete = 40.0
+    assert project.collect_milestone_payments() == 0.0
+    project.milestone_payments[75.0] = 200.0
+    project.percent_complete = 80.0
+    assert project.collect_milestone_payments() == 350.0
+    assert set(project.milestone_payments) == {25.0, 50.0, 75.0}
@@ -0,0 +1,155 @@
+from datetime import date
+
+import pytest
+
+from Firm.education_firm import AcademicProgram, Course, DegreeLevel, EducationFirm, Faculty, StudentStatus, Student
+
+
+def _student(student_id, gpa=3.0, tuition=1000.0, aid=0.0, credits=0, level=DegreeLevel.BACHELOR):
+    return Student(student_id, date(2024, 9, 1), tuition, aid, "p0", level, gpa=gpa, credits_completed=credits)
+
+
+def _university(capacity=100):
+    firm = EducationFirm(name="uni", enrollment_capacity=capacity)
+    firm.create_academic_program(AcademicProgram("p0", "x", DegreeLevel.BACHELOR, "d", 120, 1.0, capacity))
+    return firm
+
+
+def test_retention_and_net_tuition_read_current_student_fields():
+    firm = _university()
+    students = [_student(f"s{i}", gpa=3.5) for i in range(5)]
+    rejected = firm.bulk_enroll(students)
+    assert rejected == []
+
+    for student in students:
+        student.gpa = 1.0  # 20% of the at-risk students drop out: the first of the five
+    students[1].tuition_rate = 2000.0
+    students[2].financial_aid = 300.0
+    assert firm.calculate_net_tuition_revenue() == 5700.0
+
+    firm.process_student_retention()
+    assert students[0].status is StudentStatus.DROPPED_OUT
+    assert students[0] not in firm.enrolled_students
+    assert firm.current_enrollment == 4
+
+
+def test_graduate_requires_credits_and_keeps_enrollment_order():
+    firm = _university()
+    for i in range(4):
+        assert firm.enroll_student(_student(f"s{i}", credits=10 if i == 1 else 130))
+
+    assert not firm.graduate_student("s1")
+    assert firm.graduate_student("s0")
+    assert not firm.graduate_student("s0")
+    assert [s.student_id for s in firm.enrolled_students] == ["s1", "s2", "s3"]
+    assert firm.current_enrollment == 3
+
+
+def test_graduate_after_reorder_and_replacement():
+    firm = _university()
+    for i in range(4):
+        firm.enroll_student(_student(f"s{i}", credits=130))
+
+    firm.enrolled_students.sort(key=lambda s: s.student_id, reverse=True)
+    assert firm.graduate_student("s3")
+    assert firm.graduate_student("s0")
+    assert [s.student_id for s in firm.enrolled_students] == ["s2", "s1"]
+
+    replacement = _student("s9", credits=130)
+    firm.enrolled_students[0] = replacement
+    assert not firm.graduate_student("s2")
+    assert firm.graduate_student("s9")
+    assert [s.student_id for s in firm.enrolled_students] == ["s1"]
+
+
+def test_graduate_sees_a_student_id_edited_in_place():
+    firm = _university()
+    for i in range(2):
+        firm.enroll_student(_student(f"s{i}", credits=130))
+
+    firm.enrolled_students[0].student_id = "s7"
+    assert not firm.graduate_student("s0")
+    assert firm.graduate_student("s7")
+    assert [s.student_id for s in firm.enrolled_students] == ["s1"]
+
+
+def test_program_lookups_see_direct_list_edits():
+    firm = _university()
+    firm.create_academic_program(AcademicProgram("p1", "y", DegreeLevel.MASTER, "d", 30, 1.0, 1))
+    assert firm.enroll_student(Student("s0", date(2024, 9, 1), 1000.0, 0.0, "p1", DegreeLevel.MASTER))
+    assert not firm.enroll_student(Student("s1", date(2024, 9, 1), 1000.0, 0.0, "p1", DegreeLevel.MASTER))
+
+    # same-length edits: a reorder and a replaced program
+    firm.academic_programs.reverse()
+    firm.academic_programs[0].enrollment_capacity = 2
+    assert firm.enroll_student(Student("s1", date(2024, 9, 1), 1000.0, 0.0, "p1", DegreeLevel.MASTER))
+
+    firm.academic_programs[1] = AcademicProgram("p2", "z", DegreeLevel.DOCTORAL, "d", 60, 1.0, 5)
+    assert not firm.seek_program_accreditation("p0", "abet", 10.0)
+    assert firm.seek_program_accreditation("p2", "abet", 10.0)
+    assert firm.academic_programs[1].accreditation_status == "pending"
+
+def test_enrollment_by_level_is_maintained_on_enrollment():
+    firm = _university()
+    firm.enroll_student(_student("s0"))
+    firm.bulk_enroll([_student("s1", level=DegreeLevel.MASTER), _student("s2", level=DegreeLevel.MASTER)])
+
+    assert firm.enrollment_by_level == {DegreeLevel.BACHELOR: 1, DegreeLevel.MASTER: 2}
+    report = firm.generate_institutional_effectiveness_report()
+    assert report["enrollment_metrics"]["enrollment_by_level"] == firm.enrollment_by_level
+
+
+def test_faculty_averages_see_direct_salary_and_status_edits():
+    firm = EducationFirm(name="uni")
+    firm.hire_faculty(Faculty("f0", "a", "d", "assistant", "tenure_track", 100.0))
+    firm.hire_faculty(Faculty("f1", "b", "d", "lecturer", "non_tenure", 200.0))
+    assert firm.average_faculty_salary == 150.0
+    assert firm.tenure_track_percentage == 0.5
+
+    # same-length edits: a salary change and a status change made on the records
+    firm.faculty_members[1].salary = 400.0
+    firm.faculty_members[1].tenure_status = "tenure_track"
+    firm.hire_faculty(Faculty("f2", "c", "d", "lecturer", "non_tenure", 300.0))
+    assert firm.average_faculty_salary == pytest.approx(800.0 / 3)
+    assert firm.tenure_track_percentage == pytest.approx(2 / 3)
+
+
+def test_faculty_lookups_see_direct_list_edits():
+    firm = EducationFirm(name="uni")
+    assert firm.hire_faculty(Faculty("f0", "a", "d", "assistant", "tenure_track", 100.0))
+    firm.faculty_members.append(Faculty("f1", "b", "d", "associate", "tenure_track", 200.0))
+    assert firm.grant_tenure("f1")
+    assert firm.promote_faculty("f0", "associate")
+    assert firm.faculty_members[0].salary == pytest.approx(120.0)
+    assert firm.faculty_members[1].salary == pytest.approx(230.0)
+
+    # same-length edits: a reorder and a replaced member
+    firm.faculty_members.reverse()
+    firm.publish_research("f0", 2)
+    assert [f.publications for f in firm.faculty_members] == [0, 2]
+
+    firm.faculty_members[0] = Faculty("f2", "c", "d", "assistant", "tenure_track", 90.0)
+    assert not firm.grant_tenure("f1")
+    assert firm.grant_tenure("f2")
+
+
+def test_teaching_load_sees_direct_course_edits():
+    firm = EducationFirm(name="uni")
+    firm.hire_faculty(Faculty("f0", "a", "d", "assistant", "tenure_track", 100.0, teaching_load=9))
+    firm.hire_faculty(Faculty("f1", "b", "d", "assistant", "tenure_track", 100.0, teaching_load=9))
+    assert firm.schedule_course(Course("c0", "x", 3, "f0", 30)) == "c0"
+    assert firm.schedule_course(Course("c1", "y", 3, "f0", 30)) == "c1"
+
+    # same-length edits: more credit hours on a course, then a course handed to f1
+    firm.courses_offered[0].credit_hours = 6
+    assert firm.schedule_course(Course("c2", "z", 3, "f0", 30)) == ""
+    firm.courses_offered[0].instructor_id = "f1"
+    assert firm.schedule_course(Course("c2", "z", 3, "f0", 30)) == "c2"
+    assert firm.schedule_course(Course("c3", "w", 6, "f1", 30)) == ""
+
+
+def test_new_program_department_sees_direct_department_edits():
+    firm = _university()
+    firm.academic_departments[0] = "physics"
+    firm.create_academic_program(AcademicProgram("p1", "y", DegreeLevel.MASTER, "d", 30, 1.0, 5))
+    assert firm.academic_departments == ["physics", "d"]
@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+
+from Firm.financial_firm import FinancialFirm, LoanPortfolio, RiskRating
+
+
+def _bank():
+    firm = FinancialFirm(name="bank")
+    firm.balance_sheet["equity"] = 1e6
+    firm.balance_sheet["assets"] = 1e7
+    return firm
+
+
+def test_interest_income_sees_principal_write_downs():
+    firm = _bank()
+    firm.originate_loan("b0", 1000.0, 0.05, date(2030, 1, 1))
+    firm.originate_loan("b1", 2000.0, 0.10, date(2030, 1, 1))
+    assert firm.calculate_interest_income() == pytest.approx(250.0)
+
+    firm.loan_portfolio[0].principal_amount = 0.0
+    assert firm.calculate_interest_income() == pytest.approx(200.0)
+
+
+def test_credit_risk_lookup_sees_reorders_and_replacements():
+    firm = _bank()
+    covered = firm.originate_loan("b0", 1000.0, 0.05, date(2030, 1, 1), collateral_value=2000.0)
+    thin = firm.originate_loan("b1", 1000.0, 0.05, date(2030, 1, 1), collateral_value=100.0)
+    assert firm.assess_credit_risk(covered) is RiskRating.AAA
+    assert firm.assess_credit_risk(thin) is RiskRating.BB
+    assert firm.assess_credit_risk("missing") is RiskRating.DEFAULT
+
+    # same-length edits: a reorder, a field change and a replaced loan
+    firm.loan_portfolio.reverse()
+    firm.loan_portfolio[0].collateral_value = 1100.0
+    assert firm.assess_credit_risk(thin) is RiskRating.A
+    assert firm.assess_credit_risk(covered) is RiskRating.AAA
+
+    firm.loan_portfolio[1] = LoanPortfolio("loan_b9_0", "b9", 1000.0, 0.05, date(2030, 1, 1), 1300.0, RiskRating.BBB)
+    assert firm.assess_credit_risk(covered) is RiskRating.DEFAULT
+    assert firm.assess_credit_risk("loan_b9_0") is RiskRating.AA
+
+
+def test_mark_to_market_lookup_sees_replacements():
+    firm = _bank()
+    firm.purchase_security("x", "bond", 10.0, 100.0, "trading")
+    firm.purchase_security("y", "bond", 5.0, 100.0, "available_for_sale")
+    assert firm.mark_to_market("x", 110.0) == pytest.approx(100.0)
+
+    firm.security_holdings[0], firm.security_holdings[1] = firm.security_holdings[1], firm.security_holdings[0]
+    assert firm.mark_to_market("y", 90.0) == pytest.approx(-50.0)
+    assert firm.mark_to_market_adjustments["y"] == pytest.approx(-50.0)
+
+    firm.security_holdings.pop()
+    assert firm.mark_to_market("x", 120.0) == 0.0
+
+
+def test_capital_ratios_weight_loans_by_current_rating():
+    firm = _bank()
+    firm.originate_loan("b0", 1000.0, 0.05, date(2030, 1, 1))
+    assert firm.calculate_capital_ratios()["risk_weighted_assets"] == pytest.approx(1000.0)
+
+    firm.loan_portfolio[0].risk_rating = RiskRating.AAA
+    assert firm.calculate_capital_ratios()["risk_weighted_assets"] == pytest.approx(200.0)
+
+
+def test_stress_test_applies_loss_rate_to_loans_and_trading():
+    firm = _bank()
+    firm.originate_loan("b0", 1000.0, 0.05, date(2030, 1, 1))
+    firm.purchase_security("x", "bond", 10.0, 100.0, "trading")
+    rwa = firm.calculate_capital_ratios()["risk_weighted_assets"]
+
+    ratio = firm.conduct_stress_test("severe", 0.1)
+    assert firm.stress_test_results["severe"] == pytest.approx(1000.0 * 0.1 + 1000.0 * 0.1 * 1.5)
+    assert ratio == pytest.approx((firm.balance_sheet["equity"] - 250.0) / rwa)
+
+    firm.loan_portfolio[0].principal_amount = 500.0
+    firm.conduct_stress_test("after_write_down", 0.1)
+    assert firm.stress_test_results["after_write_down"] == pytest.approx(200.0)
@@ -0,0 +1,40 @@
+import pytest
+
+from Firm import NAICS_FIRM_MAPPING
+
+
+@pytest.mark.parametrize("naics_code", sorted(NAICS_FIRM_MAPPING))
+def test_every_sector_firm_instantiates(naics_code):
+    if naics_code == "54":
+        pytest.xfail("Partnership declares signed_date after defaulted fields (pre-existing)")
+    firm = NAICS_FIRM_MAPPING[naics_code](name="firm")
+    assert firm.name == "firm"
+
+
+def _keys(value):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield from _keys(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _keys(item)
+
+
+@pytest.mark.parametrize("naics_code", ["11", "23", "52", "61"])
+def test_to_dict_leaves_out_private_caches(naics_code):
+    firm = NAICS_FIRM_MAPPING[naics_code](name="firm")
+    data = firm.to_dict()
+    assert data["type"] == type(firm).__name__
+    assert data["name"] == "firm"
+    assert not [key for key in _keys(data) if isinstance(key, str) and key.startswith("_")]
+
+
+def test_to_dict_leaves_out_private_fields_of_nested_records():
+    firm = NAICS_FIRM_MAPPING["23"](name="builder")
+    firm.win_project(firm.submit_bid({"client_id": "c1", "type": "residential", "duration_days": 10}, 100.0))
+    firm.active_projects[0].add_milestone_payment(50.0, 10.0)
+
+    project = firm.to_dict()["active_projects"][0]
+    assert project["milestone_payments"] == {50.0: 10.0}
+    assert not [key for key in project if key.startswith("_")]